@@ -0,0 +1,34 @@
+"""Algoritmos de ordenamiento con animaciones de plotly.
+
+Importar el paquete no carga plotly; solo ``create_animation`` lo necesita.
+"""
+
+from .bucketsort import bucket_sort, bucket_sort_with_animation
+from .countingsort import counting_argsort, counting_sort, counting_sort_with_animation
+from .dispatch import calibrate, msd_radix_sort, sort
+from .external import external_sort, external_sort_with_animation
+from .heapsort import heap_sort, heap_sort_with_animation, heapify, sift_down, sift_up
+from .incremental import IncrementalHeap, SortedArray
+from .instrument import OpCounter, counting
+from .keys import argsort, sort_by
+from .radixsort import radix_argsort, radix_sort, radix_sort_with_animation
+from .recorder import Frame, FrameRecorder, animate, decimate, stream_frames
+from .shellsort import shell_sort, shell_sort_with_animation
+from .timsort import insertion_sort, merge, tim_sort, tim_sort_with_animation
+from .tracefile import load_trace, save_trace
+
+__all__ = [
+    'Frame', 'FrameRecorder', 'animate', 'decimate', 'stream_frames',
+    'load_trace', 'save_trace',
+    'OpCounter', 'counting',
+    'argsort', 'sort_by',
+    'sort', 'calibrate', 'msd_radix_sort',
+    'SortedArray', 'IncrementalHeap',
+    'bucket_sort', 'bucket_sort_with_animation',
+    'counting_sort', 'counting_sort_with_animation', 'counting_argsort',
+    'external_sort', 'external_sort_with_animation',
+    'heap_sort', 'heap_sort_with_animation', 'heapify', 'sift_down', 'sift_up',
+    'radix_sort', 'radix_sort_with_animation', 'radix_argsort',
+    'shell_sort', 'shell_sort_with_animation',
+    'tim_sort', 'tim_sort_with_animation', 'insertion_sort', 'merge',
+]
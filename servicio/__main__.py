@@ -0,0 +1,76 @@
+import argparse
+import inspect
+from importlib import import_module
+
+import numpy as np
+
+from .cache import TraceCache, cached_animation
+
+# nombre -> (módulo, función animada, tamaño por defecto, valor máximo por defecto)
+ALGORITHMS = {
+    'bucket': ('bucketsort', 'bucket_sort_with_animation', 9, 100),
+    'counting': ('countingsort', 'counting_sort_with_animation', 15, 20),
+    'external': ('external', 'external_sort_with_animation', 64, 1000),
+    'heap': ('heapsort', 'heap_sort_with_animation', 10, 100),
+    'radix': ('radixsort', 'radix_sort_with_animation', 20, 1000),
+    'shell': ('shellsort', 'shell_sort_with_animation', 20, 100),
+    'tim': ('timsort', 'tim_sort_with_animation', 64, 100),
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m servicio',
+                                     description='Genera la animación de un algoritmo de ordenamiento.')
+    parser.add_argument('algorithm', choices=sorted(ALGORITHMS))
+    parser.add_argument('--size', '-n', type=int, help='cantidad de elementos')
+    parser.add_argument('--max-value', type=int, help='valor máximo (exclusivo) de los elementos')
+    parser.add_argument('--seed', type=int, help='semilla del generador aleatorio')
+    parser.add_argument('--output', '-o', help='archivo HTML de salida')
+    parser.add_argument('--no-open', action='store_true', help='no abrir el navegador')
+    parser.add_argument('--stream', action='store_true',
+                        help='renderizar los frames a medida que se generan, sin guardar la traza')
+    parser.add_argument('--replay', action='store_true',
+                        help='guardar el log de deltas y reproducirlo en el navegador (HTML liviano)')
+    parser.add_argument('--workers', type=int,
+                        help='procesos para construir los frames de plotly en paralelo')
+    parser.add_argument('--cache', action='store_true',
+                        help='reutilizar trazas y animaciones ya generadas con la misma entrada')
+    parser.add_argument('--cache-dir', help='directorio de la caché (implica --cache)')
+    parser.add_argument('--cache-size', type=int, default=512, help='tamaño máximo de la caché en MB')
+    parser.add_argument('--max-frames', type=int,
+                        help='reducir la animación a esta cantidad de frames como máximo')
+    parser.add_argument('--sample', choices=['even', 'change'], default='even',
+                        help='cómo elegir los frames entre etapas: parejo o según cuánto cambian')
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.replay and args.stream:
+        parser.error('--replay necesita la traza grabada: no se puede combinar con --stream')
+    use_cache = args.cache or args.cache_dir
+    if use_cache and args.stream:
+        parser.error('la caché guarda la traza grabada: no se puede combinar con --stream')
+    module_name, function_name, size, max_value = ALGORITHMS[args.algorithm]
+    module = import_module(f'.{module_name}', __package__)
+
+    rng = np.random.default_rng(args.seed)
+    arr = rng.integers(1, args.max_value or max_value, args.size or size)
+    print(f"Array generado: {arr}")
+
+    render = dict(max_frames=args.max_frames, sample=args.sample, replay=args.replay)
+    if use_cache:
+        cache = TraceCache(args.cache_dir, max_bytes=args.cache_size * 1024 * 1024)
+        output = args.output or inspect.signature(module.create_animation).parameters['output_file'].default
+        cached_animation(module, function_name, arr, output, cache=cache, auto_open=not args.no_open,
+                         workers=args.workers, **render)
+        return
+
+    frames = getattr(module, function_name)(arr, stream=args.stream)
+    kwargs = {'output_file': args.output} if args.output else {}
+    module.create_animation(frames, auto_open=not args.no_open, workers=args.workers, **render, **kwargs)
+
+
+if __name__ == '__main__':
+    main()
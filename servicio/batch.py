@@ -0,0 +1,164 @@
+"""Generación de muchas animaciones en lote.
+
+    python -m servicio.batch manifest.json --sort-workers 4 --render-workers 2
+
+El manifiesto es una lista JSON de trabajos (o un trabajo JSON por línea)::
+
+    {"algorithm": "heap", "seed": 1, "size": 50, "output": "heap-1.html"}
+    {"algorithm": "tim", "array": [5, 3, 9, 1], "render": {"max_frames": 200}}
+
+``array`` da la entrada explícita; si falta se genera con ``seed``, ``size`` y
+``max_value`` como en ``python -m servicio``. ``params`` va a la función que
+graba la traza y ``render`` a ``create_animation``. Ordenar y renderizar corren
+en pools de procesos separados: la traza pasa de uno a otro como archivo de
+``tracefile`` en disco, no serializada. El navegador nunca se abre.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from importlib import import_module
+
+import numpy as np
+
+from .__main__ import ALGORITHMS
+from .bench import print_table
+from .tracefile import load_trace, save_trace
+
+REPORT_COLUMNS = ('job', 'algorithm', 'n', 'frames', 'sort_seconds', 'render_seconds', 'status')
+
+
+def load_manifest(path):
+    with open(path) as f:
+        text = f.read()
+    if text.lstrip().startswith('['):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def _limit_memory(max_bytes):
+    # Tope de memoria virtual por proceso: un trabajo que lo supera falla con
+    # MemoryError sin tumbar al resto
+    if max_bytes:
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (max_bytes, max_bytes))
+
+
+def job_input(job):
+    if 'array' in job:
+        return np.asarray(job['array'])
+    _, _, size, max_value = ALGORITHMS[job['algorithm']]
+    rng = np.random.default_rng(job.get('seed'))
+    return rng.integers(1, job.get('max_value', max_value), job.get('size', size))
+
+
+def _module(algorithm):
+    module_name, function_name, _, _ = ALGORITHMS[algorithm]
+    return import_module(f'.{module_name}', __package__), function_name
+
+
+def _sort_job(job, trace_path):
+    module, function_name = _module(job['algorithm'])
+    arr = job_input(job)
+    start = time.perf_counter()
+    frames = getattr(module, function_name)(arr, **job.get('params', {}))
+    save_trace(frames, trace_path)
+    return {'n': int(arr.size), 'frames': len(frames), 'sort_seconds': time.perf_counter() - start}
+
+
+def _render_job(job, trace_path, output):
+    module, _ = _module(job['algorithm'])
+    start = time.perf_counter()
+    module.create_animation(load_trace(trace_path), output_file=output, auto_open=False,
+                            **job.get('render', {}))
+    return {'render_seconds': time.perf_counter() - start}
+
+
+def run_batch(jobs, sort_workers=None, render_workers=None, max_pending=None, memory_limit=None,
+              trace_dir=None):
+    """Ordena y renderiza ``jobs``; devuelve una fila de reporte por trabajo.
+
+    A lo sumo ``max_pending`` trabajos están en curso a la vez (por defecto,
+    el doble de procesos), lo que acota las trazas que esperan en disco.
+    ``memory_limit`` es el tope en bytes de cada proceso. Un trabajo que
+    falla queda en el reporte con ``status`` igual al error.
+    """
+    sort_workers = sort_workers or os.cpu_count() or 1
+    render_workers = render_workers or sort_workers
+    max_pending = max_pending or 2 * (sort_workers + render_workers)
+    rows = [{'job': index, 'algorithm': job['algorithm'], 'n': None, 'frames': None,
+             'output': job.get('output', f"{job['algorithm']}-{index}.html"),
+             'sort_seconds': None, 'render_seconds': None, 'status': 'pending'}
+            for index, job in enumerate(jobs)]
+    for job in jobs:
+        if job['algorithm'] not in ALGORITHMS:
+            raise ValueError(f"Algoritmo desconocido: {job['algorithm']!r}")
+
+    with tempfile.TemporaryDirectory(dir=trace_dir) as traces, \
+            ProcessPoolExecutor(sort_workers, initializer=_limit_memory, initargs=(memory_limit,)) as sorting, \
+            ProcessPoolExecutor(render_workers, initializer=_limit_memory, initargs=(memory_limit,)) as rendering:
+        queue = iter(range(len(jobs)))
+        running = {}
+
+        def submit_sort():
+            index = next(queue, None)
+            if index is not None:
+                path = os.path.join(traces, f'{index}.trace')
+                running[sorting.submit(_sort_job, jobs[index], path)] = ('sort', index, path)
+
+        for _ in range(max_pending):
+            submit_sort()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, index, path = running.pop(future)
+                row = rows[index]
+                try:
+                    row.update(future.result())
+                except Exception as error:
+                    row['status'] = f'{type(error).__name__}: {error}'
+                else:
+                    if stage == 'sort':
+                        running[rendering.submit(_render_job, jobs[index], path, row['output'])] = \
+                            ('render', index, path)
+                        continue
+                    row['status'] = 'ok'
+                if os.path.exists(path):
+                    os.unlink(path)
+                submit_sort()
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m servicio.batch',
+                                     description='Genera las animaciones de un manifiesto de trabajos.')
+    parser.add_argument('manifest', help='lista JSON de trabajos o un trabajo JSON por línea')
+    parser.add_argument('--sort-workers', type=int, help='procesos que ordenan y graban trazas')
+    parser.add_argument('--render-workers', type=int, help='procesos que renderizan las animaciones')
+    parser.add_argument('--max-pending', type=int, help='trabajos en curso a la vez como máximo')
+    parser.add_argument('--memory-limit', type=int, help='tope de memoria por proceso en MB')
+    parser.add_argument('--trace-dir', help='directorio para las trazas intermedias')
+    parser.add_argument('--report', help='guardar el reporte como JSON en este archivo')
+    args = parser.parse_args(argv)
+
+    jobs = load_manifest(args.manifest)
+    start = time.perf_counter()
+    rows = run_batch(jobs, args.sort_workers, args.render_workers, args.max_pending,
+                     args.memory_limit and args.memory_limit * 1024 * 1024, args.trace_dir)
+    elapsed = time.perf_counter() - start
+    print_table(rows, REPORT_COLUMNS)
+    ok = sum(row['status'] == 'ok' for row in rows)
+    print(f"{ok}/{len(rows)} trabajos en {elapsed:.2f} s ({len(rows) / elapsed:.2f} trabajos/s)")
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({'seconds': elapsed, 'jobs': rows}, f, indent=2)
+        print(f"Reporte guardado en {args.report}")
+    if ok < len(rows):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
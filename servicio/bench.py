@@ -0,0 +1,299 @@
+"""Benchmarks de los algoritmos de ordenamiento.
+
+    python -m servicio.bench sorts --sizes 10 1000 100000 --output bench.json
+    python -m servicio.bench gaps --sizes 1000 10000
+    python -m servicio.bench ops --sizes 1000 --distributions uniform sorted
+    python -m servicio.bench parallel --sizes 100000 --workers 1 2 4 8
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from .bucketsort import bucket_sort, bucket_sort_with_animation
+from .countingsort import counting_sort, counting_sort_with_animation
+from .dispatch import calibrate, save_thresholds
+from .heapsort import heap_sort, heap_sort_with_animation
+from .instrument import FIELDS, counting
+from .radixsort import radix_sort, radix_sort_with_animation
+from .recorder import FrameRecorder
+from .shellsort import GAP_SEQUENCES, gap_sequence, shell_sort, shell_sort_with_animation
+from .timsort import tim_sort, tim_sort_with_animation
+
+# nombre -> (motor sin frames, versión que graba frames)
+ALGORITHMS = {
+    'bucket': (bucket_sort, bucket_sort_with_animation),
+    'counting': (counting_sort, counting_sort_with_animation),
+    'heap': (heap_sort, heap_sort_with_animation),
+    'radix': (radix_sort, radix_sort_with_animation),
+    'shell': (shell_sort, shell_sort_with_animation),
+    'tim': (tim_sort, tim_sort_with_animation),
+}
+
+BASELINES = {
+    'np.sort': lambda arr: np.sort(arr, kind='stable'),
+    'sorted': lambda arr: sorted(arr.tolist()),
+}
+
+# Algoritmos que recorren los elementos en Python: se limitan a tamaños menores
+PURE_PYTHON = {'heap', 'shell', 'tim', 'sorted'}
+
+DISTRIBUTIONS = ('uniform', 'sorted', 'reversed', 'few_unique', 'zipf')
+
+
+def make_input(kind, n, rng):
+    if kind in ('random', 'uniform'):
+        return rng.integers(0, max(n, 1), n)
+    if kind == 'sorted':
+        return np.arange(n)
+    if kind == 'few_unique':
+        return rng.integers(0, 8, n)
+    if kind == 'zipf':
+        # Cola acotada para que el rango de counting sort siga siendo razonable
+        return np.minimum(rng.zipf(1.3, n), 10 * max(n, 10))
+    if kind == 'reversed':
+        return np.arange(n)[::-1].copy()
+    if kind == 'nearly_sorted':
+        # Ordenado salvo un 1% de pares intercambiados
+        arr = np.arange(n)
+        swaps = rng.integers(0, max(n, 1), (n // 100, 2))
+        arr[swaps[:, 0]], arr[swaps[:, 1]] = arr[swaps[:, 1]], arr[swaps[:, 0]]
+        return arr
+    raise ValueError(f"Tipo de entrada desconocido: {kind!r}")
+
+
+def bench_gaps(sizes=(1000, 10000), kinds=('random', 'reversed', 'nearly_sorted'),
+               sequences=None, seed=0):
+    """Compara las secuencias de gaps de shell sort; devuelve una fila por corrida."""
+    rng = np.random.default_rng(seed)
+    results = []
+    for n in sizes:
+        for kind in kinds:
+            data = make_input(kind, n, rng)
+            for name in sequences or GAP_SEQUENCES:
+                arr = data.copy()
+                start = time.perf_counter()
+                shell_sort(arr, name)
+                results.append({
+                    'sequence': name,
+                    'input': kind,
+                    'n': n,
+                    'passes': len(gap_sequence(n, name)),
+                    'seconds': time.perf_counter() - start,
+                })
+    return results
+
+
+def _measure(function, data, memory):
+    arr = data.copy()
+    start = time.perf_counter()
+    result = function(arr)
+    row = {'seconds': time.perf_counter() - start}
+    row['frames'] = len(result) if isinstance(result, FrameRecorder) else 0
+    del result
+    if memory:
+        # Segunda corrida con tracemalloc, que distorsiona los tiempos
+        arr = data.copy()
+        tracemalloc.start()
+        function(arr)
+        row['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return row
+
+
+def bench_sorts(algorithms=None, sizes=(10, 100, 1000, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7),
+                distributions=DISTRIBUTIONS, modes=('engine', 'record'), baselines=True,
+                max_record_n=10 ** 4, max_python_n=10 ** 5, memory=True, seed=0):
+    """Mide cada algoritmo por tamaño, distribución y modo; devuelve una fila por corrida.
+
+    ``engine`` ordena sin frames y ``record`` graba la traza completa. Las
+    combinaciones por encima de ``max_record_n`` o ``max_python_n`` se saltan.
+    """
+    rng = np.random.default_rng(seed)
+    results = []
+    for n in sizes:
+        for distribution in distributions:
+            data = make_input(distribution, n, rng)
+            runs = []
+            for name in algorithms or ALGORITHMS:
+                engine, recorded = ALGORITHMS[name]
+                if 'engine' in modes and (name not in PURE_PYTHON or n <= max_python_n):
+                    runs.append((name, 'engine', engine))
+                if 'record' in modes and n <= max_record_n:
+                    runs.append((name, 'record', recorded))
+            if baselines:
+                runs.extend((name, 'baseline', function) for name, function in BASELINES.items()
+                            if name not in PURE_PYTHON or n <= max_python_n)
+            for name, mode, function in runs:
+                row = {'algorithm': name, 'mode': mode, 'distribution': distribution, 'n': n}
+                row.update(_measure(function, data, memory))
+                results.append(row)
+    return results
+
+
+def bench_ops(algorithms=None, sizes=(1000,), distributions=DISTRIBUTIONS, seed=0):
+    """Cuenta las operaciones de cada motor; devuelve una fila por fase."""
+    rng = np.random.default_rng(seed)
+    results = []
+    for n in sizes:
+        for distribution in distributions:
+            data = make_input(distribution, n, rng)
+            for name in algorithms or ALGORITHMS:
+                with counting() as ops:
+                    ALGORITHMS[name][0](data.copy())
+                phases = ops.as_dict()['phases']
+                phases['total'] = ops.totals()
+                for phase, counts in phases.items():
+                    results.append({'algorithm': name, 'distribution': distribution, 'n': n,
+                                    'phase': phase, **counts})
+    return results
+
+
+# Motores con modo paralelo: workers=1 es la versión de un solo proceso
+PARALLEL = {
+    'radix': lambda arr, workers: radix_sort(arr, workers=workers),
+    'tim': lambda arr, workers: tim_sort(arr, workers=workers),
+}
+
+
+def bench_parallel(algorithms=None, sizes=(10 ** 5,), workers=None, distribution='uniform',
+                   repeat=3, seed=0):
+    """Curva de speedup de los modos paralelos; devuelve una fila por cantidad de procesos.
+
+    Cada medición es la mejor de ``repeat`` corridas e incluye crear el pool
+    y copiar a memoria compartida, como en un uso real.
+    """
+    workers = workers or sorted({1, 2, 4, os.cpu_count() or 1})
+    rng = np.random.default_rng(seed)
+    results = []
+    for n in sizes:
+        data = make_input(distribution, n, rng)
+        for name in algorithms or PARALLEL:
+            baseline = None
+            for count in workers:
+                times = []
+                for _ in range(repeat):
+                    arr = data.copy()
+                    start = time.perf_counter()
+                    PARALLEL[name](arr, count)
+                    times.append(time.perf_counter() - start)
+                seconds = min(times)
+                baseline = baseline or seconds
+                results.append({'algorithm': name, 'distribution': distribution, 'n': n,
+                                'workers': count, 'seconds': seconds, 'speedup': baseline / seconds,
+                                'efficiency': baseline / seconds / count})
+    return results
+
+
+def environment():
+    return {
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def print_table(results, columns):
+    rows = [[f"{row[col]:.4f}" if isinstance(row[col], float) else str(row[col]) for col in columns]
+            for row in results]
+    widths = [max(len(col), *(len(row[i]) for row in rows)) for i, col in enumerate(columns)]
+    print('  '.join(col.ljust(w) for col, w in zip(columns, widths)).rstrip())
+    for row in rows:
+        print('  '.join(cell.ljust(w) for cell, w in zip(row, widths)).rstrip())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m servicio.bench')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    sorts = commands.add_parser('sorts', help='medir todos los algoritmos')
+    sorts.add_argument('--algorithms', nargs='+', choices=sorted(ALGORITHMS))
+    sorts.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10 ** 4, 10 ** 5])
+    sorts.add_argument('--distributions', nargs='+', choices=DISTRIBUTIONS, default=list(DISTRIBUTIONS))
+    sorts.add_argument('--modes', nargs='+', choices=['engine', 'record'], default=['engine', 'record'])
+    sorts.add_argument('--no-baselines', action='store_true', help='no medir np.sort ni sorted')
+    sorts.add_argument('--max-record-n', type=int, default=10 ** 4)
+    sorts.add_argument('--max-python-n', type=int, default=10 ** 5)
+    sorts.add_argument('--no-memory', action='store_true', help='no medir el pico de memoria')
+    sorts.add_argument('--seed', type=int, default=0)
+    sorts.add_argument('--output', '-o', help='archivo JSON de salida (por defecto, stdout)')
+
+    ops = commands.add_parser('ops', help='contar operaciones por fase')
+    ops.add_argument('--algorithms', nargs='+', choices=sorted(ALGORITHMS))
+    ops.add_argument('--sizes', type=int, nargs='+', default=[1000])
+    ops.add_argument('--distributions', nargs='+', choices=DISTRIBUTIONS, default=list(DISTRIBUTIONS))
+    ops.add_argument('--seed', type=int, default=0)
+    ops.add_argument('--json', action='store_true', help='imprimir los resultados como JSON')
+
+    parallel = commands.add_parser('parallel', help='speedup de los modos con workers')
+    parallel.add_argument('--algorithms', nargs='+', choices=sorted(PARALLEL))
+    parallel.add_argument('--sizes', type=int, nargs='+', default=[10 ** 5])
+    parallel.add_argument('--workers', type=int, nargs='+', help='cantidades de procesos a medir')
+    parallel.add_argument('--distribution', choices=DISTRIBUTIONS, default='uniform')
+    parallel.add_argument('--repeat', type=int, default=3)
+    parallel.add_argument('--seed', type=int, default=0)
+    parallel.add_argument('--json', action='store_true', help='imprimir los resultados como JSON')
+
+    gaps = commands.add_parser('gaps', help='comparar secuencias de gaps de shell sort')
+    gaps.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    gaps.add_argument('--sequences', nargs='+', choices=sorted(GAP_SEQUENCES))
+    gaps.add_argument('--seed', type=int, default=0)
+    gaps.add_argument('--json', action='store_true', help='imprimir los resultados como JSON')
+
+    calibration = commands.add_parser('calibrate', help='ajustar los umbrales de sort() a esta máquina')
+    calibration.add_argument('--size', '-n', type=int, default=20000)
+    calibration.add_argument('--repeat', type=int, default=3)
+    calibration.add_argument('--seed', type=int, default=0)
+    calibration.add_argument('--output', '-o', help='archivo de umbrales (por defecto, en el directorio de la caché)')
+    calibration.add_argument('--dry-run', action='store_true', help='mostrar los umbrales sin guardarlos')
+    args = parser.parse_args(argv)
+
+    if args.command == 'calibrate':
+        thresholds = calibrate(args.size, args.repeat, args.seed, save=False)
+        print_table([{'threshold': name, 'value': value} for name, value in thresholds.items()],
+                    ['threshold', 'value'])
+        if not args.dry_run:
+            print(f"Umbrales guardados en {save_thresholds(thresholds, args.output)}")
+        return
+
+    if args.command == 'sorts':
+        results = bench_sorts(args.algorithms, args.sizes, args.distributions, args.modes,
+                              baselines=not args.no_baselines, max_record_n=args.max_record_n,
+                              max_python_n=args.max_python_n, memory=not args.no_memory,
+                              seed=args.seed)
+        report = json.dumps({'environment': environment(), 'results': results}, indent=2)
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(report)
+            print(f"Resultados guardados en {args.output}")
+        else:
+            print(report)
+        return
+
+    if args.command == 'ops':
+        results = bench_ops(args.algorithms, args.sizes, args.distributions, args.seed)
+        columns = ['algorithm', 'distribution', 'n', 'phase', *FIELDS]
+    elif args.command == 'parallel':
+        results = bench_parallel(args.algorithms, args.sizes, args.workers, args.distribution,
+                                 args.repeat, args.seed)
+        columns = ['algorithm', 'n', 'workers', 'seconds', 'speedup', 'efficiency']
+    else:
+        results = bench_gaps(args.sizes, sequences=args.sequences, seed=args.seed)
+        columns = ['sequence', 'input', 'n', 'passes', 'seconds']
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results, columns)
+
+
+if __name__ == '__main__':
+    main()
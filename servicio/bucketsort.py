@@ -0,0 +1,248 @@
+import numpy as np
+
+from . import instrument
+from .recorder import animate
+from .render import Peak, build_frames, labels, render_animation
+
+class _BucketView:
+    # Los buckets se guardan como segmentos contiguos de un solo arreglo; solo
+    # se rearman los que cambiaron desde el frame anterior. Cada traza tiene su
+    # propia vista: guarda los canales y buckets del último frame que vio, y
+    # como los canales que no cambian entre frames son el mismo arreglo, basta
+    # compararlos por identidad
+
+    def __init__(self):
+        self._last = None
+
+    def __call__(self, frame):
+        slots, starts, fill = frame.pop('slots'), frame.pop('starts'), frame.pop('fill')
+        last = self._last
+        if last is not None and last[1] is starts:
+            buckets = list(last[3])
+            changed = np.flatnonzero(last[0] != slots) if last[0] is not slots else []
+            touched = set(np.searchsorted(starts, changed, side='right') - 1)
+            if last[2] is not fill:
+                touched.update(np.flatnonzero(last[2] != fill))
+            for b in touched:
+                buckets[b] = tuple(slots[starts[b]:starts[b] + fill[b]].tolist())
+        else:
+            buckets = [tuple(slots[s:s + f].tolist()) for s, f in zip(starts, fill)]
+        self._last = slots, starts, fill, buckets
+        frame['buckets'] = buckets
+        return frame
+
+def bucket_sort_steps(arr, indices, starts, sizes, slots, fill, output):
+    # Agregar el estado inicial aleatorio
+    yield (), dict(stage='initial', current=-1)
+    
+    instrument.set_phase('distribute')
+    for i, index in enumerate(indices):
+        position = starts[index] + fill[index]
+        slots[position] = arr[i]
+        fill[index] += 1
+        yield {'slots': (position,), 'fill': (index,)}, dict(stage='distribute', current=i)
+    instrument.add(moves=len(indices))
+
+    # El arreglo combinado empieza vacío
+    instrument.set_phase('combine')
+    output[:] = 0
+    yield slice(None), None
+    placed = 0
+    for start, size in zip(starts, sizes):
+        slots[start:start + size].sort()
+        output[placed:placed + size] = slots[start:start + size]
+        placed += size
+        yield ({'slots': slice(start, start + size), 'arr': slice(placed - size, placed)},
+               dict(stage='combine', current=placed - 1))
+    instrument.add(moves=placed)
+
+def default_num_buckets(n):
+    # Buckets de ~1024 elementos: suficientes para que cada np.sort sea barato
+    # sin que el costo fijo por bucket domine
+    return min(1 << 15, max(1, n // 1024))
+
+def quantile_boundaries(values, num_buckets, sample_size=None, seed=0):
+    """Límites entre buckets tomados de los cuantiles de una muestra.
+
+    Con datos sesgados los buckets quedan de tamaño parecido, cosa que los
+    rangos de igual ancho no consiguen.
+    """
+    n = values.size
+    sample_size = min(n, sample_size or 64 * num_buckets)
+    sample = values[np.random.default_rng(seed).integers(0, n, sample_size)]
+    return np.unique(np.quantile(sample, np.linspace(0, 1, num_buckets + 1)[1:-1]))
+
+def bucket_indices(values, num_buckets, strategy='uniform'):
+    """Bucket de cada elemento y cantidad total de buckets.
+
+    ``'uniform'`` divide [min, max] en rangos de igual ancho. ``'quantile'``
+    usa ``quantile_boundaries`` y da a cada límite un bucket propio para los
+    valores iguales a él, de modo que un valor muy repetido (Zipf) queda en
+    un bucket que ya está ordenado.
+    """
+    values = np.asarray(values)
+    if strategy == 'uniform':
+        # En float64: restar el mínimo en el dtype original desborda (int8,
+        # float16) y la conversión conserva el orden
+        wide = values.astype(np.float64)
+        min_val, max_val = wide.min(), wide.max()
+        if max_val == min_val:
+            return np.zeros(values.size, dtype=np.intp), num_buckets
+        normalized = (wide - min_val) / (max_val - min_val)
+        return np.minimum((normalized * num_buckets).astype(np.intp), num_buckets - 1), num_buckets
+    if strategy == 'quantile':
+        bounds = quantile_boundaries(values, num_buckets)
+        if bounds.size == 0:
+            return np.zeros(values.size, dtype=np.intp), 1
+        # Bucket 2k: (bounds[k-1], bounds[k]); bucket 2k + 1: exactamente bounds[k]
+        pos = np.searchsorted(bounds, values, side='left')
+        exact = bounds[np.minimum(pos, bounds.size - 1)] == values
+        return 2 * pos + exact, 2 * bounds.size + 1
+    raise ValueError(f"Estrategia de buckets desconocida: {strategy!r}")
+
+def _bucket_layout(arr, num_buckets, strategy='uniform'):
+    indices, num_buckets = bucket_indices(arr, num_buckets, strategy)
+
+    # Reservar para cada bucket un segmento del tamaño que tendrá al final
+    sizes = np.bincount(indices, minlength=num_buckets)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    return indices, starts, sizes
+
+def bucket_sort_with_animation(arr, num_buckets=5, stream=False, strategy='uniform'):
+    indices, starts, sizes = _bucket_layout(arr, num_buckets, strategy)
+    slots = np.zeros_like(arr)
+    fill = np.zeros(len(sizes), dtype=int)
+    output = np.array(arr)
+    steps = bucket_sort_steps(arr, indices, starts, sizes, slots, fill, output)
+    return animate(steps, stream, view=_BucketView(), arr=output, slots=slots, starts=starts, fill=fill)
+
+def _sort_buckets(values, bounds):
+    # Ordena en su lugar cada segmento values[bounds[k]:bounds[k + 1]]
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        if end - start > 1:
+            bucket = values[start:end]
+            if bucket.min() != bucket.max():
+                bucket.sort()
+    return values
+
+def _sort_chunk(args):
+    return _sort_buckets(*args)
+
+def bucket_sort(arr, num_buckets=None, strategy=None, workers=None):
+    """Bucket sort vectorizado; devuelve un arreglo nuevo ordenado.
+
+    Sin ``num_buckets`` la cantidad sale de ``len(arr)`` y los límites de los
+    cuantiles de una muestra. El reparto es un ``np.searchsorted`` seguido de
+    una partición estable, y con ``workers`` los buckets se ordenan en un pool
+    de procesos, repartidos en bloques contiguos.
+    """
+    values = np.asarray(arr)
+    n = values.size
+    if n < 2:
+        return values.copy()
+    if strategy is None:
+        strategy = 'uniform' if num_buckets is not None else 'quantile'
+    if num_buckets is None:
+        num_buckets = default_num_buckets(n)
+
+    # Distribuir: partición estable por número de bucket
+    instrument.set_phase('distribute')
+    indices, count = bucket_indices(values, num_buckets, strategy)
+    key_dtype = np.uint16 if count <= 1 << 16 else np.intp
+    order = np.argsort(indices.astype(key_dtype), kind='stable')
+    grouped = values[order]
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(indices, minlength=count))))
+    instrument.add(moves=n, allocations=3, nbytes=indices.nbytes + order.nbytes + grouped.nbytes)
+
+    # Combinar: ordenar cada bucket; quedan ya concatenados en orden. Los
+    # procesos del pool no informan al contador: el total se registra aquí
+    instrument.set_phase('combine')
+    instrument.add(moves=n)
+    if not workers or workers < 2:
+        return _sort_buckets(grouped, bounds)
+    from concurrent.futures import ProcessPoolExecutor
+    cuts = np.unique(bounds[np.linspace(0, count, 4 * workers + 1).astype(np.intp)])
+    tasks = [(grouped[lo:hi], bounds[(bounds >= lo) & (bounds <= hi)] - lo)
+             for lo, hi in zip(cuts[:-1], cuts[1:])]
+    with ProcessPoolExecutor(workers) as pool:
+        return instrument.allocated(np.concatenate(list(pool.map(_sort_chunk, tasks))))
+
+_COLORS = {
+    'default': 'rgb(173, 216, 230)', 
+    'active': 'rgb(255, 182, 193)', 
+}
+
+# Las barras se colorean con índices chicos sobre una paleta fija
+_PALETTE = np.array(list(_COLORS.values()), dtype=object)
+_DEFAULT, _ACTIVE = range(len(_PALETTE))
+
+def _array_spec(frame):
+    index = np.full(len(frame['arr']), _DEFAULT, dtype=np.uint8)
+    if frame['stage'] in ['distribute', 'combine']:
+        index[frame['current']] = _ACTIVE
+    return dict(
+        type='bar',
+        y=frame['arr'],
+        marker=dict(color=_PALETTE[index].tolist()),
+        text=labels(frame['arr']),
+        textposition='outside',
+        hoverinfo='text'
+    )
+
+def _buckets_text(frame):
+    buckets_text = ""
+    for i, bucket in enumerate(frame['buckets']):
+        buckets_text += f"Bucket {i+1}: {', '.join(map(str, bucket)) if bucket else 'Vacío'}<br>"
+    return f"<b>Estado de los buckets:</b><br>{buckets_text}"
+
+def _buckets_annotation(frame):
+    return dict(
+        text=_buckets_text(frame),
+        xref="paper", yref="paper",
+        x=0.5, y=-0.4,
+        showarrow=False,
+        font=dict(size=14, color="black"),
+        align="center",
+        bgcolor="rgba(255, 255, 255, 0.9)",
+        bordercolor="rgba(0, 0, 0, 0.5)",
+        borderwidth=2,
+        opacity=0.9
+    )
+
+def _frame_spec(frame):
+    return {'data': [_array_spec(frame)], 'layout': {'annotations': [_buckets_annotation(frame)]}}
+
+def _figure(first, frames, workers):
+    peak = Peak('arr')
+    fig_frames = build_frames(frames, _frame_spec, workers, observe=peak)
+
+    # Configurar el layout, con la anotación inicial, y los controles de la animación
+    layout = dict(
+        updatemenus=[dict(
+            type='buttons',
+            showactive=False,
+            buttons=[dict(label='Play',
+                          method='animate',
+                          args=[None, dict(frame=dict(duration=500, redraw=True),
+                                           fromcurrent=True,
+                                           mode='immediate')])]
+        )],
+        height=700,
+        margin=dict(l=20, r=20, t=100, b=200),
+        annotations=[_buckets_annotation(first)],
+        yaxis=dict(range=[0, peak.value * 1.1]),
+    )
+
+    # El trace inicial es el estado aleatorio
+    return [_array_spec(first)], layout, fig_frames
+
+def create_animation(frames, output_file='bucket_sort_animation.html', auto_open=True,
+                     max_frames=None, sample='even', replay=False, workers=None):
+    render_animation(frames, output_file, 'Bucket Sort Animation', _figure, auto_open=auto_open,
+                     max_frames=max_frames, sample=sample, replay=replay, workers=workers, auto_play=False)
+
+if __name__ == "__main__":
+    # Generar un arreglo aleatorio
+    arr = np.random.randint(1, 100, 9)
+    frames = bucket_sort_with_animation(arr, num_buckets=5)
+    create_animation(frames)
@@ -0,0 +1,153 @@
+"""Caché en disco de trazas grabadas y animaciones ya renderizadas.
+
+Las entradas se identifican por un hash del arreglo de entrada, el algoritmo,
+sus parámetros y la versión de los renderizadores, así que una repetición se
+sirve desde el disco sin llamar al algoritmo ni a plotly. Cuando el total
+supera ``max_bytes`` se borran las entradas usadas hace más tiempo.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from .render import RENDER_VERSION
+from .tracefile import load_trace, save_trace
+
+# Subir cuando cambie el formato en que se guardan las trazas
+TRACE_VERSION = 2
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def default_directory():
+    return os.environ.get('SERVICIO_CACHE_DIR') or os.path.join(
+        os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'servicio')
+
+
+def _digest(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else json.dumps(part, sort_keys=True, default=str).encode())
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+class TraceCache:
+    """Directorio con un ``<clave>.trace`` y un ``<clave>.html`` por entrada."""
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_directory()
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def trace_key(self, algorithm, arr, **params):
+        values = np.ascontiguousarray(arr)
+        return _digest(TRACE_VERSION, algorithm, values.dtype.str, values.shape, values.tobytes(), params)
+
+    def html_key(self, trace_key, **render):
+        return _digest(trace_key, RENDER_VERSION, render)
+
+    def _path(self, key, suffix):
+        return os.path.join(self.directory, key + suffix)
+
+    def _hit(self, path):
+        if not os.path.exists(path):
+            return None
+        # La fecha de modificación hace de marca de último uso para el LRU
+        os.utime(path)
+        return path
+
+    def _store(self, path, write):
+        # Escritura atómica: otro proceso nunca ve un archivo a medias
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.evict()
+        return path
+
+    def get_trace(self, key):
+        path = self._hit(self._path(key, '.trace'))
+        if path is None:
+            return None
+        return load_trace(path)
+
+    def put_trace(self, key, recorder):
+        return self._store(self._path(key, '.trace'), lambda f: save_trace(recorder, f))
+
+    def get_html(self, key):
+        return self._hit(self._path(key, '.html'))
+
+    def put_html(self, key, source):
+        def write(f):
+            with open(source, 'rb') as src:
+                shutil.copyfileobj(src, f)
+        return self._store(self._path(key, '.html'), write)
+
+    def entries(self):
+        """Entradas como (última vez usada, bytes, ruta), de la más vieja a la más nueva."""
+        found = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(('.trace', '.html')):
+                stat = entry.stat()
+                found.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(found)
+
+    @property
+    def nbytes(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            os.unlink(path)
+
+
+def cached_animation(module, function_name, arr, output_file, cache=None, auto_open=True,
+                     params=None, workers=None, **render):
+    """Genera la animación de ``module`` pasando por la caché.
+
+    Si el HTML ya existe se copia a ``output_file`` sin ordenar ni renderizar;
+    si solo existe la traza se renderiza desde ella. ``params`` son los
+    argumentos de ``function_name`` y ``render`` los de ``create_animation``
+    (``workers`` no cambia el resultado y no forma parte de la clave).
+    """
+    cache = cache or TraceCache()
+    params = params or {}
+    trace_key = cache.trace_key(f'{module.__name__}.{function_name}', arr, **params)
+    html_key = cache.html_key(trace_key, **render)
+
+    cached = cache.get_html(html_key)
+    if cached is None:
+        frames = cache.get_trace(trace_key)
+        if frames is None:
+            frames = getattr(module, function_name)(np.array(arr, copy=True), **params)
+            cache.put_trace(trace_key, frames)
+        module.create_animation(frames, output_file=output_file, auto_open=False, workers=workers, **render)
+        cache.put_html(html_key, output_file)
+    else:
+        shutil.copyfile(cached, output_file)
+        print(f"La animación se tomó de la caché: {output_file}")
+    if auto_open:
+        import webbrowser
+        webbrowser.open('file://' + os.path.realpath(output_file))
+    return output_file
@@ -0,0 +1,229 @@
+import numpy as np
+
+from . import instrument
+from .radixsort import radix_argsort, radix_sort
+from .recorder import animate
+from .render import Peak, build_frames, labels, render_animation
+
+# Rango máximo para el que vale la pena un arreglo de conteo (32 MB de int64)
+MAX_COUNT_RANGE = 1 << 22
+
+def _keys(values, min_val):
+    # Posición de cada valor en el arreglo de conteo. Con signo se ensancha antes
+    # de restar (en int8 100 - (-100) desborda); sin signo la resta no desborda
+    if values.dtype.kind == 'u':
+        return (values - min_val).astype(np.intp)
+    return values.astype(np.intp) - int(min_val)
+
+def _bins(values, min_val, span):
+    # Los valores min_val .. min_val + span - 1 en el tipo de la entrada,
+    # calculados en 64 bits para que el rango no desborde un tipo angosto
+    wide = np.uint64 if values.dtype.kind == 'u' else np.int64
+    return (np.arange(span, dtype=wide) + wide(min_val)).astype(values.dtype)
+
+def _counting_view(frame):
+    # Antes de colocar elementos no hay salida que mostrar
+    if frame['stage'] != 'place':
+        frame['output'] = []
+    if frame['stage'] == 'count':
+        del frame['cumulative_count']
+    return frame
+
+def counting_sort_steps(arr, min_val, count, cumulative_count, output):
+    # Contar ocurrencias
+    # Como enteros de Python, para que num - min_val no desborde un tipo angosto
+    instrument.set_phase('count')
+    for num in map(int, arr):
+        count[num - min_val] += 1
+        yield {'count': (num - min_val,)}, dict(stage='count', current=num)
+
+    # Calcular las posiciones acumuladas
+    instrument.set_phase('accumulate')
+    cumulative_count[:] = count
+    yield {'cumulative_count': slice(None)}, None
+    for i in range(1, len(cumulative_count)):
+        cumulative_count[i] += cumulative_count[i-1]
+        yield {'cumulative_count': (i,)}, dict(stage='accumulate', current=i + min_val)
+
+    # Construir el array ordenado
+    instrument.set_phase('place')
+    for num in map(int, reversed(arr)):
+        index = cumulative_count[num - min_val] - 1
+        output[index] = num
+        cumulative_count[num - min_val] -= 1
+        yield ({'output': (index,), 'cumulative_count': (num - min_val,)},
+               dict(stage='place', current=num))
+    instrument.add(moves=len(arr))
+
+def counting_sort_stage_steps(arr, min_val, count, cumulative_count, output):
+    # Cada etapa es una sola operación vectorizada: un frame por etapa
+    instrument.set_phase('count')
+    count[:] = np.bincount(_keys(np.asarray(arr), min_val), minlength=len(count))
+    yield {'count': slice(None)}, dict(stage='count', current=None)
+
+    instrument.set_phase('accumulate')
+    cumulative_count[:] = np.cumsum(count)
+    yield {'cumulative_count': slice(None)}, dict(stage='accumulate', current=None)
+
+    # Con enteros sin datos asociados, repetir cada valor según su conteo es
+    # exactamente la colocación estable que hace el recorrido hacia atrás
+    instrument.set_phase('place')
+    output[:] = np.repeat(_bins(output, min_val, len(count)), count)
+    cumulative_count[:] -= count
+    instrument.add(moves=len(output))
+    yield ({'output': slice(None), 'cumulative_count': slice(None)},
+           dict(stage='place', current=None))
+
+def counting_sort_with_animation(arr, stream=False, stages_only=False):
+    # Enteros de Python: en un tipo angosto max_val - min_val puede desbordar
+    max_val = int(max(arr))
+    min_val = int(min(arr))
+    range_val = max_val - min_val + 1
+
+    if stages_only:
+        count = np.zeros(range_val, dtype=np.int64)
+        cumulative_count = np.zeros(range_val, dtype=np.int64)
+        output = np.zeros(len(arr), dtype=np.asarray(arr).dtype)
+        steps = counting_sort_stage_steps(arr, min_val, count, cumulative_count, output)
+    else:
+        # Inicializar el array de conteo
+        count = [0] * range_val
+        cumulative_count = [0] * range_val
+        output = [0] * len(arr)
+        steps = counting_sort_steps(arr, min_val, count, cumulative_count, output)
+    return animate(steps, stream, view=_counting_view, arr=arr, count=count,
+                   cumulative_count=cumulative_count, output=output)
+
+def counting_sort(arr, max_range=MAX_COUNT_RANGE):
+    """Counting sort vectorizado; devuelve un arreglo nuevo ordenado.
+
+    Si el rango de valores es mucho mayor que ``len(arr)`` (o que ``max_range``)
+    el arreglo de conteo no compensa y se delega en el radix sort por dígitos
+    de 16 bits.
+    """
+    values = np.asarray(arr)
+    if values.dtype.kind not in 'iu':
+        raise TypeError("counting sort solo ordena enteros")
+    if values.size == 0:
+        return values.copy()
+    min_val, max_val = values.min(), values.max()
+    span = int(max_val) - int(min_val) + 1
+    if span > min(max_range, max(8 * values.size, 1 << 16)):
+        return radix_sort(values, base=65536)
+    instrument.set_phase('count')
+    count = instrument.allocated(np.bincount(_keys(values, min_val), minlength=span))
+    instrument.set_phase('place')
+    output = instrument.allocated(np.repeat(_bins(values, min_val, span), count))
+    instrument.add(moves=values.size)
+    return output
+
+def counting_argsort(arr):
+    """Permutación estable que ordena los enteros de ``arr``.
+
+    Con un rango de hasta 2**16 valores es un solo conteo: el argsort estable
+    de NumPy sobre uint16 cuenta y coloca sin comparar. Con rangos mayores se
+    delega en ``radix_argsort``, por dígitos de 16 bits.
+    """
+    values = np.asarray(arr)
+    if values.dtype.kind not in 'iu':
+        raise TypeError("counting sort solo ordena enteros")
+    if values.size == 0:
+        return np.arange(0)
+    min_val = values.min()
+    span = int(values.max()) - int(min_val) + 1
+    if span > 1 << 16:
+        return radix_argsort(values, base=65536)
+    instrument.set_phase('place')
+    instrument.add(moves=values.size, allocations=2, nbytes=values.size * 10)
+    return np.argsort(_keys(values, min_val).astype(np.uint16), kind='stable')
+
+PASTEL_BLUE = 'rgb(173, 216, 230)'  # Light Blue
+PASTEL_GREEN = 'rgb(152, 251, 152)'  # Pale Green
+PASTEL_ORANGE = 'rgb(255, 229, 180)'  # Light Peach
+PASTEL_CORAL = 'rgb(255, 105, 97)'  # Light Coral, para el valor actual
+
+def _bar_spec(arr, current=None, color=PASTEL_BLUE):
+    values = np.asarray(arr)
+    if current is None:
+        colors = [color] * len(values)
+    else:
+        colors = np.where(values == current, PASTEL_CORAL, color).tolist()
+    return dict(type='bar', y=arr, marker=dict(color=colors), text=labels(values),
+                textposition='outside', hoverinfo='text')
+
+def _count_spec(count, min_val, color=PASTEL_GREEN):
+    x_values = list(range(len(count)))
+    x_labels = [str(i + min_val) for i in x_values]  # Etiquetas del eje x
+    return dict(
+        type='bar',
+        x=x_labels, 
+        y=count, 
+        marker=dict(color=color), 
+        text=labels(count),  # Mostrar el texto del conteo
+        textposition='outside', 
+        hoverinfo='text',
+        name='Frecuencia'
+    )
+
+def _frame_spec(frame, min_val):
+    return {'data': [
+        _bar_spec(frame['arr'], frame['current']),
+        _count_spec(frame['count'], min_val),
+        _bar_spec(frame['output'], frame['current'] if frame['stage'] == 'place' else None, PASTEL_ORANGE)
+    ]}
+
+def _figure(first, frames, workers):
+    from functools import partial
+
+    max_val = max(first['arr'])
+    min_val = min(first['arr'])
+
+    # Crear el primer frame, una fila por traza
+    data = [_bar_spec(first['arr'], first['current']),
+            _count_spec(first['count'], min_val),
+            _bar_spec(first['output'], color=PASTEL_ORANGE)]
+    for row, trace in enumerate(data, start=1):
+        trace.update(xaxis=f'x{row if row > 1 else ""}', yaxis=f'y{row if row > 1 else ""}')
+
+    peak = Peak('count')
+    fig_frames = build_frames(frames, partial(_frame_spec, min_val=min_val), workers, observe=peak)
+
+    # Tres filas de igual alto separadas por 0.1, con el título de cada una encima
+    domains = [[0.7333333333333334, 1.0], [0.3666666666666667, 0.6333333333333334], [0.0, 0.2666666666666667]]
+    titles = ("Array Original", "Conteo de Ocurrencias", "Array Ordenado")
+    ranges = [max_val * 1.1, peak.value * 1.1, max_val * 1.1]
+    layout = dict(
+        updatemenus=[dict(
+            type='buttons',
+            showactive=False,
+            buttons=[dict(label='Play',
+                          method='animate',
+                          args=[None, dict(frame=dict(duration=500, redraw=True),
+                                           fromcurrent=True,
+                                           mode='immediate')])],
+        )],
+        height=900,
+        annotations=[dict(text=title, x=0.5, y=domain[1], xref='paper', yref='paper', xanchor='center',
+                          yanchor='bottom', showarrow=False, font=dict(size=16))
+                     for title, domain in zip(titles, domains)],
+    )
+    for row, (domain, top) in enumerate(zip(domains, ranges), start=1):
+        suffix = row if row > 1 else ''
+        layout[f'xaxis{suffix}'] = dict(anchor=f'y{suffix}', domain=[0.0, 1.0])
+        layout[f'yaxis{suffix}'] = dict(anchor=f'x{suffix}', domain=domain, range=[0, top])
+    return data, layout, fig_frames
+
+def create_animation(frames, output_file='counting_sort_animation.html', auto_open=True,
+                     max_frames=None, sample='even', replay=False, workers=None):
+    # En replay se reproduce el arreglo de salida, que es el que se va llenando
+    render_animation(frames, output_file, 'Animación de Counting Sort', _figure, auto_open=auto_open,
+                     max_frames=max_frames, sample=sample, replay=replay, workers=workers, auto_play=False,
+                     channel='output')
+
+if __name__ == "__main__":
+    # Generar un arreglo aleatorio
+    arr = np.random.randint(1, 20, 15)
+    frames = counting_sort_with_animation(arr)
+
+    # El botón "Play" controlará la animación
+    create_animation(frames)
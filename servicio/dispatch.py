@@ -0,0 +1,285 @@
+"""Elección del motor según la entrada, con umbrales calibrables.
+
+``sort(arr)`` mide la entrada una vez (``profile``): rango de valores,
+descensos entre vecinos (cuán ordenada está) y proporción de repetidos en una
+muestra. Con eso ``choose`` elige entre:
+
+- ``tim`` para entradas casi ordenadas, muy chicas o sin orden numérico;
+- ``counting`` para enteros con rango chico frente a ``n``;
+- ``bucket``, un híbrido de buckets por cuantiles que vuelve a despachar cada
+  bucket (con muchos repetidos, cada bucket cae en counting o ya está ordenado);
+- ``msd_radix``, radix por el byte más alto con inserción en los buckets chicos;
+- ``radix`` LSD en el resto de los casos.
+
+Como en introsort, si los híbridos recursivos pasan de ``max_depth`` niveles
+el bucket se ordena con ``heap``, cuyo peor caso es O(n log n).
+
+Los umbrales por defecto se pueden ajustar a la máquina con ``calibrate``
+(``python -m servicio.bench calibrate``), que los guarda en
+``thresholds.json`` dentro del directorio de la caché.
+
+Sin calibrar, ``bucket``, ``msd_radix`` y ``tim`` para entradas casi
+ordenadas están apagados: en las máquinas donde se midió, el radix LSD
+vectorizado les gana en todos los tamaños, porque esos híbridos recorren
+buckets o corridas en Python. Sus umbrales quedan en valores que ninguna
+entrada alcanza (los mismos que deja ``calibrate`` cuando no ganan nunca) y se
+encienden solo si la calibración encuentra un cruce en la máquina.
+"""
+
+import json
+import os
+import time
+from collections import deque
+
+import numpy as np
+
+from .bucketsort import bucket_indices, default_num_buckets
+from .cache import default_directory
+from .countingsort import counting_sort
+from .heapsort import heap_sort
+from .radixsort import _from_keys, _to_keys, radix_sort
+from .timsort import insertion_sort, tim_sort
+
+DEFAULT_THRESHOLDS = {
+    # Hasta este tamaño, inserción (timsort no pasa de su primera corrida)
+    'small_n': 16,
+    # Descensos por elemento hasta los que timsort gana por sus corridas
+    # (apagado: una entrada ya ordenada se devuelve antes de elegir)
+    'presorted': -1.0,
+    # Rango / n hasta el que gana counting sort
+    'counting_span': 8.0,
+    # Proporción de repetidos en la muestra desde la que gana el híbrido de
+    # buckets (apagado: la proporción nunca llega a 1)
+    'duplicates': 1.01,
+    # Hasta este tamaño gana el radix MSD con inserción (apagado)
+    'msd_max_n': 0,
+    # Buckets del radix MSD que se terminan por inserción
+    'msd_cutoff': 32,
+    # Niveles de recursión de los híbridos antes de caer en heapsort
+    'max_depth': 8,
+}
+
+SAMPLE_SIZE = 1024
+
+# Umbrales en uso: se leen del disco la primera vez y ``calibrate`` los reemplaza
+_thresholds = None
+
+
+def thresholds_path():
+    return os.path.join(default_directory(), 'thresholds.json')
+
+
+def load_thresholds(path=None):
+    """Umbrales por defecto con los calibrados encima, si hay."""
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    try:
+        with open(path or thresholds_path()) as f:
+            thresholds.update(json.load(f))
+    except FileNotFoundError:
+        pass
+    return thresholds
+
+
+def current_thresholds():
+    """Umbrales que usa ``sort`` cuando no se le pasan; se leen una sola vez."""
+    global _thresholds
+    if _thresholds is None:
+        _thresholds = load_thresholds()
+    return _thresholds
+
+
+def save_thresholds(thresholds, path=None):
+    path = path or thresholds_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(thresholds, f, indent=2)
+    return path
+
+
+def profile(values, sample_size=SAMPLE_SIZE, seed=0):
+    """Medidas de la entrada que usa ``choose``, en una sola pasada vectorizada."""
+    n = values.size
+    if n < 2 or values.dtype.kind not in 'iuf':
+        return {'n': n, 'kind': values.dtype.kind, 'span': 0, 'presorted': 0.0, 'duplicates': 0.0}
+    sample = values[np.random.default_rng(seed).integers(0, n, min(n, sample_size))]
+    return {
+        'n': n,
+        'kind': values.dtype.kind,
+        'span': float(values.max()) - float(values.min()) + 1,
+        'presorted': np.count_nonzero(values[1:] < values[:-1]) / n,
+        'duplicates': 1 - np.unique(sample).size / sample.size,
+    }
+
+
+def choose(stats, thresholds=None):
+    """Nombre del motor para una entrada con las medidas ``stats``."""
+    thresholds = thresholds or current_thresholds()
+    n = stats['n']
+    if stats['kind'] not in 'iuf' or n <= thresholds['small_n']:
+        return 'tim'
+    if stats['presorted'] <= thresholds['presorted']:
+        return 'tim'
+    if stats['kind'] in 'iu' and stats['span'] <= thresholds['counting_span'] * n:
+        return 'counting'
+    if stats['duplicates'] >= thresholds['duplicates']:
+        return 'bucket'
+    if n <= thresholds['msd_max_n']:
+        return 'msd_radix'
+    return 'radix'
+
+
+def _insertion(values):
+    # Inserción binaria de timsort sobre una lista: los escalares de NumPy son lentos
+    items = values.tolist()
+    deque(insertion_sort(items, 0, len(items) - 1), maxlen=0)
+    values[:] = items
+
+
+def _msd(keys, shift, cutoff):
+    # Ordena ``keys`` en su lugar por los bytes desde ``shift`` hacia abajo
+    if keys.size <= cutoff:
+        _insertion(keys)
+        return
+    digits = ((keys >> shift) & 0xFF).astype(np.uint8)
+    counts = np.bincount(digits, minlength=256)
+    if counts.max() != keys.size:
+        keys[:] = keys[np.argsort(digits, kind='stable')]
+    if shift == 0:
+        return
+    bounds = np.concatenate(([0], np.cumsum(counts))).tolist()
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        if hi - lo > 1:
+            _msd(keys[lo:hi], shift - 8, cutoff)
+
+
+def msd_radix_sort(arr, cutoff=32):
+    """Radix MSD por bytes; los buckets de hasta ``cutoff`` elementos van por inserción."""
+    values = np.asarray(arr)
+    if values.size < 2:
+        return values.copy()
+    keys = _to_keys(values)
+    low = keys.min()
+    keys -= low
+    top = int(keys.max())
+    if top:
+        _msd(keys, 8 * ((top.bit_length() - 1) // 8), cutoff)
+    return _from_keys(keys + low, values.dtype)
+
+
+def _bucket_hybrid(values, thresholds, depth):
+    # Buckets por cuantiles; cada uno se vuelve a despachar
+    indices, count = bucket_indices(values, max(2, default_num_buckets(values.size)), 'quantile')
+    order = np.argsort(indices.astype(np.uint16 if count <= 1 << 16 else np.intp), kind='stable')
+    grouped = values[order]
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(indices, minlength=count)))).tolist()
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        if hi - lo > 1:
+            bucket = grouped[lo:hi]
+            if bucket.min() != bucket.max():
+                grouped[lo:hi] = sort(bucket, thresholds, _depth=depth + 1)
+    return grouped
+
+
+def sort(arr, thresholds=None, _depth=0):
+    """Devuelve ``arr`` ordenado con el motor que ``choose`` elige para él.
+
+    ``arr`` no se modifica. ``thresholds`` reemplaza a los umbrales
+    calibrados (o a los por defecto).
+    """
+    values = np.asarray(arr)
+    thresholds = thresholds or current_thresholds()
+    if values.dtype.kind == 'f':
+        nan = np.isnan(values)
+        if nan.any():
+            # Toda comparación con NaN da False, así que ni ``profile`` ni los
+            # motores por comparación los ordenan: van al final, como en np.sort
+            return np.concatenate((sort(values[~nan], thresholds, _depth), values[nan]))
+    if _depth > thresholds['max_depth']:
+        return heap_sort(values.copy())
+    stats = profile(values)
+    if stats['n'] < 2 or (stats['kind'] in 'iuf' and stats['presorted'] == 0):
+        # Ya ordenado: la medida misma lo comprobó
+        return values.copy()
+    engine = choose(stats, thresholds)
+    if engine == 'tim':
+        return tim_sort(values.copy())
+    if engine == 'counting':
+        return counting_sort(values)
+    if engine == 'bucket':
+        return _bucket_hybrid(values, thresholds, _depth)
+    if engine == 'msd_radix':
+        return msd_radix_sort(values, thresholds['msd_cutoff'])
+    return radix_sort(values)
+
+
+def _best_time(function, data, repeat):
+    times = []
+    for _ in range(repeat):
+        arr = data.copy()
+        start = time.perf_counter()
+        function(arr)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def _crossover(candidates, make, fast, slow, repeat):
+    # Mayor candidato para el que ``fast`` todavía le gana a ``slow``
+    best = None
+    for value in candidates:
+        data = make(value)
+        if _best_time(fast, data, repeat) < _best_time(slow, data, repeat):
+            best = value
+    return best
+
+
+def calibrate(n=20000, repeat=3, seed=0, save=True, path=None):
+    """Mide los motores en esta máquina y devuelve (y guarda) los umbrales.
+
+    Cada umbral es el punto de cruce entre dos motores sobre entradas de
+    tamaño ``n`` construidas para variar solo esa medida. Si se guardan en el
+    archivo por defecto pasan a ser los que usa ``sort``.
+    """
+    global _thresholds
+    from .bench import make_input
+
+    rng = np.random.default_rng(seed)
+    thresholds = dict(DEFAULT_THRESHOLDS)
+
+    def nearly_sorted(ratio):
+        arr = np.arange(n)
+        swaps = rng.integers(0, n, (int(ratio * n / 2), 2))
+        arr[swaps[:, 0]], arr[swaps[:, 1]] = arr[swaps[:, 1]], arr[swaps[:, 0]]
+        return arr
+
+    small = _crossover([4, 8, 16, 32, 64, 128, 256], lambda size: rng.integers(0, 1 << 30, size),
+                       lambda a: tim_sort(a), radix_sort, repeat)
+    thresholds['small_n'] = small or 0
+    presorted = _crossover([0.0, 1e-4, 1e-3, 1e-2, 0.1], nearly_sorted, tim_sort, radix_sort, repeat)
+    thresholds['presorted'] = presorted if presorted is not None else -1.0
+    span = _crossover([0.5, 1, 2, 4, 8, 16, 32, 64], lambda ratio: rng.integers(0, max(1, int(ratio * n)), n),
+                      counting_sort, radix_sort, repeat)
+    thresholds['counting_span'] = span or 0.0
+    # Repetidos con un rango ancho, para que counting no aplique
+    duplicates = [0.5, 0.9, 0.99]
+    bucket = lambda a: _bucket_hybrid(a, thresholds, 0)
+    wins = [ratio for ratio in duplicates
+            if _best_time(bucket, _duplicated(rng, n, ratio), repeat)
+            < _best_time(radix_sort, _duplicated(rng, n, ratio), repeat)]
+    thresholds['duplicates'] = min(wins) if wins else 1.01
+    cutoff = min([8, 16, 32, 64], key=lambda c: _best_time(lambda a: msd_radix_sort(a, c),
+                                                             make_input('uniform', n, rng), repeat))
+    thresholds['msd_cutoff'] = cutoff
+    msd = _crossover([256, 1024, 4096, 16384], lambda size: rng.integers(0, 1 << 62, size),
+                     lambda a: msd_radix_sort(a, cutoff), radix_sort, repeat)
+    thresholds['msd_max_n'] = msd or 0
+    if save:
+        save_thresholds(thresholds, path)
+        if path is None:
+            _thresholds = thresholds
+    return thresholds
+
+
+def _duplicated(rng, n, ratio):
+    # ``ratio`` de repetidos: n * (1 - ratio) valores distintos en un rango de 2**40
+    distinct = rng.integers(0, 1 << 40, max(1, int(n * (1 - ratio))))
+    return distinct[rng.integers(0, distinct.size, n)]
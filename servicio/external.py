@@ -0,0 +1,254 @@
+"""Ordenamiento externo para datos que no entran en memoria.
+
+El archivo de entrada (enteros o flotantes en binario crudo) se lee por tramos
+con ``np.memmap``; cada tramo se ordena en memoria con un motor del paquete y
+se escribe como una corrida en un directorio temporal. Después las corridas se
+mezclan de a ``fan_in`` con un heap y un buffer acotado por corrida, hasta que
+queda una sola. La memoria depende de ``chunk_size`` y de
+``fan_in × buffer_size``, no del tamaño de la entrada.
+
+La traza es gruesa: un frame por corrida y uno por ronda de mezcla, con lo que
+le queda a cada corrida (``remaining``) y lo que lleva cada salida (``merged``).
+"""
+
+import heapq
+import os
+import tempfile
+from collections import deque
+
+import numpy as np
+
+from . import instrument
+from .radixsort import radix_sort
+from .recorder import animate
+from .render import Peak, build_frames, labels, render_animation
+
+# Elementos por tramo en memoria (32 MB con int64)
+CHUNK_SIZE = 1 << 22
+
+# Elementos en el buffer de lectura de cada corrida durante la mezcla
+BUFFER_SIZE = 1 << 16
+
+# Corridas que se mezclan a la vez; con más, la mezcla se hace en varias pasadas
+FAN_IN = 64
+
+
+def _run(path, length, dtype):
+    # np.memmap no admite archivos vacíos
+    return np.memmap(path, dtype=dtype, mode='r') if length else np.empty(0, dtype=dtype)
+
+
+def _open(source, dtype):
+    if isinstance(source, (str, os.PathLike)):
+        return _run(source, os.path.getsize(source), dtype)
+    return np.asarray(source)
+
+
+def merge_runs(runs, write, buffer_size=BUFFER_SIZE):
+    """Mezcla k corridas ordenadas y pasa el resultado a ``write`` por bloques.
+
+    Cada corrida tiene un buffer de a lo sumo ``buffer_size`` elementos. El heap
+    guarda el último valor de cada buffer: todo lo que no supera al menor de
+    ellos ya puede escribirse. En cada ronda se vacía al menos un buffer, que
+    se vuelve a llenar. Genera, por ronda, cuántos elementos tomó de cada corrida.
+    """
+    buffers = {}
+    positions = [0] * len(runs)
+    heap = []
+    for i, run in enumerate(runs):
+        if len(run):
+            buffers[i] = np.array(run[:buffer_size])
+            positions[i] = len(buffers[i])
+            heap.append((buffers[i][-1], i))
+    heapq.heapify(heap)
+    while heap:
+        bound = heap[0][0]
+        exhausted = []
+        while heap and heap[0][0] == bound:
+            exhausted.append(heapq.heappop(heap)[1])
+        pieces = []
+        consumed = {}
+        for i, buffer in buffers.items():
+            cut = len(buffer) if i in exhausted else int(np.searchsorted(buffer, bound, side='right'))
+            if cut:
+                pieces.append(buffer[:cut])
+                buffers[i] = buffer[cut:]
+                consumed[i] = cut
+        # El sort estable de NumPy es un timsort: las piezas ya son corridas
+        # ordenadas, así que unirlas cuesta O(m log k) y no O(m log m)
+        block = np.sort(np.concatenate(pieces), kind='stable') if len(pieces) > 1 else pieces[0]
+        write(block)
+        instrument.add(comparisons=len(heap) + len(exhausted), moves=2 * len(block))
+        for i in exhausted:
+            buffer = np.array(runs[i][positions[i]:positions[i] + buffer_size])
+            if len(buffer):
+                buffers[i] = buffer
+                positions[i] += len(buffer)
+                heapq.heappush(heap, (buffer[-1], i))
+                instrument.add(moves=len(buffer))
+            else:
+                del buffers[i]
+        yield consumed
+
+
+def external_sort_steps(source, output, remaining, merged, dtype=np.int64, chunk_size=CHUNK_SIZE,
+                        buffer_size=BUFFER_SIZE, fan_in=FAN_IN, engine=radix_sort, directory=None):
+    values = _open(source, dtype)
+    dtype = values.dtype
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        # Corridas: cada tramo se copia a memoria, se ordena y vuelve al disco
+        instrument.set_phase('runs')
+        runs = []
+        for r, lo in enumerate(range(0, len(values), chunk_size)):
+            run = np.asarray(engine(np.array(values[lo:lo + chunk_size])), dtype=dtype)
+            path = os.path.join(tmp, f'run-0-{r}')
+            run.tofile(path)
+            runs.append((path, len(run)))
+            remaining[r] = len(run)
+            yield {'remaining': [r]}, dict(stage='runs', current=r)
+        if not runs:
+            open(output, 'wb').close()
+            return
+
+        instrument.set_phase('merge')
+        level = 0
+        while True:
+            groups = [runs[i:i + fan_in] for i in range(0, len(runs), fan_in)]
+            final = len(groups) == 1
+            level += 1
+            merged_runs = []
+            for g, group in enumerate(groups):
+                target = output if final else os.path.join(tmp, f'run-{level}-{g}')
+                first = g * fan_in
+                with open(target, 'wb') as f:
+                    inputs = [_run(path, length, dtype) for path, length in group]
+                    for consumed in merge_runs(inputs, lambda block: f.write(block.tobytes()), buffer_size):
+                        for i, count in consumed.items():
+                            remaining[first + i] -= count
+                        merged[g] += sum(consumed.values())
+                        yield ({'remaining': [first + i for i in consumed], 'merged': [g]},
+                               dict(stage='merge', current=g))
+                    del inputs
+                merged_runs.append((target, int(merged[g])))
+                for path, _ in group:
+                    os.unlink(path)
+            if final:
+                return
+            # Fin de pasada: las salidas son las corridas de la siguiente
+            remaining[:] = 0
+            remaining[:len(merged_runs)] = merged[:len(merged_runs)]
+            merged[:] = 0
+            runs = merged_runs
+            yield {'remaining': slice(None), 'merged': slice(None)}, dict(stage='pass', current=None)
+
+
+def _num_runs(n, chunk_size):
+    return max(1, -(-n // chunk_size))
+
+
+def external_sort(source, output, dtype=np.int64, chunk_size=CHUNK_SIZE, buffer_size=BUFFER_SIZE,
+                  fan_in=FAN_IN, engine=radix_sort, directory=None):
+    """Ordena ``source`` (ruta a un archivo binario de ``dtype`` o un arreglo) en ``output``.
+
+    ``engine`` ordena cada tramo en memoria y devuelve el resultado, como
+    ``radix_sort`` o ``tim_sort``. Las corridas temporales van a ``directory``.
+    """
+    n = len(_open(source, dtype))
+    counts = np.zeros(_num_runs(n, chunk_size), dtype=np.int64)
+    deque(external_sort_steps(source, output, counts, counts.copy(), dtype, chunk_size, buffer_size,
+                              fan_in, engine, directory), maxlen=0)
+    return output
+
+
+def _in_place_steps(arr, remaining, merged, **kwargs):
+    # Ordena ``arr`` pasando por el disco y copia el resultado de vuelta
+    fd, output = tempfile.mkstemp(suffix='.bin', dir=kwargs.get('directory'))
+    os.close(fd)
+    try:
+        yield from external_sort_steps(arr, output, remaining, merged, **kwargs)
+        arr[:] = np.fromfile(output, dtype=arr.dtype)
+    finally:
+        os.unlink(output)
+
+
+def external_sort_with_animation(arr, stream=False, chunk_size=None, buffer_size=None, fan_in=4):
+    """Ordena ``arr`` en su lugar con el modo externo y graba la traza.
+
+    Por defecto se usan 8 corridas y buffers de un cuarto de corrida, para
+    que la animación muestre las dos fases con pocos elementos.
+    """
+    chunk_size = chunk_size or max(1, -(-len(arr) // 8))
+    buffer_size = buffer_size or max(1, chunk_size // 4)
+    runs = _num_runs(len(arr), chunk_size)
+    remaining = np.zeros(runs, dtype=np.int64)
+    merged = np.zeros(runs, dtype=np.int64)
+    steps = _in_place_steps(arr, remaining, merged, dtype=arr.dtype, chunk_size=chunk_size,
+                            buffer_size=buffer_size, fan_in=fan_in)
+    return animate(steps, stream, remaining=remaining, merged=merged)
+
+
+_COLORS = {
+    'remaining': 'rgb(0, 102, 204)',  # Strong Blue
+    'merged': 'rgb(255, 165, 0)',     # Orange
+    'current': 'rgb(255, 105, 180)',  # Hot Pink
+}
+
+
+def _bar_spec(values, name, current=None):
+    colors = [_COLORS[name]] * len(values)
+    if current is not None:
+        colors[current] = _COLORS['current']
+    return dict(
+        type='bar',
+        name=name,
+        y=values,
+        marker=dict(color=colors),
+        text=labels(values),
+        textposition='outside',
+        hoverinfo='text'
+    )
+
+
+def _frame_spec(frame):
+    runs = frame['current'] if frame['stage'] == 'runs' else None
+    merges = frame['current'] if frame['stage'] == 'merge' else None
+    return {'data': [_bar_spec(frame['remaining'], 'remaining', runs),
+                     _bar_spec(frame['merged'], 'merged', merges)]}
+
+
+def _figure(first, frames, workers):
+    peak = Peak('remaining', 'merged')
+    fig_frames = build_frames(frames, _frame_spec, workers, observe=peak)
+
+    layout = dict(
+        barmode='group',
+        updatemenus=[dict(
+            type='buttons',
+            showactive=False,
+            buttons=[dict(label='Play',
+                          method='animate',
+                          args=[None, dict(frame=dict(duration=200, redraw=True),
+                                           fromcurrent=True,
+                                           mode='immediate')])]
+        )],
+        height=600,
+        xaxis=dict(title=dict(text='Corrida')),
+        yaxis=dict(title=dict(text='Elementos'), range=[0, peak.value * 1.1]),
+    )
+
+    # Las trazas iniciales son el primer frame: lo que queda en cada corrida y
+    # lo que lleva cada salida
+    return _frame_spec(first)['data'], layout, fig_frames
+
+
+def create_animation(frames, output_file='external_sort_animation.html', auto_open=True,
+                     max_frames=None, sample='even', replay=False, workers=None):
+    render_animation(frames, output_file, 'Animación de External Sort', _figure, auto_open=auto_open,
+                     max_frames=max_frames, sample=sample, replay=replay, workers=workers)
+
+
+if __name__ == "__main__":
+    # Ejemplo de uso
+    arr = np.random.randint(1, 1000, 64)
+    frames = external_sort_with_animation(arr)
+    create_animation(frames)
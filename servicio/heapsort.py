@@ -0,0 +1,194 @@
+import numpy as np
+
+from . import instrument
+from .recorder import animate
+from .render import Peak, build_frames, labels, positions, render_animation
+
+def _floyd_target(arr, n, i, d):
+    """Posición final de arr[i] al hundirlo en el heap d-ario arr[:n].
+
+    Variante ascendente de Floyd: baja hasta una hoja siguiendo siempre al hijo
+    mayor, sin comparar con el elemento que se hunde, y luego sube hasta
+    encontrarle lugar. Como casi siempre termina cerca de las hojas, ahorra
+    cerca de la mitad de las comparaciones. Devuelve también cuántas hizo.
+    """
+    item = arr[i]
+    comparisons = 1
+    # Bajar por el camino de hijos mayores hasta una hoja
+    j = i
+    while True:
+        first = d * j + 1
+        if first >= n:
+            break
+        last = min(first + d, n)
+        largest = first
+        for child in range(first + 1, last):
+            if arr[child] > arr[largest]:
+                largest = child
+        comparisons += last - first - 1
+        j = largest
+
+    # Subir hasta el primer nodo del camino que no sea menor que item
+    while arr[j] < item:
+        j = (j - 1) // d
+        comparisons += 1
+    return j, comparisons
+
+def sift_down(arr, n, i, d=2):
+    # Hunde arr[i] desplazando el camino un nivel hacia arriba; sin frames
+    j, comparisons = _floyd_target(arr, n, i, d)
+    item = arr[i]
+    moves = 1
+    while j > i:
+        arr[j], item = item, arr[j]
+        j = (j - 1) // d
+        moves += 1
+    arr[i] = item
+    instrument.add(comparisons, moves)
+    return arr
+
+def heapify(arr, n, i, d=2):
+    # Igual que sift_down, con un frame por movimiento; el rango activo es el par (inicio, fin)
+    j, comparisons = _floyd_target(arr, n, i, d)
+    item = arr[i]
+    moves = 0
+    while j > i:
+        arr[j], item = item, arr[j]
+        moves += 1
+        yield (j,), dict(stage='heapify', active=(0, n), current=j)
+        j = (j - 1) // d
+    if arr[i] != item:
+        arr[i] = item
+        moves += 1
+        yield (i,), dict(stage='heapify', active=(0, n), current=i)
+    instrument.add(comparisons, moves)
+
+def sift_up(arr, n, i, d=2):
+    # Sube arr[i] desplazando a sus ancestros menores un nivel hacia abajo;
+    # un frame por movimiento, como heapify. Devuelve la posición final
+    item = arr[i]
+    comparisons = moves = 0
+    j = i
+    while j > 0:
+        parent = (j - 1) // d
+        comparisons += 1
+        if not arr[parent] < item:
+            break
+        arr[j] = arr[parent]
+        moves += 1
+        yield (j,), dict(stage='sift_up', active=(0, n), current=j)
+        j = parent
+    if j != i:
+        arr[j] = item
+        moves += 1
+        yield (j,), dict(stage='sift_up', active=(0, n), current=j)
+    instrument.add(comparisons, moves)
+    return j
+
+def heap_sort_steps(arr, d=2):
+    n = len(arr)
+    yield (), dict(stage='initial', active=(0, n))
+
+    # Build the heap
+    instrument.set_phase('build_heap')
+    for i in range((n - 2) // d, -1, -1):
+        yield from heapify(arr, n, i, d)
+
+    # Extract elements from the heap
+    instrument.set_phase('extract')
+    for i in range(n - 1, 0, -1):
+        arr[i], arr[0] = arr[0], arr[i]
+        instrument.add(moves=2)
+        yield (0, i), dict(stage='extract', active=(0, i + 1), current=0)
+        yield from heapify(arr, i, 0, d)
+
+def heap_sort_with_animation(arr, stream=False, d=2):
+    return animate(heap_sort_steps(arr, d), stream, arr=arr)
+
+def heap_sort(arr, d=2):
+    """Ordena en su lugar sin grabar frames.
+
+    Con d=4 cada nivel del heap cabe en menos líneas de caché y el árbol tiene
+    la mitad de altura. Los arreglos de NumPy se ordenan sobre una lista (una
+    sola copia al principio) porque indexar escalares de NumPy es mucho más lento.
+    """
+    values = instrument.allocated(arr.tolist()) if isinstance(arr, np.ndarray) else arr
+    n = len(values)
+    instrument.set_phase('build_heap')
+    for i in range((n - 2) // d, -1, -1):
+        sift_down(values, n, i, d)
+    instrument.set_phase('extract')
+    for i in range(n - 1, 0, -1):
+        values[i], values[0] = values[0], values[i]
+        sift_down(values, i, 0, d)
+    instrument.add(moves=2 * max(n - 1, 0))
+    if values is not arr:
+        arr[:] = values
+    return arr
+
+_COLORS = {
+    'default': 'rgb(173, 216, 230)',  # Light Blue
+    'active': 'rgb(144, 238, 144)',   # Light Green
+    'current': 'rgb(255, 99, 71)',    # Light Tomato
+    'extracted': 'rgb(255, 215, 0)'   # Light Golden Rod Yellow
+}
+
+# Las barras se colorean con índices chicos sobre una paleta fija
+_PALETTE = np.array(list(_COLORS.values()), dtype=object)
+_DEFAULT, _ACTIVE, _CURRENT, _EXTRACTED = range(len(_PALETTE))
+
+def _bar_spec(frame):
+    index = np.full(len(frame['arr']), _DEFAULT, dtype=np.uint8)
+    index[slice(*frame['active'])] = _EXTRACTED if frame['stage'] == 'extract' else _ACTIVE
+    if 'current' in frame:
+        index[frame['current']] = _CURRENT
+
+    return dict(
+        type='bar',
+        x=positions(len(frame['arr'])),
+        y=frame['arr'],
+        marker=dict(color=_PALETTE[index].tolist()),
+        text=labels(frame['arr']),
+        textposition='outside',
+        hoverinfo='text'
+    )
+
+def _frame_spec(frame):
+    return {'data': [_bar_spec(frame)]}
+
+def _figure(first, frames, workers):
+    peak = Peak('arr')
+    fig_frames = build_frames(frames, _frame_spec, workers, observe=peak)
+
+    # Configurar el diseño y los controles de animación
+    layout = dict(
+        updatemenus=[dict(
+            type='buttons',
+            showactive=False,
+            buttons=[dict(label='Play',
+                          method='animate',
+                          args=[None, dict(frame=dict(duration=500, redraw=True),
+                                           fromcurrent=True,
+                                           mode='immediate')])],
+        )],
+        height=600,
+        xaxis=dict(title=dict(text='Índice')),
+        yaxis=dict(title=dict(text='Valor'), range=[0, peak.value * 1.1]),
+    )
+    return [_bar_spec(first)], layout, fig_frames
+
+def create_animation(frames, output_file='heap_sort_animation.html', auto_open=True,
+                     max_frames=None, sample='even', replay=False, workers=None):
+    # Sin auto_play: la animación arranca con el botón
+    render_animation(frames, output_file, 'Animación de Heap Sort', _figure, auto_open=auto_open,
+                     max_frames=max_frames, sample=sample, replay=replay, workers=workers, auto_play=False)
+
+def generate_random_array(size=10):
+    return np.random.randint(1, 100, size)
+
+if __name__ == "__main__":
+    # Generar un arreglo aleatorio
+    arr = generate_random_array(size=10)
+    print(f"Array generado: {arr}")
+    frames = heap_sort_with_animation(arr)
+    create_animation(frames)
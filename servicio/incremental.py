@@ -0,0 +1,295 @@
+"""Contenedores que se mantienen ordenados cuando la entrada cambia poco.
+
+Entre una corrida y la siguiente la entrada suele cambiar en unas pocas
+posiciones o crecer con unos pocos elementos. En lugar de reordenar desde
+cero, ``update(nueva)`` compara la entrada nueva con la anterior y aplica solo
+la diferencia sobre el estado guardado:
+
+- ``SortedArray`` guarda los valores ordenados. Los agregados se ordenan como
+  una corrida chica y se mezclan con ``merge`` de timsort; un valor que cambia
+  se reubica con búsqueda binaria y un solo corrimiento del tramo intermedio.
+- ``IncrementalHeap`` guarda un heap d-ario de máximo, como el que arma heap
+  sort. Un valor que crece sube con ``sift_up`` y uno que baja se hunde con
+  ``heapify``; los agregados entran por el final y suben.
+
+El costo es proporcional al cambio (más una comparación vectorizada de la
+entrada entera para encontrarlo, que los métodos ``extend``, ``replace`` y
+``remove`` se ahorran). Las versiones ``*_with_animation`` graban solo los
+pasos del cambio: se dibujan con el ``create_animation`` de timsort o de
+heapsort.
+"""
+
+from collections import deque
+
+import numpy as np
+
+from . import instrument
+from .heapsort import heap_sort, heapify, sift_down, sift_up
+from .recorder import animate
+from .timsort import MIN_GALLOP, count_run, insertion_sort, merge, tim_sort, tim_sort_steps
+
+# Agregados hasta este tamaño se ordenan por inserción; más grandes, con timsort
+MAX_RUN = 64
+
+# Si cambia más que esta fracción de la entrada, conviene reordenar todo
+REBUILD_FRACTION = 0.25
+
+
+def input_changes(previous, current):
+    """Diferencia entre dos entradas: (reemplazos (viejo, nuevo), agregados, quitados)."""
+    common = min(len(previous), len(current))
+    changed = np.flatnonzero(previous[:common] != current[:common])
+    replacements = list(zip(previous[changed].tolist(), current[changed].tolist()))
+    return replacements, current[common:], previous[common:]
+
+
+class _Incremental:
+    # Almacenamiento con capacidad de sobra y la entrada de la última corrida
+
+    def __init__(self, values, dtype):
+        values = np.array(values, dtype=dtype, copy=True)
+        self._input = values.copy()
+        self._data = values
+        self._n = len(values)
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def dtype(self):
+        return self._data.dtype
+
+    @property
+    def values(self):
+        """Estado actual, de solo lectura (una vista: no copia)."""
+        view = self._data[:self._n]
+        view.flags.writeable = False
+        return view
+
+    def _reserve(self, size):
+        # Vista de escritura sobre los primeros ``size`` lugares, creciendo al doble
+        if size > len(self._data):
+            data = np.empty(max(size, 2 * len(self._data)), dtype=self._data.dtype)
+            data[:self._n] = self._data[:self._n]
+            self._data = data
+        return self._data[:size]
+
+    def _prepare_update(self, current):
+        # Deja el arreglo listo (con los agregados al final) y devuelve los pasos
+        current = np.asarray(current, dtype=self.dtype)
+        replacements, appended, removed = input_changes(self._input, current)
+        self._input = current.copy()
+        if len(replacements) + len(appended) + len(removed) > REBUILD_FRACTION * max(len(current), 1):
+            arr = self._reserve(max(self._n, len(current)))[:len(current)]
+            arr[:] = current
+            self._n = len(current)
+            return arr, self._rebuild_steps(arr)
+        arr, grown = self._append(appended)
+        return arr, self._update_steps(arr, replacements, removed, grown)
+
+    def _append(self, values):
+        values = np.asarray(values, dtype=self.dtype)
+        arr = self._reserve(self._n + len(values))
+        arr[self._n:] = values
+        return arr, len(values)
+
+    def _update_steps(self, arr, replacements, removed, grown):
+        yield from self._initial_steps(arr)
+        instrument.set_phase('update')
+        for old, new in replacements:
+            yield from self._replace_steps(arr, old, new)
+        for value in removed.tolist():
+            yield from self._remove_steps(arr, value)
+        if grown:
+            instrument.set_phase('append')
+            yield from self._extend_steps(arr, grown)
+
+    def _run(self, steps):
+        deque(steps, maxlen=0)
+        return self
+
+    def update(self, current):
+        """Lleva el estado a la entrada ``current``, aplicando solo lo que cambió."""
+        return self._run(self._prepare_update(current)[1])
+
+    def update_with_animation(self, current, stream=False):
+        """Como ``update``, y devuelve los frames del cambio."""
+        arr, steps = self._prepare_update(current)
+        return animate(steps, stream, arr=arr)
+
+    def extend(self, values):
+        """Agrega ``values`` (de la entrada y del estado)."""
+        arr, grown = self._append(values)
+        self._input = np.concatenate((self._input, arr[self._n:]))
+        return self._run(self._extend_steps(arr, grown))
+
+    def extend_with_animation(self, values, stream=False):
+        arr, grown = self._append(values)
+        self._input = np.concatenate((self._input, arr[self._n:]))
+        steps = self._extend_steps(arr, grown)
+        return animate(self._with_initial(arr, steps), stream, arr=arr)
+
+    def replace(self, old, new):
+        """Cambia una aparición de ``old`` por ``new``.
+
+        La entrada guardada no se actualiza: el próximo ``update`` la toma como
+        referencia, así que conviene usar una forma u otra.
+        """
+        return self._run(self._replace_steps(self._data[:self._n], old, new))
+
+    def remove(self, value):
+        """Quita una aparición de ``value``; el lugar libre queda al final."""
+        return self._run(self._remove_steps(self._data[:self._n], value))
+
+    def _with_initial(self, arr, steps):
+        yield from self._initial_steps(arr)
+        yield from steps
+
+
+class SortedArray(_Incremental):
+    """Arreglo que se mantiene ordenado de menor a mayor.
+
+    ``values`` es el resultado ordenado. Los cambios usan los motores de
+    timsort: ``merge`` para los agregados e inserción binaria para los
+    valores que cambian, así que el estado es el mismo que daría
+    ``tim_sort`` sobre la entrada actual.
+    """
+
+    def __init__(self, values=(), dtype=None):
+        super().__init__(values, dtype)
+        tim_sort(self._data)
+        self._min_gallop = MIN_GALLOP
+
+    def _initial_steps(self, arr):
+        yield (), dict(stage='initial', active=range(0))
+
+    def _rebuild_steps(self, arr):
+        return tim_sort_steps(arr)
+
+    def _find(self, arr, value):
+        n = self._n
+        position = int(np.searchsorted(arr[:n], value, side='left'))
+        instrument.add(max(n, 1).bit_length())
+        if position == n or arr[position] != value:
+            raise ValueError(f"{value!r} no está en el arreglo")
+        return position
+
+    def _replace_steps(self, arr, old, new):
+        # El tramo entre la posición vieja y la nueva se corre un lugar
+        n = self._n
+        lo = self._find(arr, old)
+        if new < old:
+            target = int(np.searchsorted(arr[:lo], new, side='right'))
+            arr[target + 1:lo + 1] = arr[target:lo]
+            changed = slice(target, lo + 1)
+        else:
+            target = int(np.searchsorted(arr[lo + 1:n], new, side='right')) + lo
+            arr[lo:target] = arr[lo + 1:target + 1]
+            changed = slice(lo, target + 1)
+        arr[target] = new
+        instrument.add(max(n, 1).bit_length(), changed.stop - changed.start)
+        yield changed, dict(stage='insertion', active=range(changed.start, changed.stop), current=target)
+
+    def _remove_steps(self, arr, value):
+        # El valor quitado queda estacionado justo después del final
+        n = self._n
+        position = self._find(arr, value)
+        arr[position:n - 1] = arr[position + 1:n]
+        arr[n - 1] = value
+        self._n = n - 1
+        instrument.add(moves=n - position)
+        yield slice(position, n), dict(stage='insertion', active=range(position, n - 1), current=n - 1)
+
+    def _extend_steps(self, arr, grown):
+        # Los agregados son una corrida nueva al final: se ordenan solos y se mezclan
+        n = self._n
+        total = n + grown
+        if grown > MAX_RUN:
+            tim_sort(arr[n:total])
+            yield slice(n, total), dict(stage='run', active=range(n, total), current=n)
+        elif grown > 1:
+            run = yield from count_run(arr, n, total)
+            if run < grown:
+                yield from insertion_sort(arr, n, total - 1, n + run)
+        if n and grown:
+            instrument.set_phase('merge')
+            self._min_gallop = yield from merge(arr, 0, n - 1, total - 1, self._min_gallop)
+        self._n = total
+
+
+class IncrementalHeap(_Incremental):
+    """Heap d-ario de máximo que se mantiene cuando la entrada cambia.
+
+    ``values`` es el heap (``values[0]`` es el máximo) y ``sorted()`` el
+    resultado ordenado, que sí cuesta O(n log n). Reemplazar o quitar un
+    valor lo busca con una comparación vectorizada, porque un heap no se
+    puede recorrer por búsqueda binaria.
+    """
+
+    def __init__(self, values=(), dtype=None, d=2):
+        super().__init__(values, dtype)
+        self.d = d
+        n = self._n
+        for i in range((n - 2) // d, -1, -1):
+            sift_down(self._data, n, i, d)
+
+    def top(self):
+        return self._data[0]
+
+    def sorted(self):
+        """Copia ordenada de menor a mayor."""
+        return heap_sort(self._data[:self._n].copy(), self.d)
+
+    def _initial_steps(self, arr):
+        yield (), dict(stage='initial', active=(0, self._n))
+
+    def _rebuild_steps(self, arr):
+        n = self._n
+        yield (), dict(stage='initial', active=(0, n))
+        instrument.set_phase('build_heap')
+        for i in range((n - 2) // self.d, -1, -1):
+            yield from heapify(arr, n, i, self.d)
+
+    def _find(self, arr, value):
+        matches = np.flatnonzero(arr[:self._n] == value)
+        if not matches.size:
+            raise ValueError(f"{value!r} no está en el heap")
+        return int(matches[0])
+
+    def _restore(self, arr, i, old):
+        # Sube si el valor en ``i`` creció, se hunde si bajó
+        if arr[i] > old:
+            yield from sift_up(arr, self._n, i, self.d)
+        elif arr[i] < old:
+            yield from heapify(arr, self._n, i, self.d)
+
+    def _replace_steps(self, arr, old, new):
+        i = self._find(arr, old)
+        arr[i] = new
+        yield (i,), dict(stage='update', active=(0, self._n), current=i)
+        yield from self._restore(arr, i, old)
+
+    def _remove_steps(self, arr, value):
+        # El último del heap ocupa el lugar libre y el valor quitado queda al final
+        i = self._find(arr, value)
+        last = self._n - 1
+        arr[i], arr[last] = arr[last], value
+        self._n = last
+        instrument.add(moves=2)
+        yield (i, last), dict(stage='update', active=(0, last), current=i)
+        if i < last:
+            yield from self._restore(arr, i, value)
+
+    def _extend_steps(self, arr, grown):
+        start = self._n
+        total = start + grown
+        if grown > start:
+            # Más agregados que elementos: armar el heap de abajo hacia arriba
+            self._n = total
+            instrument.set_phase('build_heap')
+            for i in range((total - 2) // self.d, -1, -1):
+                yield from heapify(arr, total, i, self.d)
+            return
+        for i in range(start, total):
+            self._n = i + 1
+            yield from sift_up(arr, i + 1, i, self.d)
@@ -0,0 +1,86 @@
+"""Conteo de operaciones de los algoritmos, separado por fase.
+
+    with counting() as ops:
+        heap_sort(arr)
+    ops.as_dict()   # {'phases': {'build_heap': {...}, 'extract': {...}}, 'total': {...}}
+
+Los algoritmos informan con ``add`` una vez por llamada (por sift-down, por
+merge, por pasada), no por operación, así que sin un contador activo el costo
+es una comparación con None por llamada. Las pasadas vectorizadas solo
+informan movimientos y buffers: las comparaciones de NumPy ocurren en C.
+"""
+
+from contextlib import contextmanager
+
+FIELDS = ('comparisons', 'moves', 'allocations', 'nbytes')
+
+_active = None
+
+
+class OpCounter:
+    """Totales de comparaciones, movimientos de elementos y buffers asignados.
+
+    ``callback(phase, counts)`` se llama en cada ``add`` si se indica, para
+    quien prefiera recibir los eventos en lugar de leer los totales.
+    """
+
+    def __init__(self, callback=None):
+        self.phases = {}
+        self.phase = 'setup'
+        self.callback = callback
+
+    def add(self, comparisons=0, moves=0, allocations=0, nbytes=0):
+        totals = self.phases.get(self.phase)
+        if totals is None:
+            totals = self.phases[self.phase] = dict.fromkeys(FIELDS, 0)
+        totals['comparisons'] += comparisons
+        totals['moves'] += moves
+        totals['allocations'] += allocations
+        totals['nbytes'] += nbytes
+        if self.callback is not None:
+            self.callback(self.phase, dict(comparisons=comparisons, moves=moves,
+                                           allocations=allocations, nbytes=nbytes))
+
+    def totals(self):
+        total = dict.fromkeys(FIELDS, 0)
+        for counts in self.phases.values():
+            for field in FIELDS:
+                total[field] += counts[field]
+        return total
+
+    def as_dict(self):
+        return {'phases': {name: dict(counts) for name, counts in self.phases.items()},
+                'total': self.totals()}
+
+
+def active():
+    return _active
+
+
+def add(comparisons=0, moves=0, allocations=0, nbytes=0):
+    if _active is not None:
+        _active.add(comparisons, moves, allocations, nbytes)
+
+
+def allocated(buffer):
+    # Registra un buffer nuevo y lo devuelve, para usarlo en la misma expresión
+    if _active is not None:
+        _active.add(allocations=1, nbytes=getattr(buffer, 'nbytes', 8 * len(buffer)))
+    return buffer
+
+
+def set_phase(name):
+    if _active is not None:
+        _active.phase = name
+
+
+@contextmanager
+def counting(counter=None):
+    """Activa un OpCounter mientras dura el bloque y lo devuelve."""
+    global _active
+    previous = _active
+    _active = counter if counter is not None else OpCounter()
+    try:
+        yield _active
+    finally:
+        _active = previous
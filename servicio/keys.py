@@ -0,0 +1,147 @@
+"""Ordenamiento de registros por clave con cualquiera de los motores.
+
+Las claves se calculan una sola vez (``key`` se llama n veces) y se ordenan
+en columnas, de la más significativa a la menos: los campos de ``order`` en un
+arreglo estructurado, los elementos de la tupla que devuelve ``key`` o el
+propio arreglo. Los motores nunca mueven los registros: devuelven una
+permutación, y ``sort_by`` la aplica una sola vez al final.
+
+- ``radix`` y ``counting`` hacen una pasada LSD estable por columna, desde la
+  menos significativa.
+- ``tim``, ``heap``, ``shell`` y ``bucket`` ordenan claves decoradas con el
+  índice original, lo que además vuelve estables a los que no lo son. Si las
+  columnas son enteras y caben juntas en un int64, la clave decorada es un
+  solo entero; si no, una tupla (bucket, que reparte por valor, recibe el
+  rango de la clave entre las distintas en lugar de la tupla).
+"""
+
+import numpy as np
+
+from .bucketsort import bucket_sort
+from .countingsort import counting_argsort
+from .heapsort import heap_sort
+from .radixsort import radix_argsort
+from .shellsort import shell_sort
+from .timsort import tim_sort
+
+# Motores que ordenan claves decoradas (devuelven el arreglo ordenado)
+COMPARISON_ENGINES = {
+    'bucket': bucket_sort,
+    'heap': heap_sort,
+    'shell': shell_sort,
+    'tim': tim_sort,
+}
+
+# Motores que dan directamente la permutación estable de una columna
+LSD_ENGINES = {
+    'counting': counting_argsort,
+    'radix': radix_argsort,
+}
+
+
+def key_columns(arr, key=None, order=None):
+    """Columnas de claves de ``arr``, de la más significativa a la menos."""
+    if key is not None:
+        decorated = [key(item) for item in arr]
+        if decorated and isinstance(decorated[0], tuple):
+            return [np.asarray(column) for column in zip(*decorated)]
+        return [np.asarray(decorated)]
+    values = np.asarray(arr)
+    if values.dtype.names is not None:
+        if order is None:
+            order = values.dtype.names
+        elif isinstance(order, str):
+            order = [order]
+        return [values[name] for name in order]
+    if order is not None:
+        raise ValueError("order solo se admite con arreglos estructurados")
+    return [values]
+
+
+def _ranks(column):
+    # Claves sin orden numérico (textos, objetos) pasan a su posición entre
+    # los valores distintos: iguales comparten rango
+    return np.unique(column, return_inverse=True)[1].ravel()
+
+
+def _row_ranks(columns):
+    # Rango de cada fila de claves entre las filas distintas
+    if len(columns) == 1:
+        return _ranks(columns[0])
+    rows = np.stack([_ranks(column) for column in columns], axis=1)
+    return np.unique(rows, axis=0, return_inverse=True)[1].ravel()
+
+
+def _lsd_column(column, algorithm):
+    kind = column.dtype.kind
+    if kind == 'b':
+        return column.astype(np.uint8)
+    if kind in 'iu' or (kind == 'f' and algorithm == 'radix'):
+        return column
+    return _ranks(column)
+
+
+def _offsets(column):
+    # Distancia de cada clave al mínimo, como int64. Los con signo se ensanchan
+    # antes de restar (en int8 100 - (-100) desborda); en los sin signo la
+    # resta no desborda y así un uint64 por encima de 2**63 no se trunca
+    if column.dtype.kind == 'u':
+        return (column - column.min()).astype(np.int64)
+    return column.astype(np.int64) - int(column.min())
+
+
+def _packed(columns, n):
+    # Las columnas enteras y el índice en un solo int64, en base mixta; None si no caben
+    if not all(column.dtype.kind in 'iub' for column in columns):
+        return None
+    columns = [column.astype(np.uint8) if column.dtype.kind == 'b' else column for column in columns]
+    spans = [int(column.max()) - int(column.min()) + 1 for column in columns]
+    if int(np.prod(spans, dtype=object)) * n >= 1 << 63:
+        return None
+    packed = np.zeros(n, dtype=np.int64)
+    for column, span in zip(columns, spans):
+        packed *= span
+        packed += _offsets(column)
+    return packed * n + np.arange(n)
+
+
+def argsort(arr, key=None, order=None, algorithm='radix'):
+    """Permutación estable que ordena ``arr`` según sus claves.
+
+    ``key`` es una función por elemento (puede devolver una tupla para ordenar
+    por varias claves) y ``order`` los campos de un arreglo estructurado, como
+    en ``np.sort``. ``algorithm`` es uno de ``radix``, ``counting``, ``tim``,
+    ``heap``, ``shell`` o ``bucket``.
+    """
+    columns = key_columns(arr, key, order)
+    n = len(columns[0])
+    if algorithm in LSD_ENGINES:
+        engine = LSD_ENGINES[algorithm]
+        permutation = np.arange(n)
+        for column in reversed(columns):
+            permutation = permutation[engine(_lsd_column(column[permutation], algorithm))]
+        return permutation
+    if algorithm not in COMPARISON_ENGINES:
+        raise ValueError(f"Algoritmo desconocido: {algorithm!r}")
+    engine = COMPARISON_ENGINES[algorithm]
+    if n == 0:
+        return np.arange(0)
+    packed = _packed(columns, n)
+    if packed is None and algorithm == 'bucket':
+        packed = _row_ranks(columns).astype(np.int64) * n + np.arange(n)
+    if packed is not None:
+        return np.asarray(engine(packed)) % n
+    decorated = list(zip(*(column.tolist() for column in columns), range(n)))
+    return np.fromiter((item[-1] for item in engine(decorated)), dtype=np.intp, count=n)
+
+
+def sort_by(arr, key=None, order=None, algorithm='radix'):
+    """``arr`` ordenado según sus claves; los registros se mueven una sola vez.
+
+    Devuelve un arreglo nuevo si ``arr`` es un arreglo de NumPy y una lista si
+    es cualquier otra secuencia.
+    """
+    permutation = argsort(arr, key, order, algorithm)
+    if isinstance(arr, np.ndarray):
+        return arr[permutation]
+    return [arr[i] for i in permutation]
@@ -0,0 +1,278 @@
+import numpy as np
+
+from . import instrument
+from .recorder import animate
+from .render import Peak, build_frames, labels, render_animation
+from .shared import attach, shared_array
+
+def counting_sort(arr, exp, output):
+    n = len(arr)
+    count = [0] * 10
+
+    # Vaciar el arreglo de salida de la pasada anterior
+    output[:] = 0
+    yield slice(None), None
+
+    # Contar las ocurrencias en los "buckets"
+    for i in range(n):
+        index = arr[i] // exp
+        count[index % 10] += 1
+
+    # Modificar count para reflejar posiciones reales en output[]
+    for i in range(1, 10):
+        count[i] += count[i - 1]
+
+    # Construir el arreglo de salida
+    i = n - 1
+    while i >= 0:
+        index = arr[i] // exp
+        position = count[index % 10] - 1
+        output[position] = arr[i]
+        count[index % 10] -= 1
+        i -= 1
+        # Guardar el estado para animación
+        yield (position,), dict(digit=exp, current=i, bucket=index % 10)
+
+    # Copiar el arreglo de salida a arr[]
+    for i in range(n):
+        arr[i] = output[i]
+    instrument.add(moves=2 * n, allocations=1, nbytes=8 * len(count))
+
+def radix_sort_steps(arr, output):
+    max_num = max(arr)
+    exp = 1
+    if max_num == 0:
+        # Todo ceros: no hay dígitos que recorrer, solo un frame con la entrada
+        output[:] = arr
+        yield slice(None), dict(digit=None, current=None, bucket=None)
+
+    # Aplicar counting sort para cada dígito
+    while max_num // exp > 0:
+        instrument.set_phase(f'digit {exp}')
+        yield from counting_sort(arr, exp, output)
+        exp *= 10
+
+def _to_keys(values):
+    # Lleva cada dtype a enteros sin signo del mismo ancho cuyo orden coincide
+    # con el de los valores: se invierte el bit de signo de los enteros y, en
+    # los flotantes negativos, todos los bits
+    kind = values.dtype.kind
+    if kind == 'u':
+        return values.copy()
+    unsigned = np.dtype(f'u{values.dtype.itemsize}')
+    bits = values.view(unsigned)
+    sign = unsigned.type(1 << (8 * unsigned.itemsize - 1))
+    if kind in 'ib':
+        return bits ^ sign
+    if kind == 'f':
+        return bits ^ np.where(bits & sign, unsigned.type(np.iinfo(unsigned).max), sign)
+    raise TypeError(f"radix sort no admite el tipo {values.dtype}")
+
+def _from_keys(keys, dtype):
+    if dtype.kind == 'u':
+        return keys.astype(dtype, copy=False)
+    sign = keys.dtype.type(1 << (8 * keys.itemsize - 1))
+    if dtype.kind in 'ib':
+        return (keys ^ sign).view(dtype)
+    return (keys ^ np.where(keys & sign, sign, keys.dtype.type(np.iinfo(keys.dtype).max))).view(dtype)
+
+def radix_passes(keys, base=256, index=None):
+    """LSD vectorizado sobre claves sin signo; genera ``(exp, keys, low)`` por pasada.
+
+    ``keys`` son las claves ordenadas por los dígitos hasta ``exp`` menos su
+    mínimo ``low``: sumarlo queda a cargo de quien necesite los valores, para
+    no pagar un arreglo extra por pasada cuando solo importa el final.
+    Con bases potencia de dos los dígitos salen de desplazamientos y máscaras.
+    Las pasadas en las que todas las claves tienen el mismo dígito se saltan.
+    Si se pasa ``index``, se le aplica en su lugar la misma permutación que a
+    las claves en cada pasada.
+    """
+    n = keys.size
+    if n == 0:
+        return
+    # Restar el mínimo deja solo los bits que realmente varían
+    low = keys.min()
+    keys = instrument.allocated(keys - low)
+    top = int(keys.max())
+    digit_dtype = np.uint8 if base <= 256 else np.uint16 if base <= 65536 else np.intp
+    power_of_two = base & (base - 1) == 0
+    bits = base.bit_length() - 1
+    key_max = int(np.iinfo(keys.dtype).max)
+    exp, shift = 1, 0
+    while top // exp > 0:
+        instrument.set_phase(f'digit {exp}')
+        if power_of_two:
+            digits = (keys >> shift) & min(base - 1, key_max)
+        else:
+            digits = keys // exp
+            if base <= key_max:
+                digits %= base
+        digits = digits.astype(digit_dtype)
+        hist = np.bincount(digits, minlength=base)
+        instrument.add(allocations=2, nbytes=digits.nbytes + hist.nbytes)
+        if hist[digits[0]] != n:
+            # argsort estable de NumPy sobre uint8/uint16 es un counting sort
+            # por bytes: la colocación según el histograma, sin bucles Python
+            order = np.argsort(digits, kind='stable')
+            keys = keys[order]
+            instrument.add(moves=n, allocations=2, nbytes=order.nbytes + keys.nbytes)
+            if index is not None:
+                index[:] = index[order]
+                instrument.add(moves=n)
+            yield exp, keys, low
+        exp *= base
+        shift += bits
+
+def radix_sort(arr, base=65536, workers=None):
+    """Radix sort LSD vectorizado; devuelve un arreglo nuevo ordenado.
+
+    Admite enteros con signo y flotantes. ``base`` fija el ancho del dígito:
+    256 hace pasadas de un byte y 65536 de dos. Con ``workers`` (y una base
+    potencia de dos) cada pasada reparte el arreglo en tramos: los procesos
+    cuentan los dígitos de su tramo, se suman los histogramas y cada proceso
+    coloca su tramo en la salida, todo sobre memoria compartida.
+    """
+    values = np.asarray(arr)
+    keys = _to_keys(values)
+    if workers and workers >= 2 and base & (base - 1) == 0 and keys.size >= 2 * workers:
+        return _from_keys(_parallel_radix(keys, base, workers), values.dtype)
+    low = 0
+    for _, keys, low in radix_passes(keys, base):
+        pass
+    return _from_keys(keys + low if low else keys, values.dtype)
+
+def radix_argsort(arr, base=65536):
+    """Permutación estable que ordena ``arr``, con las mismas pasadas que ``radix_sort``."""
+    values = np.asarray(arr)
+    index = np.arange(values.size)
+    for _ in radix_passes(_to_keys(values), base, index):
+        pass
+    return index
+
+def _digits(keys, shift, mask):
+    digits = (keys >> shift) & mask
+    return digits.astype(np.uint8 if mask < 256 else np.uint16 if mask < 65536 else np.intp)
+
+def _chunk_histogram(args):
+    handle, lo, hi, shift, mask = args
+    return np.bincount(_digits(attach(handle)[lo:hi], shift, mask), minlength=mask + 1)
+
+def _chunk_scatter(args):
+    # ``base`` es, por dígito, la posición de salida del primer elemento del
+    # tramo con ese dígito menos su posición dentro del tramo ordenado
+    src_handle, dst_handle, lo, hi, shift, mask, base = args
+    keys = attach(src_handle)[lo:hi]
+    digits = _digits(keys, shift, mask)
+    order = np.argsort(digits, kind='stable')
+    attach(dst_handle)[base[digits[order]] + np.arange(hi - lo)] = keys[order]
+
+def _parallel_radix(keys, base, workers):
+    from concurrent.futures import ProcessPoolExecutor
+
+    n = keys.size
+    low = keys.min()
+    top = int(keys.max() - low)
+    bits = base.bit_length() - 1
+    mask = min(base - 1, int(np.iinfo(keys.dtype).max))
+    bounds = np.linspace(0, n, workers + 1).astype(np.intp).tolist()
+    chunks = list(zip(bounds[:-1], bounds[1:]))
+    # Los procesos del pool no informan al contador: se registra aquí cada pasada
+    with shared_array(n, keys.dtype) as (src, src_handle), shared_array(n, keys.dtype) as (dst, dst_handle):
+        instrument.allocated(src)
+        instrument.allocated(dst)
+        np.subtract(keys, low, out=src)
+        with ProcessPoolExecutor(workers) as pool:
+            shift = 0
+            while top >> shift:
+                instrument.set_phase(f'digit {1 << shift}')
+                hist = np.array(list(pool.map(_chunk_histogram,
+                                              [(src_handle, lo, hi, shift, mask) for lo, hi in chunks])))
+                totals = hist.sum(axis=0)
+                if totals.max() != n:
+                    # Prefijos: inicio global de cada dígito más lo que ocupan
+                    # los tramos anteriores con ese dígito, menos el inicio del
+                    # dígito dentro del propio tramo
+                    starts = np.cumsum(totals) - totals
+                    before = np.cumsum(hist, axis=0) - hist
+                    within = np.cumsum(hist, axis=1) - hist
+                    offsets = starts + before - within
+                    list(pool.map(_chunk_scatter, [(src_handle, dst_handle, lo, hi, shift, mask, offsets[c])
+                                                   for c, (lo, hi) in enumerate(chunks)]))
+                    instrument.add(moves=n, allocations=2, nbytes=hist.nbytes + offsets.nbytes)
+                    src, src_handle, dst, dst_handle = dst, dst_handle, src, src_handle
+                shift += bits
+        result = src + low
+        del src, dst
+    return result
+
+def radix_sort_pass_steps(arr, output, base):
+    # Un frame con la entrada y otro por pasada del motor vectorizado; si
+    # todas las claves son iguales no hay pasadas
+    values = np.asarray(arr)
+    output[:] = values
+    yield slice(None), dict(digit=None, current=None, bucket=None)
+    for exp, keys, low in radix_passes(_to_keys(values), base):
+        output[:] = _from_keys(keys + low, values.dtype)
+        yield slice(None), dict(digit=exp, current=None, bucket=None)
+
+def radix_sort_with_animation(arr, stream=False, passes_only=False, base=10):
+    # El canal animado es el arreglo de salida de cada pasada
+    output = np.zeros_like(arr)
+    if passes_only:
+        return animate(radix_sort_pass_steps(arr, output, base), stream, arr=output)
+    return animate(radix_sort_steps(arr, output), stream, arr=output)
+
+def _bar_spec(arr, digit, current, bucket):
+    colors = ['lightblue'] * len(arr)
+    if current is not None and current >= 0:
+        colors[current] = 'red'
+    text = labels(arr)  # Texto con los valores
+    return dict(
+        type='bar',
+        y=arr,
+        marker=dict(color=colors),
+        text=text,
+        textposition='outside',
+        hoverinfo='text'
+    )
+
+def _frame_spec(frame):
+    return {'data': [_bar_spec(frame['arr'], frame['digit'], frame['current'], frame['bucket'])]}
+
+def _figure(first, frames, workers):
+    peak = Peak('arr')
+    fig_frames = build_frames(frames, _frame_spec, workers, observe=peak)
+
+    # Configuración de ejes (una sola celda, como make_subplots) y botones de animación
+    layout = dict(
+        xaxis=dict(anchor='y', domain=[0.0, 1.0], range=[-1, len(first['arr'])]),
+        yaxis=dict(anchor='x', domain=[0.0, 1.0], range=[0, peak.value * 1.1]),
+        updatemenus=[dict(
+            type='buttons',
+            showactive=False,
+            buttons=[dict(label='Play',
+                          method='animate',
+                          args=[None, dict(frame=dict(duration=500, redraw=True),
+                                           fromcurrent=True,
+                                           mode='immediate')])]
+        )],
+        annotations=[
+            dict(text="Azul: Elemento no procesado", x=0, y=1.05, xref="paper", yref="paper", showarrow=False),
+            dict(text="Rojo: Elemento actual", x=1, y=1.05, xref="paper", yref="paper", showarrow=False)
+        ]
+    )
+
+    # El primer frame es la traza inicial
+    data = [_bar_spec(first['arr'], first['digit'], first['current'], first['bucket'])]
+    return data, layout, fig_frames
+
+def create_animation(frames, output_file='radix_sort_animation.html', auto_open=True,
+                     max_frames=None, sample='even', replay=False, workers=None):
+    render_animation(frames, output_file, 'Animación de Radix Sort', _figure, auto_open=auto_open,
+                     max_frames=max_frames, sample=sample, replay=replay, workers=workers, auto_play=False)
+
+if __name__ == "__main__":
+    # Ejemplo de uso
+    arr = np.random.randint(1, 1000, 20)
+    frames = radix_sort_with_animation(arr)
+    create_animation(frames)
@@ -0,0 +1,398 @@
+from array import array
+from bisect import bisect_right
+from collections.abc import MutableMapping
+
+import numpy as np
+
+# Tipos de array.array equivalentes a cada familia de dtype de NumPy
+_TYPECODES = {'i': ('q', np.int64), 'u': ('Q', np.uint64), 'f': ('d', np.float64), 'b': ('b', np.bool_)}
+
+# Metadatos inmutables que se comparten con el paso anterior si son iguales
+_SHAREABLE = (tuple, range, str)
+
+
+class Frame(MutableMapping):
+    """Un frame: los metadatos de su paso y el estado de los canales.
+
+    No copia nada de lo que no cambió. ``meta`` es el dict que guardó el
+    recorder para el paso y los canales que no cambiaron desde el frame
+    anterior son el mismo arreglo, de solo lectura. Lo que agrega una vista
+    queda en ``own``; borrar una clave de los metadatos los copia, solo en
+    este frame.
+    """
+
+    __slots__ = ('step', 'meta', 'own')
+
+    def __init__(self, step, meta, own):
+        self.step = step
+        self.meta = meta
+        self.own = own
+
+    def __getitem__(self, key):
+        own = self.own
+        return own[key] if key in own else self.meta[key]
+
+    def __contains__(self, key):
+        return key in self.own or key in self.meta
+
+    def __setitem__(self, key, value):
+        self.own[key] = value
+
+    def __delitem__(self, key):
+        if key in self.own:
+            del self.own[key]
+            if key not in self.meta:
+                return
+        if key in self.meta:
+            self.meta = {k: v for k, v in self.meta.items() if k != key}
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        yield from (key for key in self.meta if key not in self.own)
+        yield from self.own
+
+    def __len__(self):
+        return len(self.meta) + sum(key not in self.meta for key in self.own)
+
+    def __repr__(self):
+        return f"Frame({dict(self)!r})"
+
+
+def _snapshot(values):
+    # Copia de solo lectura: se puede compartir entre frames sin riesgo
+    snapshot = np.array(values, copy=True)
+    snapshot.flags.writeable = False
+    return snapshot
+
+
+class FrameRecorder:
+    """Traza de animación codificada por deltas.
+
+    Cada canal (``arr``, ``count``, ``output``...) es un array vivo que el
+    algoritmo modifica en su lugar. El recorder guarda una copia inicial y, por
+    cada paso, solo las posiciones que cambiaron como (índice, viejo, nuevo).
+    Cada cierto volumen de deltas guarda un keyframe completo, así que
+    reconstruir el frame ``k`` cuesta O(n) sin importar lo larga que sea la traza.
+    """
+
+    def __init__(self, keyframe_interval=None, view=None, **channels):
+        if not channels:
+            raise ValueError("Se necesita al menos un canal")
+        self._names = list(channels)
+        self._live = channels
+        self._state = {}
+        self._initial = {}
+        self._log = {}
+        self._ends = {}
+        self._lo = {}
+        self._hi = {}
+        for name, values in channels.items():
+            state = np.array(values, copy=True)
+            typecode, dtype = _TYPECODES[state.dtype.kind]
+            self._state[name] = state
+            self._initial[name] = state.copy()
+            self._log[name] = (array('q'), array(typecode), array(typecode), dtype)
+            self._ends[name] = array('q')
+            self._lo[name] = state.min() if state.size else 0
+            self._hi[name] = state.max() if state.size else 0
+        self._meta = []
+        self._view = view
+        self._keyframe_interval = keyframe_interval
+        # Por defecto, un keyframe cada vez que los deltas acumulados igualan el
+        # tamaño del estado: los keyframes nunca ocupan más que los propios deltas
+        self._keyframe_budget = max(1, sum(s.size for s in self._state.values()))
+        self._pending = 0
+        self._key_steps = [-1]
+        self._key_states = [self._initial]
+
+    def __len__(self):
+        return len(self._meta)
+
+    def touch(self, changed):
+        """Registra cambios que se mostrarán en el próximo frame, sin crear uno."""
+        if not isinstance(changed, dict):
+            changed = {self._names[0]: changed}
+        for name, where in changed.items():
+            self._diff(name, where)
+
+    def record(self, changed=(), **meta):
+        """Cierra un paso: guarda los cambios de ``changed`` y sus metadatos.
+
+        ``changed`` son los índices modificados del primer canal, o un dict
+        canal -> índices; un ``slice`` compara todo ese tramo de una vez.
+        """
+        self.touch(changed)
+        for name in self._names:
+            self._ends[name].append(len(self._log[name][0]))
+        if self._meta:
+            previous = self._meta[-1]
+            for key, value in meta.items():
+                same = previous.get(key)
+                if same is not value and type(same) is type(value) and isinstance(value, _SHAREABLE) \
+                        and same == value:
+                    meta[key] = same
+        self._meta.append(meta)
+        step = len(self._meta) - 1
+        if self._keyframe_interval is not None:
+            due = (step + 1) % self._keyframe_interval == 0
+        else:
+            due = self._pending >= self._keyframe_budget
+        if due:
+            self._key_steps.append(step)
+            self._key_states.append({name: s.copy() for name, s in self._state.items()})
+            self._pending = 0
+
+    def extend(self, steps):
+        """Consume un generador de pasos ``(changed, meta)``.
+
+        Un paso con ``meta=None`` solo registra cambios, como ``touch``.
+        """
+        for changed, meta in steps:
+            if meta is None:
+                self.touch(changed)
+            else:
+                self.record(changed, **meta)
+        return self
+
+    def _diff(self, name, where):
+        live = self._live[name]
+        state = self._state[name]
+        idx, old, new, dtype = self._log[name]
+        if isinstance(where, slice):
+            positions = np.arange(state.size)[where]
+            values = np.asarray(live)[positions]
+            mask = values != state[positions]
+            if not mask.any():
+                return
+            positions, values = positions[mask], values[mask]
+            idx.frombytes(positions.astype(np.int64).tobytes())
+            old.frombytes(state[positions].astype(dtype).tobytes())
+            new.frombytes(values.astype(dtype).tobytes())
+            state[positions] = values
+            self._lo[name] = min(self._lo[name], values.min())
+            self._hi[name] = max(self._hi[name], values.max())
+            self._pending += positions.size
+            return
+        for i in where:
+            value = live[i]
+            previous = state[i]
+            if value == previous:
+                continue
+            idx.append(i if i >= 0 else i + state.size)
+            old.append(previous)
+            new.append(value)
+            state[i] = value
+            if value < self._lo[name]:
+                self._lo[name] = value
+            elif value > self._hi[name]:
+                self._hi[name] = value
+            self._pending += 1
+
+    def _apply(self, state, step, starts, shared):
+        # Aplica sobre ``state`` los deltas del paso ``step``; los canales que
+        # cambian dejan de compartirse con el frame anterior
+        for name in self._names:
+            end = self._ends[name][step]
+            start = starts[name]
+            if end > start:
+                idx, _, new, dtype = self._log[name]
+                positions = np.frombuffer(idx[start:end], dtype=np.int64)
+                state[name][positions] = np.frombuffer(new[start:end], dtype=dtype)
+                shared.pop(name, None)
+            starts[name] = end
+
+    def _frame(self, state, step, shared):
+        for name in self._names:
+            if name not in shared:
+                shared[name] = _snapshot(state[name])
+        frame = Frame(step, self._meta[step], dict(shared))
+        return self._view(frame) if self._view is not None else frame
+
+    def _starts(self, step):
+        # Posición en el log de deltas donde empieza el paso ``step``
+        if step < 0:
+            return {name: 0 for name in self._names}
+        return {name: self._ends[name][step] for name in self._names}
+
+    def __getitem__(self, k):
+        if k < 0:
+            k += len(self._meta)
+        if not 0 <= k < len(self._meta):
+            raise IndexError("Índice de frame fuera de rango")
+        return next(self.select([k]))
+
+    def select(self, steps):
+        """Frames de los pasos ``steps`` (en orden creciente).
+
+        Avanza aplicando deltas y salta al keyframe más cercano cuando hay uno
+        entre dos pasos pedidos, así que solo se reconstruyen los frames elegidos.
+        """
+        state = None
+        current = None
+        shared = {}
+        for k in steps:
+            pos = bisect_right(self._key_steps, k) - 1
+            key_step = self._key_steps[pos]
+            if state is None or key_step > current:
+                state = {name: s.copy() for name, s in self._key_states[pos].items()}
+                starts = self._starts(key_step)
+                current = key_step
+                shared.clear()
+            for step in range(current + 1, k + 1):
+                self._apply(state, step, starts, shared)
+            current = k
+            yield self._frame(state, k, shared)
+
+    def __iter__(self):
+        state = {name: s.copy() for name, s in self._initial.items()}
+        starts = self._starts(-1)
+        shared = {}
+        for step in range(len(self._meta)):
+            self._apply(state, step, starts, shared)
+            yield self._frame(state, step, shared)
+
+    @property
+    def channels(self):
+        return list(self._names)
+
+    def metadata(self, k):
+        # Metadatos del paso ``k`` sin reconstruir los canales
+        return dict(self._meta[k])
+
+    def deltas(self, name=None):
+        """Log de un canal como arreglos: (índices, valores viejos, nuevos, fin de cada paso)."""
+        idx, old, new, dtype = self._log[name or self._names[0]]
+        ends = self._ends[name or self._names[0]]
+        return (np.frombuffer(idx, dtype=np.int64), np.frombuffer(old, dtype=dtype),
+                np.frombuffer(new, dtype=dtype), np.frombuffer(ends, dtype=np.int64))
+
+    def changes(self):
+        """Cantidad de posiciones que cambió cada paso, sumando todos los canales."""
+        total = np.zeros(len(self._meta), dtype=np.int64)
+        for name in self._names:
+            total += np.diff(np.frombuffer(self._ends[name], dtype=np.int64), prepend=0)
+        return total
+
+    def initial(self, name=None):
+        return self._initial[name or self._names[0]].copy()
+
+    def min(self, name=None):
+        return self._lo[name or self._names[0]]
+
+    def max(self, name=None):
+        return self._hi[name or self._names[0]]
+
+    @property
+    def nbytes(self):
+        """Memoria aproximada de la traza (deltas, keyframes y metadatos)."""
+        total = sum(len(a) * a.itemsize for log in self._log.values() for a in log[:3])
+        total += sum(len(e) * e.itemsize for e in self._ends.values())
+        total += sum(s.nbytes for key in self._key_states for s in key.values())
+        return total + sum(64 + 8 * len(m) for m in self._meta)
+
+
+def stream_frames(steps, view=None, **channels):
+    """Materializa los frames a medida que el algoritmo los produce.
+
+    No guarda la traza: la memoria no depende de su longitud y el primer frame
+    está disponible en cuanto el algoritmo da su primer paso. Como en el
+    recorder, solo se copian los canales que el paso declara cambiados.
+    """
+    first = next(iter(channels))
+    shared = {}
+    step = 0
+    for changed, meta in steps:
+        if isinstance(changed, dict):
+            for name in changed:
+                shared.pop(name, None)
+        elif isinstance(changed, slice) or len(changed):
+            shared.pop(first, None)
+        if meta is None:
+            continue
+        for name, values in channels.items():
+            if name not in shared:
+                shared[name] = _snapshot(values)
+        frame = Frame(step, meta, dict(shared))
+        step += 1
+        yield view(frame) if view is not None else frame
+
+
+def animate(steps, stream=False, view=None, **channels):
+    """Devuelve los frames de ``steps`` como generador o como FrameRecorder."""
+    if stream:
+        return stream_frames(steps, view=view, **channels)
+    return FrameRecorder(view=view, **channels).extend(steps)
+
+
+def _stage_key(meta):
+    # Lo que separa una etapa de la siguiente: stage, gap de shell o dígito de radix
+    return meta.get('stage'), meta.get('gap'), meta.get('digit')
+
+
+def _sample_steps(recorder, budget, by):
+    n = len(recorder)
+    if n <= budget:
+        return range(n)
+    keys = [_stage_key(meta) for meta in recorder._meta]
+    starts = [k for k in range(1, n) if keys[k] != keys[k - 1]]
+    # Primer y último frame de cada etapa; si no entran, solo el primero
+    pinned = sorted({0, n - 1, *starts, *(k - 1 for k in starts)})
+    if len(pinned) > budget:
+        pinned = sorted({0, n - 1, *starts})
+    if len(pinned) >= budget:
+        picks = np.linspace(0, len(pinned) - 1, budget).round().astype(np.intp)
+        return sorted({pinned[i] for i in picks})
+    free = budget - len(pinned)
+    if by == 'change':
+        # Más frames donde más posiciones cambian: cuantiles del cambio acumulado
+        cumulative = np.cumsum(recorder.changes())
+        extra = np.searchsorted(cumulative, np.linspace(0, cumulative[-1], free + 2)[1:-1])
+    else:
+        extra = np.linspace(0, n - 1, free + 2)[1:-1].round()
+    return sorted(set(pinned).union(extra.astype(np.intp).tolist()))
+
+
+def _decimate_stream(frames, budget):
+    # Sin conocer el largo: se guarda uno de cada ``stride`` frames y, cuando se
+    # llena el presupuesto, se duplica el paso y se descarta la mitad
+    kept = []
+    stride = 1
+    previous = None
+    for index, frame in enumerate(frames):
+        key = _stage_key(frame)
+        boundary = previous is None or key != previous[2]
+        if boundary and previous is not None and kept[-1][0] != previous[0]:
+            kept.append((previous[0], previous[1], True))
+        if boundary or index % stride == 0:
+            kept.append((index, frame, boundary))
+        while len(kept) >= budget:
+            stride *= 2
+            kept = [item for item in kept if item[2] or item[0] % stride == 0]
+            if len(kept) >= budget:
+                # Ni las transiciones entran: se descarta una de cada dos
+                kept = kept[::2]
+        previous = index, frame, key
+    for _, frame, _ in kept:
+        yield frame
+    if previous is not None and (not kept or kept[-1][0] != previous[0]):
+        yield previous[1]
+
+
+def decimate(frames, budget, by='even'):
+    """Reduce una traza a ``budget`` frames como máximo.
+
+    Se conservan el primer y el último frame de cada etapa (cambio de
+    ``stage``, de gap o de dígito) mientras entren en el presupuesto, y el
+    resto se reparte entre los demás pasos: de forma pareja (``'even'``) o
+    según cuántas posiciones cambiaron (``'change'``). Con un FrameRecorder
+    solo se reconstruyen los frames elegidos; con un generador se guardan a lo
+    sumo ``budget`` frames y el reparto es siempre parejo.
+    """
+    if budget < 2:
+        raise ValueError("El presupuesto debe ser de al menos 2 frames")
+    if by not in ('even', 'change'):
+        raise ValueError(f"Muestreo desconocido: {by!r}")
+    if isinstance(frames, FrameRecorder):
+        return frames.select(_sample_steps(frames, budget, by))
+    return _decimate_stream(iter(frames), budget)
@@ -0,0 +1,288 @@
+"""Construcción de la figura de plotly como dicts, sin ``plotly.graph_objects``.
+
+Cada módulo define ``_frame_spec(frame)``, una función de nivel de módulo que
+devuelve el frame de plotly como dict (``{'data': [...], 'layout': {...}}``)
+ya en la forma que dejarían los validadores de ``go.Bar``/``go.Frame``, y arma
+el layout de la misma manera. ``write_figure`` serializa todo con orjson (o
+``json`` si no está) y escribe el HTML con la misma plantilla que
+``plotly.io.write_html``. Con ``workers`` los frames se reparten en bloques
+entre procesos.
+
+``render_animation`` es lo común a todos los ``create_animation``: el modo
+replay, la reducción a ``max_frames`` y la escritura; cada módulo aporta solo
+sus trazas y su layout.
+"""
+
+import base64
+import json
+import os
+from functools import lru_cache
+from importlib.util import find_spec
+from itertools import chain, islice
+
+import numpy as np
+
+from .recorder import decimate
+from .replay import write_replay
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Frames por tarea: bloques grandes amortizan el envío entre procesos
+CHUNK_SIZE = 256
+
+# Subir cuando cambie el HTML que generan los create_animation: invalida la caché
+RENDER_VERSION = 2
+
+# Plantilla por defecto de plotly (``plotly.io.templates.default``)
+TEMPLATE = 'plotly'
+
+# Tipos que plotly.js lee como arreglos tipados
+_TYPED = {'int8': 'i1', 'uint8': 'u1', 'int16': 'i2', 'uint16': 'u2', 'int32': 'i4', 'uint32': 'u4',
+          'float32': 'f4', 'float64': 'f8'}
+
+# Claves que plotly no convierte a arreglos tipados
+_SKIPPED = {'geojson', 'layer', 'layers', 'range'}
+
+# Caracteres que no pueden quedar tal cual dentro de un <script>
+_UNSAFE = (('<', '\\u003c'), ('>', '\\u003e'), ('/', '\\u002f'), ('\u2028', '\\u2028'), ('\u2029', '\\u2029'))
+
+
+# Texto de cada valor ya visto, por dtype (1 y 1.0 no se escriben igual)
+_labels = {}
+
+# Valores distintos que se recuerdan por dtype antes de vaciar la tabla
+MAX_LABELS = 1 << 16
+
+
+def labels(values):
+    """Textos de las barras: ``str`` de cada valor, sin formatear dos veces el mismo."""
+    values = np.asarray(values)
+    table = _labels.setdefault(values.dtype.str, {})
+    items = values.tolist()
+    try:
+        return [table[v] for v in items]
+    except KeyError:
+        if len(table) > MAX_LABELS:
+            table.clear()
+        for v in items:
+            table[v] = str(v)
+        return [table[v] for v in items]
+
+
+@lru_cache(maxsize=8)
+def positions(n):
+    """Eje x ``0..n-1``, la misma lista para todos los frames de un largo."""
+    return list(range(n))
+
+
+def typed_array(values):
+    """``values`` como arreglo tipado de plotly.js (base64), igual que al validar.
+
+    Los enteros de 64 bits se achican al menor tipo que los contiene; si no
+    entran en 32 bits el arreglo queda como está.
+    """
+    if values.size == 0:
+        return values
+    if values.dtype.kind in 'iu' and values.dtype.itemsize == 8:
+        low, high = values.min(), values.max()
+        for dtype in ((np.int8, np.int16, np.int32) if values.dtype.kind == 'i'
+                      else (np.uint8, np.uint16, np.uint32)):
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                values = values.astype(dtype)
+                break
+        else:
+            return values
+    code = _TYPED.get(str(values.dtype))
+    if code is None:
+        return values
+    spec = {'dtype': code, 'bdata': base64.b64encode(values).decode('ascii')}
+    if values.ndim > 1:
+        spec['shape'] = str(values.shape)[1:-1]
+    return spec
+
+
+def encode_arrays(obj):
+    """Reemplaza en su lugar los arreglos de NumPy de ``obj`` por arreglos tipados.
+
+    Como ``convert_to_base64`` de plotly, pero sin recorrer las listas de
+    escalares (colores, textos), que son la mayor parte de un frame.
+    """
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if key in _SKIPPED:
+                continue
+            if isinstance(value, np.ndarray):
+                obj[key] = typed_array(value)
+            elif isinstance(value, (dict, list, tuple)):
+                encode_arrays(value)
+    elif obj and isinstance(obj, (list, tuple)) and isinstance(obj[0], (dict, list, tuple)):
+        for value in obj:
+            encode_arrays(value)
+
+
+class Peak:
+    """``observe`` para ``build_frames`` que guarda el máximo de unos canales.
+
+    El rango del eje y sale de todos los frames, que se ven recién mientras se
+    construyen.
+    """
+
+    def __init__(self, *channels):
+        self.channels = channels
+        self.value = 0
+
+    def __call__(self, frame):
+        for name in self.channels:
+            self.value = max(self.value, np.max(frame[name]))
+
+
+def _build_chunk(args):
+    frame_spec, start, frames = args
+    specs = [dict(frame_spec(frame), name=str(start + k)) for k, frame in enumerate(frames)]
+    encode_arrays(specs)
+    return specs
+
+
+def _chunks(frames, frame_spec, size, observe):
+    start = 0
+    while True:
+        chunk = list(islice(frames, size))
+        if not chunk:
+            return
+        if observe is not None:
+            for frame in chunk:
+                observe(frame)
+        yield frame_spec, start, chunk
+        start += len(chunk)
+
+
+def build_frames(frames, frame_spec, workers=None, chunk_size=CHUNK_SIZE, observe=None):
+    """Lista de frames de plotly (dicts) en el orden de ``frames``.
+
+    ``frame_spec`` tiene que poder enviarse a otro proceso: una función de
+    módulo o un ``functools.partial`` de una. ``observe(frame)`` se llama en
+    este proceso con cada frame, para acumular por ejemplo el valor máximo.
+    """
+    tasks = _chunks(iter(frames), frame_spec, chunk_size, observe)
+    if not workers or workers < 2:
+        return [spec for task in tasks for spec in _build_chunk(task)]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers) as pool:
+        return [spec for chunk in pool.map(_build_chunk, tasks) for spec in chunk]
+
+
+def _default(value):
+    # Lo que ``json`` no sabe serializar y orjson sí
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"No se puede serializar {type(value).__name__}")
+
+
+def dumps(obj):
+    """JSON compacto para un <script>, con orjson si está instalado."""
+    if orjson is not None:
+        text = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+                            default=_default).decode('utf8')
+    else:
+        text = json.dumps(obj, separators=(',', ':'), ensure_ascii=False, default=_default)
+    for unsafe, safe in _UNSAFE:
+        if unsafe in text:
+            text = text.replace(unsafe, safe)
+    return text
+
+
+def _package_data(*path):
+    # Archivos de plotly sin importar el paquete
+    return os.path.join(find_spec('plotly').submodule_search_locations[0], 'package_data', *path)
+
+
+_template = None
+
+
+def template():
+    """Layout de la plantilla de plotly que la figura lleva en ``layout.template``."""
+    global _template
+    if _template is None:
+        with open(_package_data('templates', f'{TEMPLATE}.json'), encoding='utf-8') as f:
+            _template = json.load(f)
+    return _template
+
+
+def _pixels(value):
+    return f'{value}px' if isinstance(value, (int, float)) else value
+
+
+def write_figure(data, layout, frames, output_file, auto_open=True, auto_play=True, div_id=None):
+    """Escribe la figura como lo haría ``plotly.io.write_html``, sin validarla.
+
+    ``data`` son las trazas iniciales y ``layout`` el layout, ambos dicts en
+    la forma validada; ``frames`` los frames de ``build_frames``. El HTML
+    incluye plotly.js, como ``include_plotlyjs=True``.
+    """
+    import uuid
+    import webbrowser
+
+    data = [dict(trace) for trace in data]
+    encode_arrays(data)
+    layout = dict(layout, template=template())
+    div_id = div_id or str(uuid.uuid4())
+    with open(_package_data('plotly.min.js'), encoding='utf-8') as f:
+        plotlyjs = f.read()
+    height = _pixels(layout.get('height', '100%'))
+    width = _pixels(layout.get('width', '100%'))
+    # Las partes se escriben por separado: los frames pueden ser cientos de MB
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write('<!doctype html>\n<html>\n<head>\n    <meta charset="utf-8" />\n'
+                '    <style>html, body {height: 100%;}</style>\n</head>\n<body>\n')
+        f.write(f'    <div style="height:{height}; width:{width};">'
+                "<script>window.PlotlyConfig = {MathJaxConfig: 'local'};</script>\n        <script>")
+        f.write(plotlyjs)
+        f.write(f'</script><div id="{div_id}" class="plotly-graph-div" style="height:100%; width:100%;"></div>'
+                f'<script>window.PLOTLYENV=window.PLOTLYENV || {{}};'
+                f'if (document.getElementById("{div_id}")) {{'
+                f'Plotly.newPlot("{div_id}", {dumps(data)}, {dumps(layout)}, {{"responsive": true}})')
+        if frames:
+            f.write(f".then(function(){{Plotly.addFrames('{div_id}', ")
+            f.write(dumps(frames))
+            f.write(');})')
+            if auto_play:
+                f.write(f".then(function(){{Plotly.animate('{div_id}', null);}})")
+        f.write('};</script></div>\n</body>\n</html>')
+    if auto_open:
+        webbrowser.open('file://' + os.path.realpath(output_file))
+
+
+def prepare(frames, max_frames=None, sample='even'):
+    """Primer frame y los frames a renderizar (empezando por ese mismo).
+
+    Con un presupuesto ``max_frames`` la traza pasa antes por ``decimate``: el
+    costo de renderizar depende de él y no del largo de la traza.
+    """
+    if max_frames is not None:
+        frames = decimate(frames, max_frames, sample)
+    frames = iter(frames)
+    first = next(frames)
+    return first, chain([first], frames)
+
+
+def render_animation(frames, output_file, title, figure, auto_open=True, max_frames=None, sample='even',
+                     replay=False, workers=None, auto_play=True, channel=None):
+    """Escribe la animación de ``frames``; lo que comparten los ``create_animation``.
+
+    ``figure(first, frames, workers)`` devuelve las trazas iniciales, el
+    layout (sin título) y los frames de ``build_frames``. Con ``replay`` el
+    HTML lleva el log de deltas del canal ``channel`` y lo reproduce el navegador.
+    """
+    if replay:
+        return write_replay(frames, output_file, title=title, channel=channel, auto_open=auto_open)
+    first, frames = prepare(frames, max_frames, sample)
+    data, layout, fig_frames = figure(first, frames, workers)
+    layout = dict(title=dict(text=title), **layout)
+    write_figure(data, layout, fig_frames, output_file, auto_open=auto_open, auto_play=auto_play)
+    print(f"La animación ha sido guardada en {output_file}")
@@ -0,0 +1,157 @@
+"""Exportación de una traza como HTML que se reproduce en el navegador.
+
+En lugar de un ``go.Frame`` completo por paso, el HTML lleva el arreglo
+inicial y el log de deltas del FrameRecorder empaquetado en binario (base64),
+con el tipo entero más chico que alcance. Un reproductor de pocas líneas aplica
+los deltas y actualiza la única serie de barras con ``Plotly.restyle``. Los
+valores anteriores no viajan: el reproductor los calcula al cargar con una
+pasada hacia adelante, y con ellos puede retroceder.
+"""
+
+import base64
+import json
+
+import numpy as np
+
+from .recorder import FrameRecorder
+
+# Claves de los metadatos que se muestran como etiqueta del paso
+LABEL_KEYS = ('stage', 'gap', 'digit')
+
+_PLAYER_JS = """
+var gd = document.getElementById('{plot_id}');
+var trace = __TRACE__;
+function decode(data, type) {
+    var bytes = Uint8Array.from(atob(data), function (c) { return c.charCodeAt(0); });
+    return new type(bytes.buffer);
+}
+var values = decode(trace.initial, window[trace.type]);
+var idx = decode(trace.idx, window[trace.idx_type]);
+var neu = decode(trace.new, window[trace.type]);
+var ends = decode(trace.ends, Int32Array);
+var labels = decode(trace.labels, Int32Array);
+var steps = ends.length, step = -1, timer = null;
+
+// Valor anterior de cada delta, para poder retroceder
+var old = new values.constructor(neu.length);
+var scratch = values.slice();
+for (var j = 0; j < neu.length; j++) {
+    old[j] = scratch[idx[j]];
+    scratch[idx[j]] = neu[j];
+}
+
+var controls = document.createElement('div');
+controls.style.margin = '8px 40px';
+controls.innerHTML = '<button>Play</button> <input type="range" min="-1" value="-1" style="width:60%"> <span></span>';
+gd.parentNode.insertBefore(controls, gd.nextSibling);
+var button = controls.children[0], slider = controls.children[1], text = controls.children[2];
+slider.max = steps - 1;
+
+function seek(target) {
+    // Hacia adelante se aplican los valores nuevos; hacia atrás, los viejos
+    while (step < target) {
+        step++;
+        for (var j = step > 0 ? ends[step - 1] : 0; j < ends[step]; j++) values[idx[j]] = neu[j];
+    }
+    while (step > target) {
+        for (var j = ends[step] - 1; j >= (step > 0 ? ends[step - 1] : 0); j--) values[idx[j]] = old[j];
+        step--;
+    }
+    var colors = new Array(values.length).fill(trace.colors[0]);
+    if (step >= 0) {
+        for (var j = step > 0 ? ends[step - 1] : 0; j < ends[step]; j++) colors[idx[j]] = trace.colors[1];
+    }
+    Plotly.restyle(gd, {y: [Array.from(values)], 'marker.color': [colors]}, [0]);
+    slider.value = step;
+    text.textContent = (step + 1) + ' / ' + steps + (step >= 0 ? '  ' + trace.names[labels[step]] : '');
+}
+
+function stop() {
+    clearInterval(timer);
+    timer = null;
+    button.textContent = 'Play';
+}
+button.onclick = function () {
+    if (timer !== null) return stop();
+    if (step >= steps - 1) seek(-1);
+    button.textContent = 'Pause';
+    timer = setInterval(function () {
+        if (step >= steps - 1) return stop();
+        seek(step + 1);
+    }, trace.duration);
+};
+slider.oninput = function () { seek(parseInt(slider.value, 10)); };
+seek(-1);
+"""
+
+
+# Tipos de arreglo de JavaScript, del más chico al más grande
+_JS_INT_TYPES = ((np.int8, 'Int8Array'), (np.int16, 'Int16Array'), (np.int32, 'Int32Array'))
+
+
+def _value_type(values, lo, hi):
+    if values.dtype.kind in 'iub':
+        for dtype, js_type in _JS_INT_TYPES:
+            info = np.iinfo(dtype)
+            if info.min <= lo and hi <= info.max:
+                return dtype, js_type
+    return np.float64, 'Float64Array'
+
+
+def _pack(values, dtype):
+    return base64.b64encode(np.ascontiguousarray(values, dtype=dtype).tobytes()).decode('ascii')
+
+
+def _label(meta):
+    return '  '.join(f"{key}: {meta[key]}" for key in LABEL_KEYS if meta.get(key) is not None)
+
+
+def replay_trace(recorder, channel=None):
+    """Datos del reproductor para un canal del recorder, listos para JSON."""
+    name = channel or recorder.channels[0]
+    idx, _, new, ends = recorder.deltas(name)
+    initial = recorder.initial(name)
+    dtype, js_type = _value_type(initial, recorder.min(name), recorder.max(name))
+    idx_dtype, idx_type = (np.uint16, 'Uint16Array') if initial.size <= 1 << 16 else (np.int32, 'Int32Array')
+
+    # Una etiqueta por paso, guardada como índice en la lista de nombres distintos
+    names = {}
+    labels = [names.setdefault(_label(recorder.metadata(k)), len(names)) for k in range(len(recorder))]
+    return {
+        'type': js_type,
+        'initial': _pack(initial, dtype),
+        'idx_type': idx_type,
+        'idx': _pack(idx, idx_dtype),
+        'new': _pack(new, dtype),
+        'ends': _pack(ends, np.int32),
+        'labels': _pack(labels, np.int32),
+        'names': list(names),
+    }
+
+
+def write_replay(frames, output_file, title='', channel=None, auto_open=True, duration=50,
+                 colors=('rgb(173, 216, 230)', 'rgb(255, 99, 71)'), include_plotlyjs='cdn'):
+    """Escribe un HTML que reproduce la traza con un solo trace de barras.
+
+    El tamaño del archivo es O(n + deltas) en lugar de O(n × frames). Las
+    barras que cambian en cada paso se resaltan con el segundo color.
+    """
+    if not isinstance(frames, FrameRecorder):
+        raise TypeError("El modo replay necesita la traza grabada (un FrameRecorder, sin stream)")
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    name = channel or frames.channels[0]
+    trace = replay_trace(frames, name)
+    trace.update(duration=duration, colors=list(colors))
+    initial = frames.initial(name)
+
+    fig = go.Figure(go.Bar(y=initial.tolist(), marker_color=colors[0], hoverinfo='y'))
+    fig.update_layout(title=title, height=600)
+    fig.update_xaxes(title_text='Índice')
+    fig.update_yaxes(range=[min(0, frames.min(name)), frames.max(name) * 1.1], title_text='Valor')
+
+    script = _PLAYER_JS.replace('__TRACE__', json.dumps(trace))
+    pio.write_html(fig, file=output_file, auto_open=auto_open, include_plotlyjs=include_plotlyjs,
+                   post_script=script)
+    print(f"La animación ha sido guardada en {output_file}")
@@ -0,0 +1,395 @@
+"""Servidor local que transmite los frames al navegador mientras se generan.
+
+    python -m servicio.server --port 8000
+    # http://localhost:8000/?algorithm=heap&size=500&seed=1
+
+El algoritmo corre en un hilo con ``stream=True`` y sus frames se mandan por
+WebSocket en lotes: el primero de un frame y cada uno el doble del anterior
+hasta ``batch_size``, así que el primer frame llega sin esperar a la traza
+completa. Los espectadores que piden la misma entrada comparten una sola
+corrida. Hay dos frenos: el cliente pide cada lote nuevo cuando se le vacía la
+cola (créditos) y el hilo no se adelanta más de ``window`` lotes al
+espectador más avanzado.
+
+Se guardan a lo sumo ``window`` lotes: los que ya vieron todos se descartan, y
+un espectador que se queda más atrás (una pestaña en segundo plano) salta al
+lote más viejo que queda, igual que quien llega tarde. Cada frame lleva los
+arreglos completos, así que se puede seguir desde cualquier lote.
+
+El WebSocket es el mínimo de RFC 6455 que hace falta aquí (mensajes de texto,
+ping y cierre), sobre ``asyncio``, para no sumar dependencias.
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+from collections import deque
+from importlib import import_module
+from itertools import islice
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from .__main__ import ALGORITHMS
+from .replay import LABEL_KEYS
+
+_WEBSOCKET_GUID = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+# Lotes que un cliente puede tener sin confirmar
+INITIAL_CREDIT = 2
+
+_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>servicio</title>
+<script src="https://cdn.plot.ly/plotly-2.35.2.min.js"></script>
+</head>
+<body style="font-family: sans-serif">
+<div id="status" style="margin: 8px 40px"></div>
+<div id="plots"></div>
+<script>
+var params = new URLSearchParams(location.search);
+var duration = parseInt(params.get('duration') || '50', 10);
+var statusEl = document.getElementById('status');
+var ws = new WebSocket((location.protocol === 'https:' ? 'wss://' : 'ws://') + location.host + '/ws' + location.search);
+var queue = [], owed = 0, done = false, shown = 0, plots = {};
+
+ws.onmessage = function (event) {
+    var batch = JSON.parse(event.data);
+    if (batch.error) statusEl.textContent = batch.error;
+    queue.push.apply(queue, batch.frames);
+    done = batch.done;
+    owed++;
+};
+
+function draw(frame) {
+    Object.keys(frame.arrays).forEach(function (name) {
+        var values = frame.arrays[name];
+        var colors = values.map(function (_, i) {
+            return i === frame.current ? 'rgb(255, 99, 71)' : 'rgb(173, 216, 230)';
+        });
+        if (!plots[name]) {
+            plots[name] = document.createElement('div');
+            document.getElementById('plots').appendChild(plots[name]);
+            Plotly.newPlot(plots[name], [{type: 'bar', y: values, marker: {color: colors}}],
+                           {title: name, height: 300, margin: {t: 40}});
+        } else {
+            Plotly.restyle(plots[name], {y: [values], 'marker.color': [colors]}, [0]);
+        }
+    });
+    shown++;
+    statusEl.textContent = shown + (frame.label ? '  ' + frame.label : '');
+}
+
+var timer = setInterval(function () {
+    if (queue.length) draw(queue.shift());
+    // Se confirma un lote solo cuando la cola está por vaciarse: el servidor
+    // no manda más de lo que se alcanza a mostrar
+    while (owed > 0 && queue.length < 16 && ws.readyState === WebSocket.OPEN) {
+        ws.send('ack');
+        owed--;
+    }
+    if (done && !queue.length) {
+        clearInterval(timer);
+        ws.close();
+        statusEl.textContent += '  (fin)';
+    }
+}, duration);
+</script>
+</body>
+</html>
+"""
+
+
+class WebSocket:
+    """Lado servidor de un WebSocket ya aceptado."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @staticmethod
+    def accept_key(key):
+        return base64.b64encode(hashlib.sha1(key.encode() + _WEBSOCKET_GUID).digest()).decode()
+
+    def _frame(self, opcode, data):
+        n = len(data)
+        if n < 126:
+            header = struct.pack('!BB', 0x80 | opcode, n)
+        elif n < 1 << 16:
+            header = struct.pack('!BBH', 0x80 | opcode, 126, n)
+        else:
+            header = struct.pack('!BBQ', 0x80 | opcode, 127, n)
+        self.writer.write(header + data)
+
+    async def send(self, text):
+        # drain() espera si el socket no da abasto: un cliente lento frena su
+        # propio envío y no el de los demás
+        self._frame(0x1, text.encode())
+        await self.writer.drain()
+
+    async def receive(self):
+        """Próximo mensaje de texto del cliente, o None si cerró la conexión."""
+        try:
+            while True:
+                first, second = await self.reader.readexactly(2)
+                opcode, n = first & 0x0F, second & 0x7F
+                if n == 126:
+                    n, = struct.unpack('!H', await self.reader.readexactly(2))
+                elif n == 127:
+                    n, = struct.unpack('!Q', await self.reader.readexactly(8))
+                mask = await self.reader.readexactly(4) if second & 0x80 else bytes(4)
+                data = bytes(b ^ mask[i % 4] for i, b in enumerate(await self.reader.readexactly(n)))
+                if opcode == 0x8:
+                    self._frame(0x8, data[:2])
+                    await self.writer.drain()
+                    return None
+                if opcode == 0x9:
+                    self._frame(0xA, data)
+                    await self.writer.drain()
+                elif opcode == 0x1:
+                    return data.decode()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return None
+
+
+def _json_value(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def encode_frame(frame):
+    """Lo que el cliente dibuja de un frame: las series numéricas, el índice actual y una etiqueta."""
+    arrays = {}
+    for name, value in frame.items():
+        if isinstance(value, np.ndarray):
+            arrays[name] = value.tolist()
+        elif isinstance(value, list) and all(v is None or isinstance(v, (int, float, np.number))
+                                             for v in value):
+            arrays[name] = [_json_value(v) for v in value]
+    current = frame.get('current')
+    return {
+        'arrays': arrays,
+        'current': int(current) if isinstance(current, (int, np.integer)) else None,
+        'label': '  '.join(f"{key}: {_json_value(frame[key])}" for key in LABEL_KEYS
+                           if frame.get(key) is not None),
+    }
+
+
+class SharedTrace:
+    """Una corrida del algoritmo, compartida por todos los que la miran.
+
+    El hilo deja en ``batches`` los lotes ya serializados y cada espectador
+    los recorre desde su propia posición en ``viewers``. Las posiciones cuentan
+    desde el primer lote de la corrida; ``first`` es la del lote más viejo que
+    sigue en ``batches``: los anteriores ya los vieron todos o quedaron más de
+    ``window`` lotes atrás, y se descartaron.
+    """
+
+    def __init__(self, frames, batch_size=64, window=8):
+        self.frames = frames
+        self.batch_size = batch_size
+        self.window = window
+        self.batches = deque()
+        self.first = 0
+        self.done = False
+        self.viewers = {}
+        self.changed = asyncio.Condition()
+        self.task = asyncio.get_running_loop().create_task(self._produce())
+
+    def _take(self, size):
+        try:
+            frames = list(islice(self.frames, size))
+        except Exception as error:
+            return json.dumps({'frames': [], 'done': True, 'error': f'{type(error).__name__}: {error}'}), True
+        done = len(frames) < size
+        return json.dumps({'frames': [encode_frame(f) for f in frames], 'done': done}), done
+
+    def _end(self):
+        return self.first + len(self.batches)
+
+    def _ahead(self):
+        return self._end() - max(self.viewers.values(), default=self.first)
+
+    def _trim(self):
+        # Descarta los lotes que ya mandó a todos los espectadores y los que
+        # quedaron más de ``window`` lotes atrás: un espectador detenido no
+        # corre código, así que no puede ser él quien los suelte
+        slowest = min(self.viewers.values(), default=self._end())
+        keep = max(slowest, self._end() - self.window)
+        while self.first < keep:
+            self.batches.popleft()
+            self.first += 1
+
+    def join(self, viewer):
+        """Registra un espectador; empieza por el lote más viejo que queda."""
+        self.viewers[viewer] = self.first
+
+    def leave(self, viewer):
+        # Sin esperar el lock, para que ni una cancelación deje al espectador
+        # registrado; si el hilo esperaba, lo despierta el próximo que avance
+        del self.viewers[viewer]
+        self._trim()
+
+    async def _produce(self):
+        loop = asyncio.get_running_loop()
+        size = 1
+        while not self.done:
+            async with self.changed:
+                await self.changed.wait_for(lambda: self._ahead() < self.window)
+            payload, done = await loop.run_in_executor(None, self._take, size)
+            async with self.changed:
+                self.batches.append(payload)
+                self.done = done
+                self._trim()
+                self.changed.notify_all()
+            size = min(2 * size, self.batch_size)
+
+    async def follow(self, ws, viewer):
+        """Manda los lotes a ``ws`` a medida que el cliente los pide."""
+        credit = asyncio.Semaphore(INITIAL_CREDIT)
+        closed = False
+
+        async def read_acks():
+            nonlocal closed
+            while await ws.receive() is not None:
+                credit.release()
+            closed = True
+            credit.release()
+
+        reader = asyncio.get_running_loop().create_task(read_acks())
+        position = self.viewers[viewer]
+        try:
+            while True:
+                async with self.changed:
+                    await self.changed.wait_for(lambda: position < self._end() or self.done)
+                if position >= self._end():
+                    break
+                await credit.acquire()
+                if closed:
+                    break
+                # Si se quedó atrás mientras esperaba, sus lotes ya no están
+                position = max(position, self.first)
+                await ws.send(self.batches[position - self.first])
+                position += 1
+                async with self.changed:
+                    self.viewers[viewer] = position
+                    self._trim()
+                    self.changed.notify_all()
+            # Esperar el cierre del cliente antes de soltar la conexión
+            await reader
+        except ConnectionError:
+            pass
+        finally:
+            reader.cancel()
+
+
+class AnimationServer:
+    def __init__(self, batch_size=64, window=8, max_size=10 ** 5):
+        self.batch_size = batch_size
+        self.window = window
+        self.max_size = max_size
+        self.traces = {}
+
+    def _trace_params(self, query):
+        params = parse_qs(query)
+        algorithm = params.get('algorithm', ['heap'])[0]
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Algoritmo desconocido: {algorithm!r}")
+        _, _, size, max_value = ALGORITHMS[algorithm]
+        size = int(params.get('size', [size])[0])
+        if not 0 < size <= self.max_size:
+            raise ValueError(f"El tamaño debe estar entre 1 y {self.max_size}")
+        return algorithm, size, int(params.get('max_value', [max_value])[0]), int(params.get('seed', [0])[0])
+
+    def _trace(self, key):
+        trace = self.traces.get(key)
+        if trace is None:
+            algorithm, size, max_value, seed = key
+            module_name, function_name, _, _ = ALGORITHMS[algorithm]
+            module = import_module(f'.{module_name}', __package__)
+            arr = np.random.default_rng(seed).integers(1, max_value, size)
+            frames = getattr(module, function_name)(arr, stream=True)
+            trace = self.traces[key] = SharedTrace(frames, self.batch_size, self.window)
+        return trace
+
+    async def _viewer(self, ws, key):
+        trace = self._trace(key)
+        viewer = object()
+        trace.join(viewer)
+        try:
+            await trace.follow(ws, viewer)
+        finally:
+            trace.leave(viewer)
+            if not trace.viewers:
+                # Nadie más la mira: se descarta, terminada o no
+                trace.task.cancel()
+                if self.traces.get(key) is trace:
+                    del self.traces[key]
+
+    async def _respond(self, writer, status, body, content_type='text/plain; charset=utf-8'):
+        body = body.encode()
+        writer.write(f'HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n'
+                     f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode() + body)
+        await writer.drain()
+
+    async def handle(self, reader, writer):
+        try:
+            request = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+            _, target, _ = request[0].split(' ', 2)
+            headers = {name.strip().lower(): value.strip()
+                       for name, _, value in (line.partition(':') for line in request[1:] if line)}
+            url = urlsplit(target)
+            if url.path == '/ws' and headers.get('upgrade', '').lower() == 'websocket':
+                try:
+                    key = self._trace_params(url.query)
+                except ValueError as error:
+                    await self._respond(writer, '400 Bad Request', str(error))
+                    return
+                if 'sec-websocket-key' not in headers:
+                    await self._respond(writer, '400 Bad Request', 'Falta Sec-WebSocket-Key')
+                    return
+                accept = WebSocket.accept_key(headers['sec-websocket-key'])
+                writer.write(('HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n'
+                              f'Connection: Upgrade\r\nSec-WebSocket-Accept: {accept}\r\n\r\n').encode())
+                await writer.drain()
+                await self._viewer(WebSocket(reader, writer), key)
+            elif url.path == '/':
+                await self._respond(writer, '200 OK', _PAGE, 'text/html; charset=utf-8')
+            else:
+                await self._respond(writer, '404 Not Found', 'No encontrado')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host='127.0.0.1', port=8000, batch_size=64, window=8, max_size=10 ** 5):
+    server = AnimationServer(batch_size, window, max_size)
+    listener = await asyncio.start_server(server.handle, host, port)
+    print(f"Sirviendo en http://{host}:{port}/?algorithm=heap&size=200&seed=1")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m servicio.server',
+                                     description='Transmite las animaciones al navegador por WebSocket.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--batch-size', type=int, default=64, help='frames por lote como máximo')
+    parser.add_argument('--window', type=int, default=8,
+                        help='lotes que el algoritmo puede adelantarse al espectador más avanzado')
+    parser.add_argument('--max-size', type=int, default=10 ** 5, help='tamaño máximo de entrada aceptado')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.batch_size, args.window, args.max_size))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
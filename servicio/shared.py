@@ -0,0 +1,40 @@
+"""Arreglos de NumPy en memoria compartida para los modos con ``workers``.
+
+El proceso principal crea el bloque con ``shared_array`` y pasa a las tareas
+solo su descriptor ``(nombre, forma, dtype)``; cada proceso del pool lo abre
+con ``attach`` y trabaja sobre el mismo buffer, sin copiar los datos.
+"""
+
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Bloques abiertos en este proceso: mantenerlos vivos mantiene vivos sus buffers
+_attached = {}
+
+
+@contextmanager
+def shared_array(shape, dtype):
+    """Arreglo sin inicializar en memoria compartida y su descriptor."""
+    dtype = np.dtype(dtype)
+    size = max(1, int(np.prod(shape)) * dtype.itemsize)
+    block = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        yield np.ndarray(shape, dtype=dtype, buffer=block.buf), (block.name, shape, dtype.str)
+    finally:
+        block.close()
+        block.unlink()
+
+
+def attach(handle):
+    """Vista sobre el arreglo compartido de ``handle``, abierta una vez por proceso."""
+    name, shape, dtype = handle
+    block = _attached.get(name)
+    if block is None:
+        # El pool comparte el resource tracker del proceso principal, que es
+        # quien borra el bloque al salir de ``shared_array``
+        block = shared_memory.SharedMemory(name=name)
+        _attached[name] = block
+    return np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
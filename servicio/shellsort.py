@@ -0,0 +1,213 @@
+import numpy as np
+
+from . import instrument
+from .recorder import animate
+from .render import build_frames, render_animation
+
+# Desde este gap cada pasada ordena todas las cadenas arr[k::gap] a la vez con NumPy
+VECTOR_MIN_GAP = 64
+
+# Prefijo de Ciura (2001), obtenido empíricamente; se extiende multiplicando por 2.25
+CIURA_GAPS = [1, 4, 10, 23, 57, 132, 301, 701, 1750]
+
+def _shell_gaps(n):
+    gaps = []
+    gap = n // 2
+    while gap > 0:
+        gaps.append(gap)
+        gap //= 2
+    return gaps[::-1]
+
+def _ciura_gaps(n):
+    gaps = list(CIURA_GAPS)
+    while gaps[-1] * 9 // 4 < n:
+        gaps.append(gaps[-1] * 9 // 4)
+    return gaps
+
+def _tokuda_gaps(n):
+    # ceil((9^k - 4^k) / (5 * 4^(k-1)))
+    gaps = []
+    k = 1
+    while True:
+        gap = -(-(9 ** k - 4 ** k) // (5 * 4 ** (k - 1)))
+        if gap >= n and gaps:
+            return gaps
+        gaps.append(gap)
+        k += 1
+
+def _sedgewick_gaps(n):
+    # 1 y luego 4^k + 3 * 2^(k-1) + 1
+    gaps = [1]
+    k = 1
+    while 4 ** k + 3 * 2 ** (k - 1) + 1 < n:
+        gaps.append(4 ** k + 3 * 2 ** (k - 1) + 1)
+        k += 1
+    return gaps
+
+def _pratt_gaps(n):
+    # Todos los 2^p * 3^q menores que n: O(n log^2 n) pero con muchas pasadas
+    gaps = []
+    power_of_two = 1
+    while power_of_two < max(n, 2):
+        gap = power_of_two
+        while gap < max(n, 2):
+            gaps.append(gap)
+            gap *= 3
+        power_of_two *= 2
+    return sorted(gaps)
+
+GAP_SEQUENCES = {
+    'shell': _shell_gaps,
+    'ciura': _ciura_gaps,
+    'tokuda': _tokuda_gaps,
+    'sedgewick': _sedgewick_gaps,
+    'pratt': _pratt_gaps,
+}
+
+def gap_sequence(n, gaps='ciura'):
+    """Gaps a usar para ``n`` elementos, de mayor a menor.
+
+    ``gaps`` es el nombre de una secuencia de ``GAP_SEQUENCES`` o una lista propia.
+    """
+    if isinstance(gaps, str):
+        if gaps not in GAP_SEQUENCES:
+            raise ValueError(f"Secuencia de gaps desconocida: {gaps!r}")
+        gaps = GAP_SEQUENCES[gaps](n)
+    return sorted({gap for gap in gaps if 0 < gap < max(n, 2)}, reverse=True)
+
+def h_sort_vectorized(arr, gap):
+    # Ordenar cada cadena arr[k::gap] es exactamente el resultado de una pasada
+    # de inserción con ese gap: se ordenan todas como columnas de una matriz,
+    # rellenando la última fila con el valor máximo para que quede al final
+    n = len(arr)
+    rows = -(-n // gap)
+    padded = np.empty(rows * gap, dtype=arr.dtype)
+    padded[:n] = arr
+    padded[n:] = arr.max()
+    arr[:] = np.sort(padded.reshape(rows, gap), axis=0).reshape(-1)[:n]
+    # Las comparaciones de np.sort ocurren en C y no se cuentan
+    instrument.add(moves=2 * n, allocations=2, nbytes=2 * padded.nbytes)
+
+def h_sort(arr, gap):
+    # Pasada de inserción con gap, sin frames
+    shifts = stops = 0
+    for i in range(gap, len(arr)):
+        temp = arr[i]
+        j = i
+        while j >= gap and arr[j - gap] > temp:
+            arr[j] = arr[j - gap]
+            j -= gap
+            shifts += 1
+        stops += j >= gap
+        arr[j] = temp
+    instrument.add(shifts + stops, shifts + max(len(arr) - gap, 0))
+
+def h_sort_steps(arr, gap):
+    shifts = stops = 0
+    for i in range(gap, len(arr)):
+        temp = arr[i]
+        j = i
+        while j >= gap and arr[j - gap] > temp:
+            arr[j] = arr[j - gap]
+            j -= gap
+            shifts += 1
+            yield (j + gap,), dict(gap=gap, comparing=(j, j - gap), swapping=())
+        stops += j >= gap
+        arr[j] = temp
+        # Mostrar el estado después de la inserción
+        yield (j,), dict(gap=gap, comparing=(), swapping=(j, i))  # Resaltar el intercambio final
+    instrument.add(shifts + stops, shifts + max(len(arr) - gap, 0))
+
+def shell_sort_steps(arr, gaps='ciura'):
+    vectorize = isinstance(arr, np.ndarray)
+    for gap in gap_sequence(len(arr), gaps):
+        instrument.set_phase(f'gap {gap}')
+        if vectorize and gap >= VECTOR_MIN_GAP:
+            h_sort_vectorized(arr, gap)
+            yield slice(None), dict(gap=gap, comparing=(), swapping=())
+        else:
+            yield from h_sort_steps(arr, gap)
+
+def shell_sort_with_animation(arr, stream=False, gaps='ciura'):
+    return animate(shell_sort_steps(arr, gaps), stream, arr=arr)
+
+def shell_sort(arr, gaps='ciura'):
+    """Ordena en su lugar sin grabar frames.
+
+    Con arreglos de NumPy los gaps grandes se resuelven vectorizados y los
+    pequeños sobre una lista, porque indexar escalares de NumPy es lento.
+    """
+    sequence = gap_sequence(len(arr), gaps)
+    values = arr
+    if isinstance(arr, np.ndarray):
+        for gap in sequence:
+            if gap >= VECTOR_MIN_GAP:
+                instrument.set_phase(f'gap {gap}')
+                h_sort_vectorized(arr, gap)
+        values = instrument.allocated(arr.tolist())
+    for gap in sequence:
+        if values is arr or gap < VECTOR_MIN_GAP:
+            instrument.set_phase(f'gap {gap}')
+            h_sort(values, gap)
+    if values is not arr:
+        arr[:] = values
+    return arr
+
+def _bar_spec(arr, comparing=None, swapping=None):
+    colors = ['lightblue'] * len(arr)
+    if swapping:
+        for idx in swapping:
+            colors[idx] = 'lightpink'  # Rosa pastel para intercambio
+    elif comparing:
+        for idx in comparing:
+            colors[idx] = 'red'  # Rojo para comparación
+    return dict(
+        type='bar',
+        y=arr,
+        marker=dict(color=colors),
+        text=arr,
+        textposition='outside',
+        hoverinfo='text'
+    )
+
+def _frame_spec(frame):
+    return {'data': [_bar_spec(frame['arr'], frame['comparing'], frame['swapping'])]}
+
+def _figure(first, frames, workers):
+    fig_frames = build_frames(frames, _frame_spec, workers)
+
+    # Configurar el diseño (una sola celda, como make_subplots), los controles de
+    # animación y las anotaciones, con la del paso actual
+    layout = dict(
+        xaxis=dict(anchor='y', domain=[0.0, 1.0], range=[-1, len(first['arr'])]),
+        yaxis=dict(anchor='x', domain=[0.0, 1.0], range=[0, max(first['arr']) * 1.1]),
+        updatemenus=[dict(
+            type='buttons',
+            showactive=False,
+            buttons=[dict(label='Play',
+                          method='animate',
+                          args=[None, dict(frame=dict(duration=200, redraw=True),
+                                           fromcurrent=True,
+                                           mode='immediate')])]
+        )],
+        annotations=[
+            dict(text="Rojo: Comparación", x=0, y=1.05, xref="paper", yref="paper", showarrow=False),
+            dict(text="Rosa pastel: Intercambio", x=1, y=1.05, xref="paper", yref="paper", showarrow=False),
+            dict(
+                text="Paso: {frame_number}", x=0.5, y=-0.1, xref="paper", yref="paper", showarrow=False, 
+                font=dict(size=12, color="black"), align='center', name='step_annotation'
+            )
+        ]
+    )
+    return [_bar_spec(first['arr'])], layout, fig_frames
+
+def create_animation(frames, output_file='shell_sort_animation.html', auto_open=True,
+                     max_frames=None, sample='even', replay=False, workers=None):
+    render_animation(frames, output_file, 'Animación de Shell Sort', _figure, auto_open=auto_open,
+                     max_frames=max_frames, sample=sample, replay=replay, workers=workers)
+
+if __name__ == "__main__":
+    # Ejemplo de uso
+    arr = np.random.randint(1, 100, 20)
+    frames = shell_sort_with_animation(arr)
+    create_animation(frames)
@@ -0,0 +1,501 @@
+from collections import deque
+
+import numpy as np
+
+from . import instrument
+from .recorder import animate
+from .render import Peak, build_frames, labels, render_animation
+from .shared import attach, shared_array
+
+# Umbral inicial para entrar en modo galope, como en CPython (listsort.txt)
+MIN_GALLOP = 7
+
+def compute_min_run(n):
+    # Toma los 6 bits más altos de n y suma 1 si queda algún bit encendido:
+    # así n / min_run es una potencia de dos o queda justo por debajo
+    r = 0
+    while n >= 64:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+def count_run(arr, lo, hi):
+    """Longitud de la corrida natural que empieza en ``lo``.
+
+    Una corrida estrictamente descendente se invierte en su lugar.
+    """
+    if lo + 1 == hi:
+        return 1
+    n = 2
+    if arr[lo + 1] < arr[lo]:
+        while lo + n < hi and arr[lo + n] < arr[lo + n - 1]:
+            n += 1
+        arr[lo:lo + n] = arr[lo:lo + n][::-1]
+        instrument.add(n - 1 + (lo + n < hi), n)
+        yield slice(lo, lo + n), dict(stage='run', active=range(lo, lo + n), current=lo)
+    else:
+        while lo + n < hi and not arr[lo + n] < arr[lo + n - 1]:
+            n += 1
+        instrument.add(n - 1 + (lo + n < hi))
+    return n
+
+def insertion_sort(arr, left, right, start=None):
+    # Inserción binaria; arr[left:start] ya está ordenado
+    active = range(left, right + 1)
+    comparisons = moves = 0
+    for i in range(start or left + 1, right + 1):
+        key = arr[i]
+        lo, hi = left, i
+        while lo < hi:
+            mid = (lo + hi) // 2
+            comparisons += 1
+            if key < arr[mid]:
+                hi = mid
+            else:
+                lo = mid + 1
+        if lo < i:
+            arr[lo + 1:i + 1] = arr[lo:i]
+            arr[lo] = key
+            moves += i - lo + 1
+        yield slice(lo, i + 1), dict(stage='insertion', active=active, current=lo)
+    instrument.add(comparisons, moves)
+
+def gallop_left(key, a, start, n, hint):
+    # Devuelve k tal que a[start + k - 1] < key <= a[start + k]
+    last_ofs, ofs = 0, 1
+    comparisons = 1
+    if a[start + hint] < key:
+        max_ofs = n - hint
+        while ofs < max_ofs and a[start + hint + ofs] < key:
+            last_ofs, ofs = ofs, (ofs << 1) + 1
+            comparisons += 1
+        comparisons += ofs < max_ofs
+        ofs = min(ofs, max_ofs)
+        last_ofs, ofs = last_ofs + hint, ofs + hint
+    else:
+        max_ofs = hint + 1
+        while ofs < max_ofs and not a[start + hint - ofs] < key:
+            last_ofs, ofs = ofs, (ofs << 1) + 1
+            comparisons += 1
+        comparisons += ofs < max_ofs
+        ofs = min(ofs, max_ofs)
+        last_ofs, ofs = hint - ofs, hint - last_ofs
+    last_ofs += 1
+    while last_ofs < ofs:
+        m = last_ofs + ((ofs - last_ofs) >> 1)
+        comparisons += 1
+        if a[start + m] < key:
+            last_ofs = m + 1
+        else:
+            ofs = m
+    instrument.add(comparisons)
+    return ofs
+
+def gallop_right(key, a, start, n, hint):
+    # Devuelve k tal que a[start + k - 1] <= key < a[start + k]
+    last_ofs, ofs = 0, 1
+    comparisons = 1
+    if key < a[start + hint]:
+        max_ofs = hint + 1
+        while ofs < max_ofs and key < a[start + hint - ofs]:
+            last_ofs, ofs = ofs, (ofs << 1) + 1
+            comparisons += 1
+        comparisons += ofs < max_ofs
+        ofs = min(ofs, max_ofs)
+        last_ofs, ofs = hint - ofs, hint - last_ofs
+    else:
+        max_ofs = n - hint
+        while ofs < max_ofs and not key < a[start + hint + ofs]:
+            last_ofs, ofs = ofs, (ofs << 1) + 1
+            comparisons += 1
+        comparisons += ofs < max_ofs
+        ofs = min(ofs, max_ofs)
+        last_ofs, ofs = last_ofs + hint, ofs + hint
+    last_ofs += 1
+    while last_ofs < ofs:
+        m = last_ofs + ((ofs - last_ofs) >> 1)
+        comparisons += 1
+        if key < a[start + m]:
+            ofs = m
+        else:
+            last_ofs = m + 1
+    instrument.add(comparisons)
+    return ofs
+
+def merge_lo(arr, base_a, na, base_b, nb, min_gallop, active):
+    # Solo se copia la corrida izquierda, que es la menor; se mezcla hacia la derecha
+    tmp = instrument.allocated(arr[base_a:base_a + na].copy())
+    dest, pa, pb = base_a, 0, base_b
+    comparisons = 0
+
+    def step(changed):
+        return changed, dict(stage='merge', active=active, current=dest - 1)
+
+    # El primer elemento de B es el menor de todos (lo garantiza merge)
+    arr[dest] = arr[pb]
+    dest, pb, nb = dest + 1, pb + 1, nb - 1
+    yield step((dest - 1,))
+    while nb > 0 and na > 1:
+        acount = bcount = 0
+        # Mezcla uno a uno hasta que una corrida gane min_gallop veces seguidas
+        while nb > 0 and na > 1:
+            comparisons += 1
+            if arr[pb] < tmp[pa]:
+                arr[dest] = arr[pb]
+                dest, pb, nb = dest + 1, pb + 1, nb - 1
+                acount, bcount = 0, bcount + 1
+            else:
+                arr[dest] = tmp[pa]
+                dest, pa, na = dest + 1, pa + 1, na - 1
+                acount, bcount = acount + 1, 0
+            yield step((dest - 1,))
+            if acount >= min_gallop or bcount >= min_gallop:
+                break
+        else:
+            break
+
+        # Modo galope: se copian bloques enteros mientras compense
+        min_gallop += 1
+        while nb > 0 and na > 1:
+            min_gallop -= min_gallop > 1
+            acount = gallop_right(arr[pb], tmp, pa, na, 0)
+            if acount:
+                arr[dest:dest + acount] = tmp[pa:pa + acount]
+                dest, pa, na = dest + acount, pa + acount, na - acount
+                yield step(slice(dest - acount, dest))
+                if na <= 1:
+                    break
+            arr[dest] = arr[pb]
+            dest, pb, nb = dest + 1, pb + 1, nb - 1
+            yield step((dest - 1,))
+            if nb == 0:
+                break
+            bcount = gallop_left(tmp[pa], arr, pb, nb, 0)
+            if bcount:
+                arr[dest:dest + bcount] = arr[pb:pb + bcount]
+                dest, pb, nb = dest + bcount, pb + bcount, nb - bcount
+                yield step(slice(dest - bcount, dest))
+                if nb == 0:
+                    break
+            arr[dest] = tmp[pa]
+            dest, pa, na = dest + 1, pa + 1, na - 1
+            yield step((dest - 1,))
+            if acount < MIN_GALLOP and bcount < MIN_GALLOP:
+                # Salir del galope cuesta: se sube el umbral
+                min_gallop += 1
+                break
+
+    if nb > 0 and na == 1:
+        # Queda un solo elemento de A: va después de todo lo que resta de B
+        arr[dest:dest + nb] = arr[pb:pb + nb]
+        arr[dest + nb] = tmp[pa]
+        dest += nb + 1
+        yield step(slice(dest - nb - 1, dest))
+    elif na > 0:
+        arr[dest:dest + na] = tmp[pa:pa + na]
+        dest += na
+        yield step(slice(dest - na, dest))
+    instrument.add(comparisons)
+    return min_gallop
+
+def merge_hi(arr, base_a, na, base_b, nb, min_gallop, active):
+    # Solo se copia la corrida derecha, que es la menor; se mezcla hacia la izquierda
+    tmp = instrument.allocated(arr[base_b:base_b + nb].copy())
+    dest, pa, pb = base_b + nb - 1, base_a + na - 1, nb - 1
+    comparisons = 0
+
+    def step(changed):
+        return changed, dict(stage='merge', active=active, current=dest + 1)
+
+    # El último elemento de A es el mayor de todos (lo garantiza merge)
+    arr[dest] = arr[pa]
+    dest, pa, na = dest - 1, pa - 1, na - 1
+    yield step((dest + 1,))
+    while na > 0 and nb > 1:
+        acount = bcount = 0
+        while na > 0 and nb > 1:
+            comparisons += 1
+            if tmp[pb] < arr[pa]:
+                arr[dest] = arr[pa]
+                dest, pa, na = dest - 1, pa - 1, na - 1
+                acount, bcount = acount + 1, 0
+            else:
+                arr[dest] = tmp[pb]
+                dest, pb, nb = dest - 1, pb - 1, nb - 1
+                acount, bcount = 0, bcount + 1
+            yield step((dest + 1,))
+            if acount >= min_gallop or bcount >= min_gallop:
+                break
+        else:
+            break
+
+        min_gallop += 1
+        while na > 0 and nb > 1:
+            min_gallop -= min_gallop > 1
+            acount = na - gallop_right(tmp[pb], arr, base_a, na, na - 1)
+            if acount:
+                dest, pa, na = dest - acount, pa - acount, na - acount
+                arr[dest + 1:dest + 1 + acount] = arr[pa + 1:pa + 1 + acount]
+                yield step(slice(dest + 1, dest + 1 + acount))
+                if na == 0:
+                    break
+            arr[dest] = tmp[pb]
+            dest, pb, nb = dest - 1, pb - 1, nb - 1
+            yield step((dest + 1,))
+            if nb <= 1:
+                break
+            bcount = nb - gallop_left(arr[pa], tmp, 0, nb, nb - 1)
+            if bcount:
+                dest, pb, nb = dest - bcount, pb - bcount, nb - bcount
+                arr[dest + 1:dest + 1 + bcount] = tmp[pb + 1:pb + 1 + bcount]
+                yield step(slice(dest + 1, dest + 1 + bcount))
+                if nb <= 1:
+                    break
+            arr[dest] = arr[pa]
+            dest, pa, na = dest - 1, pa - 1, na - 1
+            yield step((dest + 1,))
+            if acount < MIN_GALLOP and bcount < MIN_GALLOP:
+                min_gallop += 1
+                break
+
+    if na > 0 and nb == 1:
+        # Queda un solo elemento de B: va antes de todo lo que resta de A
+        dest, pa = dest - na, pa - na
+        arr[dest + 1:dest + 1 + na] = arr[pa + 1:pa + 1 + na]
+        arr[dest] = tmp[pb]
+        yield step(slice(dest, dest + na + 1))
+    elif nb > 0:
+        arr[dest - nb + 1:dest + 1] = tmp[:nb]
+        dest -= nb
+        yield step(slice(dest + 1, dest + nb + 1))
+    instrument.add(comparisons)
+    return min_gallop
+
+def merge(arr, left, mid, right, min_gallop=MIN_GALLOP):
+    """Mezcla arr[left:mid+1] y arr[mid+1:right+1]; devuelve el nuevo min_gallop."""
+    active = range(left, right + 1)
+    base_a, na = left, mid - left + 1
+    base_b, nb = mid + 1, right - mid
+    # Los elementos de A menores que el primero de B ya están en su lugar,
+    # y los de B mayores que el último de A también
+    k = gallop_right(arr[base_b], arr, base_a, na, 0)
+    base_a, na = base_a + k, na - k
+    if na == 0:
+        return min_gallop
+    nb = gallop_left(arr[base_a + na - 1], arr, base_b, nb, nb - 1)
+    if nb == 0:
+        return min_gallop
+    # Cada elemento se escribe una vez en su lugar, más la copia de la corrida menor
+    instrument.add(moves=na + nb + min(na, nb))
+    if na <= nb:
+        return (yield from merge_lo(arr, base_a, na, base_b, nb, min_gallop, active))
+    return (yield from merge_hi(arr, base_a, na, base_b, nb, min_gallop, active))
+
+def merge_at(arr, runs, i, min_gallop):
+    # Mezcla las corridas i e i + 1 de la pila
+    (base_a, len_a), (base_b, len_b) = runs[i], runs[i + 1]
+    runs[i] = (base_a, len_a + len_b)
+    del runs[i + 1]
+    return (yield from merge(arr, base_a, base_b - 1, base_b + len_b - 1, min_gallop))
+
+def merge_collapse(arr, runs, min_gallop):
+    # Restablece los invariantes de la pila, con Z, Y, X las tres corridas del tope:
+    # |Z| > |Y| + |X| y |Y| > |X| (incluida la corrección de 2015 que mira 4 niveles)
+    while len(runs) > 1:
+        n = len(runs) - 2
+        if ((n > 0 and runs[n - 1][1] <= runs[n][1] + runs[n + 1][1]) or
+                (n > 1 and runs[n - 2][1] <= runs[n - 1][1] + runs[n][1])):
+            if runs[n - 1][1] < runs[n + 1][1]:
+                n -= 1
+        elif runs[n][1] > runs[n + 1][1]:
+            break
+        min_gallop = yield from merge_at(arr, runs, n, min_gallop)
+    return min_gallop
+
+def merge_force_collapse(arr, runs, min_gallop):
+    while len(runs) > 1:
+        n = len(runs) - 2
+        if n > 0 and runs[n - 1][1] < runs[n + 1][1]:
+            n -= 1
+        min_gallop = yield from merge_at(arr, runs, n, min_gallop)
+    return min_gallop
+
+def tim_sort_steps(arr, min_run=None):
+    n = len(arr)
+    yield (), dict(stage='initial', active=range(0))
+    if n < 2:
+        return
+    if min_run is None:
+        min_run = compute_min_run(n)
+    runs = []
+    min_gallop = MIN_GALLOP
+    lo = 0
+    while lo < n:
+        # Corrida natural; si es corta se extiende hasta min_run por inserción
+        instrument.set_phase('runs')
+        run = yield from count_run(arr, lo, n)
+        if run < min_run:
+            force = min(min_run, n - lo)
+            yield from insertion_sort(arr, lo, lo + force - 1, lo + run)
+            run = force
+        runs.append((lo, run))
+        instrument.set_phase('merge')
+        min_gallop = yield from merge_collapse(arr, runs, min_gallop)
+        lo += run
+    yield from merge_force_collapse(arr, runs, min_gallop)
+
+def tim_sort_with_animation(arr, stream=False, min_run=None):
+    return animate(tim_sort_steps(arr, min_run), stream, arr=arr)
+
+def tim_sort(arr, min_run=None, workers=None):
+    """Ordena en su lugar sin grabar frames.
+
+    Con ``workers`` el arreglo pasa a memoria compartida: cada proceso ordena
+    un tramo y los tramos se mezclan de a pares, repartiendo cada mezcla entre
+    los procesos cuando quedan menos pares que procesos. Una secuencia que no
+    es un arreglo pasa por ``np.asarray`` y, si no da un tipo numérico (que la
+    memoria compartida necesita), se ordena en este proceso.
+    """
+    if workers and workers >= 2 and len(arr) >= 2 * workers:
+        values = np.asarray(arr)
+        if values.dtype.kind in 'biuf':
+            _parallel_tim_sort(values, min_run, workers)
+            if values is not arr:
+                arr[:] = values.tolist()
+            return arr
+    deque(tim_sort_steps(arr, min_run), maxlen=0)
+    return arr
+
+def _sort_chunk(args):
+    handle, lo, hi, min_run = args
+    tim_sort(attach(handle)[lo:hi], min_run)
+
+def _merge_split(arr, lo, mid, hi, d):
+    # Cuántos elementos de arr[lo:mid] están entre los primeros ``d`` de la
+    # mezcla con arr[mid:hi]; en los empates va primero A, como en merge
+    left, right = max(0, d - (hi - mid)), min(d, mid - lo)
+    while left < right:
+        i = (left + right) // 2
+        if arr[lo + i] <= arr[mid + d - i - 1]:
+            left = i + 1
+        else:
+            right = i
+    return left
+
+def _merge_part(args):
+    # Copia src[a0:a1] y src[b0:b1] uno tras otro en dst[out:] y los mezcla ahí
+    src_handle, dst_handle, a0, a1, b0, b1, out = args
+    src, dst = attach(src_handle), attach(dst_handle)
+    na, nb = a1 - a0, b1 - b0
+    dst[out:out + na] = src[a0:a1]
+    dst[out + na:out + na + nb] = src[b0:b1]
+    if na and nb:
+        deque(merge(dst, out, out + na - 1, out + na + nb - 1), maxlen=0)
+
+def _merge_tasks(src, src_handle, dst_handle, runs, workers):
+    # Tareas de una ronda del árbol de mezclas y las corridas que resultan
+    pairs = [runs[i:i + 2] for i in range(0, len(runs), 2)]
+    parts = max(1, workers // len(pairs))
+    tasks, merged = [], []
+    for pair in pairs:
+        lo, mid = pair[0]
+        hi = pair[-1][1]
+        if len(pair) == 1:
+            tasks.append((src_handle, dst_handle, lo, mid, mid, mid, lo))
+        else:
+            cuts = [(hi - lo) * k // parts for k in range(parts + 1)]
+            splits = [(i, d - i) for d in cuts for i in [_merge_split(src, lo, mid, hi, d)]]
+            for (i0, j0), (i1, j1) in zip(splits, splits[1:]):
+                tasks.append((src_handle, dst_handle, lo + i0, lo + i1, mid + j0, mid + j1, lo + i0 + j0))
+        merged.append((lo, hi))
+    return tasks, merged
+
+def _parallel_tim_sort(arr, min_run, workers):
+    from concurrent.futures import ProcessPoolExecutor
+
+    n = len(arr)
+    bounds = np.linspace(0, n, workers + 1).astype(np.intp)
+    runs = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+    # Los procesos del pool no informan al contador: se registran aquí los
+    # movimientos de cada ronda
+    with shared_array(n, arr.dtype) as (src, src_handle), shared_array(n, arr.dtype) as (dst, dst_handle):
+        instrument.allocated(src)
+        instrument.allocated(dst)
+        src[:] = arr
+        with ProcessPoolExecutor(workers) as pool:
+            instrument.set_phase('runs')
+            list(pool.map(_sort_chunk, [(src_handle, lo, hi, min_run) for lo, hi in runs]))
+            instrument.set_phase('merge')
+            while len(runs) > 1:
+                tasks, runs = _merge_tasks(src, src_handle, dst_handle, runs, workers)
+                list(pool.map(_merge_part, tasks))
+                instrument.add(moves=2 * n)
+                src, src_handle, dst, dst_handle = dst, dst_handle, src, src_handle
+        arr[:] = src
+        del src, dst
+
+_COLORS = {
+    'default': 'rgb(0, 102, 204)',    # Strong Blue
+    'active': 'rgb(0, 204, 102)',     # Strong Green
+    'current': 'rgb(255, 105, 180)',  # Hot Pink
+    'merged': 'rgb(255, 165, 0)'      # Orange
+}
+
+# Las barras se colorean con índices chicos sobre una paleta fija
+_PALETTE = np.array(list(_COLORS.values()), dtype=object)
+_DEFAULT, _ACTIVE, _CURRENT, _MERGED = range(len(_PALETTE))
+
+def _bar_spec(frame):
+    index = np.full(len(frame['arr']), _DEFAULT, dtype=np.uint8)
+    active = frame['active']
+    active = slice(active.start, active.stop) if isinstance(active, range) else list(active)
+    index[active] = _MERGED if frame['stage'] == 'merge' else _ACTIVE
+    if 'current' in frame:
+        index[frame['current']] = _CURRENT
+
+    return dict(
+        type='bar',
+        y=frame['arr'],
+        marker=dict(color=_PALETTE[index].tolist()),
+        text=labels(frame['arr']),
+        textposition='outside',
+        hoverinfo='text'
+    )
+
+def _frame_spec(frame):
+    return {'data': [_bar_spec(frame)]}
+
+def _figure(first, frames, workers):
+    peak = Peak('arr')
+    fig_frames = build_frames(frames, _frame_spec, workers, observe=peak)
+
+    # Configurar el diseño (una sola celda con su título, como make_subplots) y
+    # los controles de animación
+    layout = dict(
+        xaxis=dict(anchor='y', domain=[0.0, 1.0]),
+        yaxis=dict(anchor='x', domain=[0.0, 1.0], range=[0, peak.value * 1.1]),
+        annotations=[dict(text='T', x=0.5, y=1.0, xref='paper', yref='paper', xanchor='center',
+                          yanchor='bottom', showarrow=False, font=dict(size=16))],
+        updatemenus=[dict(
+            type='buttons',
+            showactive=False,
+            buttons=[dict(label='Play',
+                          method='animate',
+                          args=[None, dict(frame=dict(duration=30, redraw=True),
+                                           fromcurrent=True,
+                                           mode='immediate')])]
+        )],
+        height=600
+    )
+    return [_bar_spec(first)], layout, fig_frames
+
+def create_animation(frames, output_file='tim_sort_animation.html', auto_open=True,
+                     max_frames=None, sample='even', replay=False, workers=None):
+    render_animation(frames, output_file, 'Animación de Tim Sort', _figure, auto_open=auto_open,
+                     max_frames=max_frames, sample=sample, replay=replay, workers=workers)
+
+if __name__ == "__main__":
+    # Ejemplo de uso
+    arr = np.random.randint(1, 100, 64)
+    frames = tim_sort_with_animation(arr)
+    create_animation(frames)
@@ -0,0 +1,263 @@
+"""Formato de archivo columnar para trazas grabadas.
+
+Un archivo ``.trace`` guarda un FrameRecorder como columnas de tipo fijo:
+
+- por canal, el log de deltas (índice, valor viejo, valor nuevo), el fin de
+  cada paso dentro del log y los keyframes como una matriz;
+- por clave de metadatos, una columna según el tipo de sus valores: ``enum``
+  (textos como ``stage``, guardados como códigos), ``int``, ``float``,
+  ``range`` (inicio, fin, paso) o ``ragged`` (tuplas de índices como
+  ``comparing``, en offsets + valores).
+
+La cabecera es JSON y los arreglos van a continuación, alineados a 64 bytes,
+así que ``load_trace`` los abre con ``np.memmap`` y un frame se reconstruye
+leyendo solo su keyframe y los deltas que le siguen.
+
+La vista de la traza se guarda por nombre y al cargar solo se acepta una de
+``VIEWS``: un archivo ajeno no puede hacer importar ni ejecutar otra cosa.
+"""
+
+import json
+from importlib import import_module
+
+import numpy as np
+
+from .recorder import FrameRecorder
+
+MAGIC = b'SRVTRACE'
+VERSION = 1
+ALIGN = 64
+
+# Marca de "sin valor" en las columnas enteras
+INT_NONE = np.iinfo(np.int64).min
+
+# Vistas que puede nombrar un archivo: nombre guardado -> (módulo, atributo)
+VIEWS = {
+    'servicio.bucketsort:_BucketView': ('bucketsort', '_BucketView'),
+    'servicio.countingsort:_counting_view': ('countingsort', '_counting_view'),
+}
+
+
+def _is_int(value):
+    return isinstance(value, (int, np.integer)) and not isinstance(value, (bool, np.bool_))
+
+
+def _kind(values):
+    # Tipo de columna para los valores presentes de una clave
+    present = [v for v in values if v is not None]
+    if all(isinstance(v, str) for v in present):
+        return 'enum'
+    if all(_is_int(v) for v in present):
+        return 'int'
+    if all(_is_int(v) or isinstance(v, (float, np.floating)) for v in present):
+        return 'float'
+    if len(present) == len(values):
+        if all(isinstance(v, range) for v in values):
+            return 'range'
+        if all(isinstance(v, (tuple, list)) and all(_is_int(x) for x in v) for v in values):
+            return 'ragged'
+    return 'json'
+
+
+def _encode_column(values):
+    kind = _kind(values)
+    if kind == 'enum':
+        names = sorted({v for v in values if v is not None})
+        codes = {name: i for i, name in enumerate(names)}
+        return kind, {'codes': np.array([codes.get(v, -1) for v in values], dtype=np.int16)}, names
+    if kind == 'json':
+        texts = [json.dumps(v) for v in values]
+        names = sorted(set(texts))
+        codes = {name: i for i, name in enumerate(names)}
+        return kind, {'codes': np.array([codes[t] for t in texts], dtype=np.int32)}, names
+    if kind == 'int':
+        return kind, {'values': np.array([INT_NONE if v is None else v for v in values], dtype=np.int64)}, None
+    if kind == 'float':
+        return kind, {'values': np.array([np.nan if v is None else v for v in values], dtype=np.float64)}, None
+    if kind == 'range':
+        return kind, {'values': np.array([(v.start, v.stop, v.step) for v in values],
+                                         dtype=np.int64).reshape(-1, 3)}, None
+    lengths = np.fromiter((len(v) for v in values), dtype=np.int64, count=len(values))
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    flat = np.fromiter((x for v in values for x in v), dtype=np.int64, count=int(offsets[-1]))
+    return kind, {'offsets': offsets, 'values': flat}, None
+
+
+class MetaColumns:
+    """Secuencia de dicts de metadatos leída de columnas, un paso a la vez."""
+
+    def __init__(self, length, keys):
+        self._length = length
+        # (clave, tipo, arreglos, nombres, presencia o None)
+        self._keys = keys
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        return (self[k] for k in range(self._length))
+
+    def __getitem__(self, k):
+        meta = {}
+        for key, kind, arrays, names, present in self._keys:
+            if present is not None and not present[k]:
+                continue
+            if kind in ('enum', 'json'):
+                code = int(arrays['codes'][k])
+                if kind == 'json':
+                    value = json.loads(names[code])
+                else:
+                    value = names[code] if code >= 0 else None
+            elif kind == 'int':
+                value = int(arrays['values'][k])
+                value = None if value == INT_NONE else value
+            elif kind == 'float':
+                value = float(arrays['values'][k])
+                value = None if np.isnan(value) else value
+            elif kind == 'range':
+                value = range(*(int(x) for x in arrays['values'][k]))
+            else:
+                offsets = arrays['offsets']
+                value = tuple(int(x) for x in arrays['values'][offsets[k]:offsets[k + 1]])
+            meta[key] = value
+        return meta
+
+
+def _view_name(view):
+    # Una función se guarda por nombre; una vista con estado, por su clase, y
+    # al cargar se crea una nueva
+    target = view if hasattr(view, '__qualname__') else type(view)
+    name = f'{target.__module__}:{target.__qualname__}'
+    if name not in VIEWS:
+        raise ValueError(f"Vista no registrada en tracefile.VIEWS: {name}")
+    return name
+
+
+def _load_view(name):
+    if name not in VIEWS:
+        raise ValueError(f"Vista desconocida en la traza: {name!r}")
+    module_name, attribute = VIEWS[name]
+    view = getattr(import_module(f'.{module_name}', __package__), attribute)
+    if isinstance(view, type):
+        # Vista con estado: cada traza cargada lleva una propia
+        view = view()
+    return view
+
+
+def save_trace(recorder, path):
+    """Escribe ``recorder`` en ``path`` (una ruta o un archivo binario abierto)."""
+    if hasattr(path, 'write'):
+        _write(recorder, path)
+        return path
+    with open(path, 'wb') as f:
+        _write(recorder, f)
+    return path
+
+
+def _write(recorder, f):
+    arrays = {}
+    channels = {}
+    for name in recorder._names:
+        idx, old, new, ends = recorder.deltas(name)
+        arrays[f'log/{name}/idx'] = idx
+        arrays[f'log/{name}/old'] = old
+        arrays[f'log/{name}/new'] = new
+        arrays[f'log/{name}/ends'] = ends
+        arrays[f'key/{name}'] = np.stack([state[name] for state in recorder._key_states])
+        channels[name] = {'lo': np.asarray(recorder.min(name)).item(),
+                          'hi': np.asarray(recorder.max(name)).item()}
+    arrays['key_steps'] = np.array(recorder._key_steps, dtype=np.int64)
+
+    metas = list(recorder._meta)
+    keys = []
+    for key in dict.fromkeys(k for meta in metas for k in meta):
+        values = [meta.get(key) for meta in metas]
+        kind, columns, names = _encode_column(values)
+        present = [key in meta for meta in metas]
+        if not all(present):
+            arrays[f'meta/{key}/present'] = np.array(present, dtype=np.bool_)
+        for column, values in columns.items():
+            arrays[f'meta/{key}/{column}'] = values
+        keys.append({'key': key, 'kind': kind, 'names': names, 'partial': not all(present)})
+
+    view = recorder._view
+    header = {
+        'version': VERSION,
+        'steps': len(metas),
+        'channels': channels,
+        'meta': keys,
+        'view': _view_name(view) if view is not None else None,
+        'arrays': {},
+    }
+    # Desplazamientos relativos al fin de la cabecera, que se conoce recién al final
+    offset = 0
+    for name, values in arrays.items():
+        values = np.ascontiguousarray(values)
+        arrays[name] = values
+        header['arrays'][name] = [offset, values.dtype.str, list(values.shape)]
+        offset += -(-values.nbytes // ALIGN) * ALIGN
+    encoded = json.dumps(header).encode()
+    start = -(-(len(MAGIC) + 8 + len(encoded)) // ALIGN) * ALIGN
+    f.write(MAGIC)
+    f.write(np.uint64(len(encoded)).tobytes())
+    f.write(encoded)
+    for name, values in arrays.items():
+        f.write(bytes(start + header['arrays'][name][0] - f.tell()))
+        f.write(values.tobytes())
+    f.write(bytes(start + offset - f.tell()))
+
+
+def load_trace(path):
+    """Abre un archivo de ``save_trace`` como un FrameRecorder de solo lectura.
+
+    Las columnas quedan mapeadas en memoria: abrir el archivo no lo lee entero.
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} no es un archivo de traza")
+        size = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+        header = json.loads(f.read(size))
+    if header['version'] != VERSION:
+        raise ValueError(f"Versión de traza no soportada: {header['version']}")
+    start = -(-(len(MAGIC) + 8 + size) // ALIGN) * ALIGN
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+
+    def column(name):
+        offset, dtype, shape = header['arrays'][name]
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape))
+        return data[start + offset:start + offset + count * dtype.itemsize].view(dtype).reshape(shape)
+
+    recorder = FrameRecorder.__new__(FrameRecorder)
+    recorder._names = list(header['channels'])
+    recorder._live = None
+    recorder._state = None
+    recorder._log = {}
+    recorder._ends = {}
+    recorder._lo = {}
+    recorder._hi = {}
+    keys = {}
+    for name, info in header['channels'].items():
+        old = column(f'log/{name}/old')
+        recorder._log[name] = (column(f'log/{name}/idx'), old, column(f'log/{name}/new'), old.dtype)
+        recorder._ends[name] = column(f'log/{name}/ends')
+        recorder._lo[name], recorder._hi[name] = info['lo'], info['hi']
+        keys[name] = column(f'key/{name}')
+    recorder._key_steps = column('key_steps').tolist()
+    recorder._key_states = [{name: keys[name][i] for name in recorder._names}
+                            for i in range(len(recorder._key_steps))]
+    recorder._initial = recorder._key_states[0]
+
+    meta_keys = []
+    for info in header['meta']:
+        key, kind = info['key'], info['kind']
+        prefix = f'meta/{key}/'
+        arrays = {name[len(prefix):]: column(name) for name in header['arrays']
+                  if name.startswith(prefix) and name != prefix + 'present'}
+        present = column(prefix + 'present') if info['partial'] else None
+        meta_keys.append((key, kind, arrays, info['names'], present))
+    recorder._meta = MetaColumns(header['steps'], meta_keys)
+
+    view = header['view']
+    recorder._view = _load_view(view) if view is not None else None
+    return recorder
@@ -0,0 +1,62 @@
+import json
+
+import numpy as np
+import pytest
+
+from servicio.batch import job_input, load_manifest, main, run_batch
+
+JOBS = [
+    {'algorithm': 'heap', 'seed': 1, 'size': 20, 'params': {'d': 3}},
+    {'algorithm': 'tim', 'array': [5, 3, 9, 1], 'render': {'max_frames': 10}},
+    # Falla al grabar la traza, sin detener al resto
+    {'algorithm': 'shell', 'seed': 2, 'params': {'bogus': 1}},
+]
+
+
+def _jobs(tmp_path):
+    return [dict(job, output=str(tmp_path / f'{k}.html')) for k, job in enumerate(JOBS)]
+
+
+def test_load_manifest_list_and_lines(tmp_path):
+    (tmp_path / 'list.json').write_text(json.dumps(JOBS))
+    (tmp_path / 'lines.json').write_text('\n'.join(json.dumps(job) for job in JOBS) + '\n\n')
+    assert load_manifest(tmp_path / 'list.json') == JOBS
+    assert load_manifest(tmp_path / 'lines.json') == JOBS
+
+
+def test_job_input():
+    assert job_input({'algorithm': 'tim', 'array': [5, 3]}).tolist() == [5, 3]
+    seeded = job_input({'algorithm': 'heap', 'seed': 4, 'size': 7, 'max_value': 10})
+    assert np.array_equal(seeded, job_input({'algorithm': 'heap', 'seed': 4, 'size': 7, 'max_value': 10}))
+    assert seeded.size == 7 and seeded.max() < 10
+
+
+def test_run_batch(tmp_path):
+    (tmp_path / 'traces').mkdir()
+    rows = run_batch(_jobs(tmp_path), sort_workers=2, render_workers=1, max_pending=1,
+                     trace_dir=tmp_path / 'traces')
+    assert [row['status'] for row in rows[:2]] == ['ok', 'ok']
+    assert rows[2]['status'].startswith('TypeError')
+    assert rows[0]['n'] == 20 and rows[1]['n'] == 4
+    assert all(row['frames'] > 0 and row['render_seconds'] >= 0 for row in rows[:2])
+    assert (tmp_path / '0.html').exists() and (tmp_path / '1.html').exists()
+    assert not (tmp_path / '2.html').exists()
+    # Las trazas intermedias no quedan en disco
+    assert list((tmp_path / 'traces').iterdir()) == []
+
+
+def test_run_batch_rejects_unknown_algorithm(tmp_path):
+    with pytest.raises(ValueError):
+        run_batch([{'algorithm': 'bogo'}], sort_workers=1, trace_dir=tmp_path)
+
+
+def test_main_report_and_exit_status(tmp_path, capsys):
+    (tmp_path / 'manifest.json').write_text(json.dumps(_jobs(tmp_path)[:2]))
+    main([str(tmp_path / 'manifest.json'), '--sort-workers', '1', '--report', str(tmp_path / 'report.json')])
+    report = json.loads((tmp_path / 'report.json').read_text())
+    assert [row['status'] for row in report['jobs']] == ['ok', 'ok']
+    assert '2/2 trabajos' in capsys.readouterr().out
+
+    (tmp_path / 'manifest.json').write_text(json.dumps(_jobs(tmp_path)))
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / 'manifest.json'), '--sort-workers', '1'])
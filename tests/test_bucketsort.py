@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from servicio import bucket_sort, bucket_sort_with_animation, load_trace, save_trace
+from servicio.bucketsort import bucket_indices
+
+DTYPES = [np.int16, np.int64, np.uint32, np.float32, np.float64]
+
+
+@pytest.mark.parametrize('strategy', ['quantile', 'uniform'])
+@pytest.mark.parametrize('dtype', DTYPES)
+def test_bucket_sort_dtypes(dtype, strategy):
+    arr = (np.random.default_rng(0).standard_normal(5000) * 1000).astype(dtype)
+    result = bucket_sort(arr, num_buckets=16, strategy=strategy)
+    assert result.dtype == arr.dtype
+    assert np.array_equal(result, np.sort(arr))
+
+
+@pytest.mark.parametrize('dtype', [np.int8, np.float16])
+def test_uniform_buckets_do_not_overflow(dtype):
+    arr = np.array([-100, 100, 0, 50, -50], dtype=dtype)
+    if dtype == np.float16:
+        arr = arr * 600
+    assert np.array_equal(bucket_sort(arr, num_buckets=3), np.sort(arr))
+    final = list(bucket_sort_with_animation(arr, num_buckets=3))[-1]
+    assert np.array_equal(final['arr'], np.sort(arr))
+
+
+def test_bucket_sort_skewed():
+    rng = np.random.default_rng(2)
+    arr = np.concatenate([np.full(3000, 7), rng.zipf(1.5, 3000) % 100000])
+    assert np.array_equal(bucket_sort(arr), np.sort(arr))
+    assert np.array_equal(bucket_sort(arr, num_buckets=10, strategy='uniform'), np.sort(arr))
+
+
+def test_quantile_buckets_isolate_repeated_values():
+    arr = np.concatenate([np.full(900, 5), np.arange(100)])
+    indices, count = bucket_indices(arr, 8, 'quantile')
+    # Todas las copias del valor repetido caen en un mismo bucket, sin otros valores
+    bucket = indices[0]
+    assert np.all(indices[:900] == bucket)
+    assert set(arr[indices == bucket].tolist()) == {5}
+    assert indices.max() < count
+
+
+def test_bucket_sort_workers():
+    arr = np.random.default_rng(3).integers(-10 ** 6, 10 ** 6, 20000)
+    assert np.array_equal(bucket_sort(arr, workers=2), np.sort(arr))
+
+
+def test_bucket_sort_small_inputs():
+    for arr in (np.array([], dtype=np.int64), np.array([3]), np.array([2, 2, 2])):
+        assert np.array_equal(bucket_sort(arr), np.sort(arr))
+
+
+def test_bucket_views_are_per_trace():
+    rng = np.random.default_rng(0)
+    first = bucket_sort_with_animation(rng.integers(1, 100, 30))
+    second = bucket_sort_with_animation(rng.integers(1, 100, 30))
+    alone = [frame['buckets'] for frame in first]
+    # Leer las dos trazas intercaladas no mezcla sus buckets
+    interleaved = [(a['buckets'], b['buckets']) for a, b in zip(first, second)]
+    assert [a for a, _ in interleaved] == alone[:len(interleaved)]
+    assert [b for _, b in interleaved] == [frame['buckets'] for frame in second][:len(interleaved)]
+
+
+def test_bucket_view_stream_and_loaded_trace(tmp_path):
+    arr = np.random.default_rng(1).integers(1, 100, 40)
+    recorded = [frame['buckets'] for frame in bucket_sort_with_animation(arr)]
+    streamed = [frame['buckets'] for frame in bucket_sort_with_animation(arr, stream=True)]
+    assert streamed == recorded
+    save_trace(bucket_sort_with_animation(arr), tmp_path / 'bucket.trace')
+    assert [frame['buckets'] for frame in load_trace(tmp_path / 'bucket.trace')] == recorded
+    final = recorded[-1]
+    assert sorted(value for bucket in final for value in bucket) == sorted(arr.tolist())
@@ -0,0 +1,81 @@
+import os
+
+import numpy as np
+
+from servicio import heapsort
+from servicio.cache import TraceCache, cached_animation
+
+
+def test_trace_keys(tmp_path):
+    cache = TraceCache(tmp_path)
+    arr = np.array([3, 1, 2])
+    keys = {
+        cache.trace_key('heap', arr),
+        cache.trace_key('heap', arr.astype(np.int32)),
+        cache.trace_key('heap', arr, d=3),
+        cache.trace_key('shell', arr),
+    }
+    # La entrada, su dtype, el algoritmo y los parámetros cambian la clave
+    assert len(keys) == 4
+    assert cache.trace_key('heap', [3, 1, 2]) == cache.trace_key('heap', arr)
+    key = cache.trace_key('heap', arr)
+    assert cache.html_key(key, max_frames=10) != cache.html_key(key)
+
+
+def test_trace_round_trip(tmp_path):
+    cache = TraceCache(tmp_path)
+    recorder = heapsort.heap_sort_with_animation(np.random.default_rng(0).integers(1, 50, 30))
+    key = cache.trace_key('heap', recorder.initial())
+    assert cache.get_trace(key) is None
+    cache.put_trace(key, recorder)
+    loaded = cache.get_trace(key)
+    assert len(loaded) == len(recorder)
+    assert np.array_equal(loaded[-1]['arr'], recorder[-1]['arr'])
+    # Solo queda el archivo final, sin temporales
+    assert os.listdir(tmp_path) == [key + '.trace']
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = TraceCache(tmp_path)
+    source = tmp_path / 'source'
+    source.write_bytes(b'x' * 100)
+    for k, name in enumerate(('a', 'b', 'c')):
+        cache.put_html(name, source)
+        os.utime(tmp_path / f'{name}.html', (k, k))
+    source.unlink()
+    # Usar 'a' la vuelve la más nueva
+    assert cache.get_html('a') is not None
+    cache.max_bytes = 250
+    cache.evict()
+    assert cache.get_html('b') is None
+    assert cache.get_html('a') is not None and cache.get_html('c') is not None
+    assert cache.nbytes == 200
+    cache.clear()
+    assert cache.entries() == []
+
+
+def test_cached_animation_skips_sort_and_render(tmp_path, monkeypatch):
+    calls = []
+    record = heapsort.heap_sort_with_animation
+
+    def counted(arr, **params):
+        calls.append(params)
+        return record(arr, **params)
+
+    monkeypatch.setattr(heapsort, 'heap_sort_with_animation', counted)
+    cache = TraceCache(tmp_path / 'cache')
+    arr = np.random.default_rng(1).integers(1, 50, 20)
+    run = dict(cache=cache, auto_open=False, params={'d': 3}, max_frames=15)
+
+    first = cached_animation(heapsort, 'heap_sort_with_animation', arr, tmp_path / 'first.html', **run)
+    second = cached_animation(heapsort, 'heap_sort_with_animation', arr, tmp_path / 'second.html', **run)
+    assert calls == [{'d': 3}]
+    assert second.read_bytes() == first.read_bytes()
+
+    # Sin el HTML, se renderiza desde la traza guardada sin volver a ordenar
+    for entry in cache.entries():
+        if entry[2].endswith('.html'):
+            os.unlink(entry[2])
+    cached_animation(heapsort, 'heap_sort_with_animation', arr, tmp_path / 'third.html', **run)
+    assert calls == [{'d': 3}]
+    assert (tmp_path / 'third.html').exists()
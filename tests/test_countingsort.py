@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from servicio import counting_argsort, counting_sort, counting_sort_with_animation
+
+DTYPES = [np.int8, np.int16, np.int32, np.int64, np.uint8, np.uint16, np.uint32, np.uint64]
+
+
+def _random(dtype, n=1000, seed=0):
+    info = np.iinfo(dtype)
+    rng = np.random.default_rng(seed)
+    return rng.integers(max(info.min, -1000), min(info.max, 1000), n, endpoint=True).astype(dtype)
+
+
+@pytest.mark.parametrize('dtype', DTYPES)
+def test_counting_sort_dtypes(dtype):
+    arr = _random(dtype)
+    result = counting_sort(arr)
+    assert result.dtype == arr.dtype
+    assert np.array_equal(result, np.sort(arr))
+
+
+@pytest.mark.parametrize('dtype', DTYPES)
+def test_counting_argsort_dtypes(dtype):
+    arr = _random(dtype)
+    assert np.array_equal(counting_argsort(arr), np.argsort(arr, kind='stable'))
+
+
+@pytest.mark.parametrize('dtype', [np.int8, np.int16])
+def test_counting_sort_full_range(dtype):
+    info = np.iinfo(dtype)
+    arr = np.array([info.max, info.min, 5, -3, info.min], dtype=dtype)
+    assert np.array_equal(counting_sort(arr), np.sort(arr))
+    assert np.array_equal(counting_argsort(arr), np.argsort(arr, kind='stable'))
+
+
+def test_counting_sort_wide_range_falls_back_to_radix():
+    arr = np.array([2**40, -2**40, 7, 0, 7], dtype=np.int64)
+    assert np.array_equal(counting_sort(arr), np.sort(arr))
+
+
+def test_counting_sort_rejects_floats():
+    with pytest.raises(TypeError):
+        counting_sort(np.array([1.5, 0.5]))
+
+
+@pytest.mark.parametrize('stages_only', [False, True])
+def test_counting_sort_with_animation_narrow(stages_only):
+    arr = np.array([-100, 100, 5, -100], dtype=np.int8)
+    frames = list(counting_sort_with_animation(arr, stages_only=stages_only))
+    assert np.array_equal(frames[-1]['output'], np.sort(arr))
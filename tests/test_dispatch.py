@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from servicio import dispatch, sort
+
+DTYPES = [np.int8, np.int16, np.int32, np.int64, np.uint8, np.uint16, np.uint64,
+          np.float16, np.float32, np.float64]
+
+
+@pytest.mark.parametrize('dtype', DTYPES)
+def test_sort_dtypes(dtype):
+    rng = np.random.default_rng(0)
+    arr = rng.integers(-128, 128, 1000).astype(dtype)
+    result = sort(arr)
+    assert result.dtype == arr.dtype
+    assert np.array_equal(result, np.sort(arr))
+
+
+@pytest.mark.parametrize('make', [
+    lambda rng: rng.integers(0, 1 << 40, 5000),            # radix
+    lambda rng: rng.integers(0, 50, 5000),                 # counting
+    lambda rng: np.repeat(rng.integers(0, 1 << 40, 50), 100),  # buckets con repetidos
+    lambda rng: np.arange(5000)[::-1].copy(),              # invertido
+    lambda rng: rng.standard_normal(5000),
+])
+def test_sort_inputs(make):
+    arr = make(np.random.default_rng(1))
+    assert np.array_equal(sort(arr), np.sort(arr))
+
+
+def test_msd_radix_sort():
+    arr = np.random.default_rng(2).integers(-1 << 50, 1 << 50, 3000)
+    assert np.array_equal(dispatch.msd_radix_sort(arr), np.sort(arr))
+
+
+def test_thresholds_are_read_once(monkeypatch):
+    calls = []
+
+    def load(path=None):
+        calls.append(path)
+        return dict(dispatch.DEFAULT_THRESHOLDS)
+
+    monkeypatch.setattr(dispatch, '_thresholds', None)
+    monkeypatch.setattr(dispatch, 'load_thresholds', load)
+    arr = np.random.default_rng(3).integers(0, 1000, 200)
+    sort(arr)
+    sort(arr)
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize('dtype', [np.float16, np.float32, np.float64])
+@pytest.mark.parametrize('n', [5, 50, 5000])
+def test_sort_with_nan(dtype, n):
+    arr = np.random.default_rng(4).standard_normal(n).astype(dtype)
+    arr[::3] = np.nan
+    assert np.array_equal(sort(arr), np.sort(arr), equal_nan=True)
+
+
+def test_sort_all_nan():
+    arr = np.full(10, np.nan)
+    assert np.isnan(sort(arr)).all()
+
+
+def _hybrid_thresholds(**changes):
+    return dict(dispatch.DEFAULT_THRESHOLDS, **changes)
+
+
+def test_hybrids_are_reachable():
+    rng = np.random.default_rng(5)
+    duplicated = np.repeat(rng.integers(0, 1 << 40, 50), 100)
+    stats = dispatch.profile(duplicated)
+    assert dispatch.choose(stats, dispatch.DEFAULT_THRESHOLDS) == 'radix'
+    enabled = _hybrid_thresholds(duplicates=0.5)
+    assert dispatch.choose(stats, enabled) == 'bucket'
+    assert np.array_equal(sort(duplicated, enabled), np.sort(duplicated))
+
+    wide = rng.integers(-1 << 60, 1 << 60, 3000)
+    enabled = _hybrid_thresholds(msd_max_n=10 ** 4)
+    assert dispatch.choose(dispatch.profile(wide), enabled) == 'msd_radix'
+    assert np.array_equal(sort(wide, enabled), np.sort(wide))
+
+
+def test_hybrid_depth_falls_back_to_heap():
+    arr = np.repeat(np.random.default_rng(6).integers(0, 1 << 40, 200), 20)
+    thresholds = _hybrid_thresholds(duplicates=0.0, max_depth=0)
+    assert np.array_equal(sort(arr, thresholds), np.sort(arr))
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from servicio import external_sort, external_sort_with_animation, tim_sort
+
+
+def _random(dtype, n=5000, seed=0):
+    return (np.random.default_rng(seed).standard_normal(n) * 10000).astype(dtype)
+
+
+@pytest.mark.parametrize('dtype', [np.int64, np.float64, np.int16])
+def test_external_sort_array(tmp_path, dtype):
+    arr = _random(dtype)
+    output = tmp_path / 'sorted.bin'
+    external_sort(arr, str(output), dtype=dtype, chunk_size=700, buffer_size=64, fan_in=3,
+                  directory=str(tmp_path))
+    assert np.array_equal(np.fromfile(output, dtype=dtype), np.sort(arr))
+
+
+def test_external_sort_file_with_timsort(tmp_path):
+    arr = _random(np.int32)
+    source = tmp_path / 'input.bin'
+    arr.tofile(source)
+    output = tmp_path / 'sorted.bin'
+    external_sort(str(source), str(output), dtype=np.int32, chunk_size=1000, buffer_size=100,
+                  engine=lambda chunk: tim_sort(np.array(chunk)), directory=str(tmp_path))
+    assert np.array_equal(np.fromfile(output, dtype=np.int32), np.sort(arr))
+    # Las corridas temporales no quedan en el directorio
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['input.bin', 'sorted.bin']
+
+
+def test_external_sort_empty(tmp_path):
+    output = tmp_path / 'sorted.bin'
+    external_sort(np.array([], dtype=np.int64), str(output), directory=str(tmp_path))
+    assert np.fromfile(output, dtype=np.int64).size == 0
+
+
+def test_external_sort_with_animation():
+    arr = np.random.default_rng(1).integers(0, 1000, 64)
+    expected = np.sort(arr)
+    frames = external_sort_with_animation(arr)
+    assert np.array_equal(arr, expected)
+    assert len(frames) > 1
+    assert frames[-1]['remaining'].sum() == 0
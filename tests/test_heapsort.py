@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from servicio import heap_sort, heap_sort_with_animation, sift_down
+
+DTYPES = [np.int8, np.int16, np.int64, np.uint32, np.float32, np.float64]
+
+
+@pytest.mark.parametrize('d', [2, 3, 4])
+@pytest.mark.parametrize('dtype', DTYPES)
+def test_heap_sort_dtypes(dtype, d):
+    arr = (np.random.default_rng(0).standard_normal(2000) * 100).astype(dtype)
+    result = heap_sort(arr.copy(), d)
+    assert result.dtype == arr.dtype
+    assert np.array_equal(result, np.sort(arr))
+
+
+@pytest.mark.parametrize('d', [2, 3, 4])
+def test_heap_sort_lists_and_small_inputs(d):
+    for values in ([], [1], [2, 2, 2], [2, 1], [5, 3, 9, 1, 5, 0]):
+        assert heap_sort(list(values), d) == sorted(values)
+
+
+@pytest.mark.parametrize('d', [2, 3, 4])
+def test_sift_down_builds_a_heap(d):
+    values = np.random.default_rng(1).integers(0, 100, 200).tolist()
+    n = len(values)
+    for i in range((n - 2) // d, -1, -1):
+        sift_down(values, n, i, d)
+    assert all(values[(i - 1) // d] >= values[i] for i in range(1, n))
+
+
+@pytest.mark.parametrize('d', [2, 4])
+def test_heap_sort_with_animation(d):
+    arr = np.random.default_rng(2).integers(0, 100, 40)
+    frames = heap_sort_with_animation(arr.copy(), d=d)
+    assert np.array_equal(frames[-1]['arr'], np.sort(arr))
+    assert {frames.metadata(k)['stage'] for k in range(len(frames))} >= {'initial', 'heapify', 'extract'}
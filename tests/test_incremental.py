@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from servicio import IncrementalHeap, SortedArray, counting
+
+
+def _is_heap(values, d):
+    return all(values[(i - 1) // d] >= values[i] for i in range(1, len(values)))
+
+
+def _edits(seed, n=500, rounds=20):
+    # Entradas sucesivas que cambian en pocas posiciones, crecen y se acortan
+    rng = np.random.default_rng(seed)
+    current = rng.integers(-1000, 1000, n)
+    inputs = [current]
+    for r in range(rounds):
+        current = current.copy()
+        positions = rng.integers(0, len(current), 5)
+        current[positions] = rng.integers(-1000, 1000, 5)
+        if r % 3 == 0:
+            current = np.concatenate([current, rng.integers(-1000, 1000, 10)])
+        elif r % 3 == 1:
+            current = current[:-3]
+        inputs.append(current)
+    return inputs
+
+
+def test_sorted_array_updates():
+    inputs = _edits(0)
+    container = SortedArray(inputs[0])
+    for current in inputs[1:]:
+        container.update(current)
+        assert np.array_equal(container.values, np.sort(current))
+
+
+@pytest.mark.parametrize('d', [2, 3, 4])
+def test_incremental_heap_updates(d):
+    inputs = _edits(1)
+    heap = IncrementalHeap(inputs[0], d=d)
+    for current in inputs[1:]:
+        heap.update(current)
+        assert _is_heap(heap.values.tolist(), d)
+        assert heap.top() == current.max()
+        assert np.array_equal(heap.sorted(), np.sort(current))
+
+
+def test_small_update_costs_less_than_rebuild():
+    inputs = _edits(2, n=5000, rounds=1)
+    container = SortedArray(inputs[0])
+    with counting() as ops:
+        container.update(inputs[1])
+    assert ops.totals()['comparisons'] < len(inputs[1])
+    assert np.array_equal(container.values, np.sort(inputs[1]))
+
+
+def test_large_change_rebuilds():
+    rng = np.random.default_rng(3)
+    container = SortedArray(rng.integers(0, 100, 200))
+    replacement = rng.integers(0, 100, 200)
+    container.update(replacement)
+    assert np.array_equal(container.values, np.sort(replacement))
+
+
+@pytest.mark.parametrize('cls', [SortedArray, IncrementalHeap])
+def test_extend_replace_remove(cls):
+    container = cls([5, 1, 4])
+    container.extend([3, 9, 0])
+    container.replace(4, 7)
+    container.remove(1)
+    expected = [0, 3, 5, 7, 9]
+    result = container.values if cls is SortedArray else container.sorted()
+    assert result.tolist() == expected
+    assert len(container) == len(expected)
+    with pytest.raises(ValueError):
+        container.remove(42)
+
+
+@pytest.mark.parametrize('cls', [SortedArray, IncrementalHeap])
+def test_update_with_animation_ends_in_state(cls):
+    inputs = _edits(4, n=50, rounds=1)
+    container = cls(inputs[0])
+    frames = list(container.update_with_animation(inputs[1]))
+    assert frames
+    assert np.array_equal(frames[-1]['arr'][:len(container)], container.values)
+
+
+def test_values_are_read_only():
+    container = SortedArray([3, 1, 2])
+    with pytest.raises(ValueError):
+        container.values[0] = 10
@@ -0,0 +1,113 @@
+import functools
+
+import numpy as np
+import pytest
+
+from servicio import OpCounter, counting, heap_sort, heap_sort_with_animation, shell_sort, tim_sort
+
+N = 1000
+
+
+@functools.total_ordering
+class Key:
+    """Entero que cuenta cuántas veces se lo compara."""
+
+    calls = 0
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        Key.calls += 1
+        return self.value == other.value
+
+    def __lt__(self, other):
+        Key.calls += 1
+        return self.value < other.value
+
+    def __gt__(self, other):
+        Key.calls += 1
+        return self.value > other.value
+
+
+def _inputs():
+    permutation = np.random.default_rng(0).permutation(N).tolist()
+    return {'random': permutation, 'sorted': sorted(permutation),
+            'reversed': sorted(permutation, reverse=True)}
+
+
+def _counted(sort, values, **kwargs):
+    # Comparaciones informadas y comparaciones que realmente ocurrieron
+    Key.calls = 0
+    with counting() as ops:
+        sort([Key(v) for v in values], **kwargs)
+    return ops.totals()['comparisons'], Key.calls
+
+
+SORTS = [
+    ('heap2', heap_sort, {'d': 2}),
+    ('heap3', heap_sort, {'d': 3}),
+    ('heap4', heap_sort, {'d': 4}),
+    ('tim', tim_sort, {}),
+    ('shell', shell_sort, {}),
+]
+
+
+@pytest.mark.parametrize('name, sort, kwargs', SORTS, ids=[s[0] for s in SORTS])
+@pytest.mark.parametrize('shape', ['random', 'sorted', 'reversed'])
+def test_reported_comparisons_are_exact(name, sort, kwargs, shape):
+    reported, actual = _counted(sort, _inputs()[shape], **kwargs)
+    assert reported == actual
+
+
+@pytest.mark.parametrize('d', [2, 3, 4])
+def test_heap_comparisons(d):
+    arr = np.random.default_rng(0).permutation(N)
+    with counting() as ops:
+        heap_sort(arr.copy(), d)
+    counts = ops.as_dict()
+    assert set(counts['phases']) >= {'build_heap', 'extract'}
+    # La variante de Floyd hace a lo sumo (d - 1) comparaciones por nivel más la subida
+    levels = np.log(N) / np.log(d)
+    assert counts['phases']['build_heap']['comparisons'] <= 2 * d * N
+    assert counts['total']['comparisons'] <= N * (d - 1) * levels + 2 * N
+    # Grabar los frames no cambia las comparaciones
+    with counting() as animated:
+        list(heap_sort_with_animation(arr.copy(), d=d))
+    assert animated.totals()['comparisons'] == counts['total']['comparisons']
+
+
+def test_heap_arity_trades_comparisons_for_moves():
+    arr = np.random.default_rng(0).permutation(N)
+    totals = []
+    for d in (2, 3, 4):
+        with counting() as ops:
+            heap_sort(arr.copy(), d)
+        totals.append(ops.totals())
+    comparisons = [t['comparisons'] for t in totals]
+    moves = [t['moves'] for t in totals]
+    assert comparisons == sorted(comparisons)
+    assert moves == sorted(moves, reverse=True)
+
+
+@pytest.mark.parametrize('shape', ['sorted', 'reversed'])
+def test_tim_sort_single_run(shape):
+    # Una sola corrida: n - 1 comparaciones para encontrarla y ninguna mezcla
+    with counting() as ops:
+        tim_sort(_inputs()[shape])
+    counts = ops.as_dict()
+    assert counts['total']['comparisons'] == N - 1
+    assert 'merge' not in counts['phases']
+    assert counts['total']['moves'] == (N if shape == 'reversed' else 0)
+
+
+def test_counter_callback_and_nesting():
+    events = []
+    outer = OpCounter(callback=lambda phase, counts: events.append(phase))
+    with counting(outer):
+        with counting() as inner:
+            heap_sort([3, 1, 2])
+        heap_sort([3, 1, 2])
+    assert inner.totals() == outer.totals()
+    assert set(events) == set(outer.phases)
+
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from servicio import argsort, sort_by
+
+ALGORITHMS = ['radix', 'counting', 'tim', 'heap', 'shell', 'bucket']
+
+
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+@pytest.mark.parametrize('dtype', [np.int8, np.int16])
+def test_argsort_narrow_integers(algorithm, dtype):
+    # El rango completo del tipo: restar el mínimo en el tipo original desborda
+    info = np.iinfo(dtype)
+    arr = np.array([100, -100, 5, -3, info.max, info.min, 0, info.max, info.min], dtype=dtype)
+    assert argsort(arr, algorithm=algorithm).tolist() == np.argsort(arr, kind='stable').tolist()
+
+
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+def test_argsort_random_narrow_integers(algorithm):
+    rng = np.random.default_rng(0)
+    arr = rng.integers(-128, 128, 500).astype(np.int8)
+    assert argsort(arr, algorithm=algorithm).tolist() == np.argsort(arr, kind='stable').tolist()
+
+
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+def test_sort_by_structured_order(algorithm):
+    rng = np.random.default_rng(1)
+    records = np.zeros(200, dtype=[('a', np.int16), ('b', np.uint8)])
+    records['a'] = rng.integers(-300, 300, 200)
+    records['b'] = rng.integers(0, 4, 200)
+    expected = records[np.lexsort((records['a'], records['b']))]
+    assert sort_by(records, order=['b', 'a'], algorithm=algorithm).tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+def test_sort_by_key_is_stable(algorithm):
+    words = ['pera', 'kiwi', 'uva', 'higo', 'lima', 'coco']
+    assert sort_by(words, key=len, algorithm=algorithm) == sorted(words, key=len)
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from servicio import radix_argsort, radix_sort, radix_sort_with_animation
+from servicio.radixsort import create_animation
+
+INT_DTYPES = [np.int8, np.int16, np.int32, np.int64, np.uint8, np.uint16, np.uint32, np.uint64]
+FLOAT_DTYPES = [np.float16, np.float32, np.float64]
+
+
+def _random(dtype, n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    if np.dtype(dtype).kind == 'f':
+        return (rng.standard_normal(n) * 1000).astype(dtype)
+    info = np.iinfo(dtype)
+    return rng.integers(info.min, info.max, n, endpoint=True, dtype=dtype)
+
+
+@pytest.mark.parametrize('base', [10, 256, 65536])
+@pytest.mark.parametrize('dtype', INT_DTYPES + FLOAT_DTYPES)
+def test_radix_sort_dtypes(dtype, base):
+    arr = _random(dtype)
+    result = radix_sort(arr, base=base)
+    assert result.dtype == arr.dtype
+    assert np.array_equal(result, np.sort(arr))
+
+
+def test_radix_sort_small_inputs():
+    for arr in (np.array([], dtype=np.int64), np.array([3]), np.array([2, 2, 2]), np.array([2, 1])):
+        assert np.array_equal(radix_sort(arr), np.sort(arr))
+
+
+@pytest.mark.parametrize('dtype', INT_DTYPES + FLOAT_DTYPES)
+def test_radix_argsort_is_stable(dtype):
+    # Pocos valores distintos: la estabilidad se nota en el orden de los índices
+    arr = _random(dtype)[:20][np.random.default_rng(1).integers(0, 20, 1000)]
+    assert np.array_equal(radix_argsort(arr), np.argsort(arr, kind='stable'))
+
+
+@pytest.mark.parametrize('dtype', FLOAT_DTYPES)
+def test_radix_float_sign_flip(dtype):
+    # Negativos, ceros con signo, subnormales e infinitos
+    tiny = np.finfo(dtype).smallest_subnormal
+    arr = np.array([1.5, -0.0, 0.0, -1.5, np.inf, -np.inf, tiny, -tiny, -1e-3, 2.0, -2.0], dtype=dtype)
+    assert np.array_equal(radix_sort(arr), np.sort(arr))
+    assert np.array_equal(radix_argsort(arr), np.argsort(arr, kind='stable'))
+
+
+@pytest.mark.parametrize('dtype', [np.int8, np.int64])
+def test_radix_integer_sign_flip(dtype):
+    info = np.iinfo(dtype)
+    arr = np.array([0, -1, 1, info.min, info.max, info.min + 1, info.max - 1], dtype=dtype)
+    assert np.array_equal(radix_sort(arr), np.sort(arr))
+
+
+@pytest.mark.parametrize('passes_only', [False, True])
+def test_radix_sort_with_animation(passes_only):
+    arr = np.random.default_rng(2).integers(0, 1000, 50)
+    frames = list(radix_sort_with_animation(arr.copy(), passes_only=passes_only))
+    assert np.array_equal(frames[-1]['arr'], np.sort(arr))
+
+
+@pytest.mark.parametrize('passes_only', [False, True])
+@pytest.mark.parametrize('value', [0, 7])
+def test_radix_animation_with_equal_keys(tmp_path, passes_only, value):
+    arr = np.full(6, value)
+    frames = radix_sort_with_animation(arr.copy(), passes_only=passes_only)
+    assert np.array_equal(frames[-1]['arr'], arr)
+    # Con al menos un frame, la animación se puede armar
+    create_animation(frames, tmp_path / 'radix.html', auto_open=False)
+    assert (tmp_path / 'radix.html').exists()
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from servicio import (FrameRecorder, counting_sort_with_animation, decimate, heap_sort_with_animation,
+                      radix_sort_with_animation, shell_sort_with_animation, tim_sort_with_animation)
+from servicio.heapsort import heap_sort_steps
+
+
+def _arr(n=60, seed=0):
+    return np.random.default_rng(seed).integers(1, 50, n)
+
+
+def test_frames_match_full_snapshots():
+    # Referencia ingenua: una copia completa del arreglo por frame
+    arr = _arr()
+    live = arr.copy()
+    snapshots = [live.copy() for _, meta in heap_sort_steps(live) if meta is not None]
+    recorder = heap_sort_with_animation(arr.copy())
+    assert len(recorder) == len(snapshots)
+    for frame, snapshot in zip(recorder, snapshots):
+        assert np.array_equal(frame['arr'], snapshot)
+    assert np.array_equal(recorder[len(recorder) // 2]['arr'], snapshots[len(snapshots) // 2])
+
+
+@pytest.mark.parametrize('interval', [1, 7, 10 ** 9])
+def test_keyframe_interval_does_not_change_frames(interval):
+    arr = _arr(seed=2)
+    recorder = FrameRecorder(keyframe_interval=interval, arr=arr.copy())
+    recorder.extend(heap_sort_steps(recorder._live['arr']))
+    reference = list(heap_sort_with_animation(arr.copy()))
+    assert len(recorder) == len(reference)
+    for k in range(0, len(recorder), 5):
+        assert np.array_equal(recorder[k]['arr'], reference[k]['arr'])
+
+
+def test_recorder_needs_a_channel():
+    with pytest.raises(ValueError):
+        FrameRecorder()
+
+
+STREAMS = {
+    'counting': lambda arr, stream: counting_sort_with_animation(arr, stream=stream),
+    'heap': lambda arr, stream: heap_sort_with_animation(arr.copy(), stream=stream, d=3),
+    'radix': lambda arr, stream: radix_sort_with_animation(arr.copy(), stream=stream),
+    'shell': lambda arr, stream: shell_sort_with_animation(arr.copy(), stream=stream),
+    'tim': lambda arr, stream: tim_sort_with_animation(arr.copy(), stream=stream),
+}
+
+
+def _same_frame(a, b):
+    assert set(a) == set(b)
+    for key in a:
+        if isinstance(a[key], (np.ndarray, list)):
+            assert np.array_equal(a[key], b[key]), key
+        else:
+            assert a[key] == b[key], key
+
+
+@pytest.mark.parametrize('algorithm', sorted(STREAMS))
+def test_stream_matches_recorder(algorithm):
+    arr = _arr(seed=1)
+    recorded = list(STREAMS[algorithm](arr, False))
+    streamed = STREAMS[algorithm](arr, True)
+    assert not isinstance(streamed, FrameRecorder)
+    streamed = list(streamed)
+    assert len(streamed) == len(recorded)
+    for a, b in zip(recorded, streamed):
+        _same_frame(a, b)
+
+
+@pytest.mark.parametrize('by', ['even', 'change'])
+@pytest.mark.parametrize('budget', [2, 3, 10, 50, 10 ** 6])
+def test_decimate_recorder_bounds(by, budget):
+    recorder = tim_sort_with_animation(_arr(200))
+    steps = [frame.step for frame in decimate(recorder, budget, by)]
+    assert len(steps) <= budget
+    assert steps == sorted(set(steps))
+    assert steps[0] == 0 and steps[-1] == len(recorder) - 1
+    if budget >= len(recorder):
+        assert steps == list(range(len(recorder)))
+
+
+@pytest.mark.parametrize('budget', [2, 3, 10, 50, 10 ** 6])
+def test_decimate_stream_bounds(budget):
+    total = len(tim_sort_with_animation(_arr(200)))
+    frames = list(decimate(tim_sort_with_animation(_arr(200), stream=True), budget))
+    steps = [frame.step for frame in frames]
+    assert len(steps) <= budget
+    assert steps == sorted(set(steps))
+    assert steps[0] == 0 and steps[-1] == total - 1
+
+
+def test_decimate_keeps_stage_transitions():
+    # Cada gap de shell sort es una etapa: su primer frame no se descarta
+    recorder = shell_sort_with_animation(_arr(100))
+    gaps = [recorder.metadata(k).get('gap') for k in range(len(recorder))]
+    starts = [k for k in range(1, len(gaps)) if gaps[k] != gaps[k - 1]]
+    assert 1 < len(starts) < 20
+    steps = [frame.step for frame in decimate(recorder, 40)]
+    assert set(starts) <= set(steps)
+
+
+def test_decimate_rejects_bad_arguments():
+    recorder = tim_sort_with_animation(_arr())
+    with pytest.raises(ValueError):
+        decimate(recorder, 1)
+    with pytest.raises(ValueError):
+        decimate(recorder, 10, by='random')
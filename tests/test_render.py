@@ -0,0 +1,133 @@
+import base64
+import json
+from importlib import import_module
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+import pytest
+from plotly.io.json import to_json_plotly
+
+from servicio import (bucket_sort_with_animation, counting_sort_with_animation,
+                      external_sort_with_animation, heap_sort_with_animation, radix_sort_with_animation,
+                      shell_sort_with_animation, tim_sort_with_animation)
+from servicio.render import Peak, build_frames, prepare, write_figure
+
+TRACES = {
+    'bucketsort': lambda arr: bucket_sort_with_animation(arr),
+    'countingsort': lambda arr: counting_sort_with_animation(arr),
+    'external': lambda arr: external_sort_with_animation(arr, chunk_size=8),
+    'heapsort': lambda arr: heap_sort_with_animation(arr, d=3),
+    'radixsort': lambda arr: radix_sort_with_animation(arr),
+    'shellsort': lambda arr: shell_sort_with_animation(arr),
+    'timsort': lambda arr: tim_sort_with_animation(arr),
+}
+
+
+def _figure(module, workers=None):
+    frames = TRACES[module](np.random.default_rng(0).integers(1, 50, 30))
+    first, frames = prepare(frames, max_frames=40)
+    return import_module(f'servicio.{module}')._figure(first, frames, workers)
+
+
+def _json(obj):
+    return json.loads(to_json_plotly(obj))
+
+
+def _shown(value):
+    # Como String() en JavaScript: 24 y 24.0 se muestran igual
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and float(value).is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _plain(obj):
+    # Arreglos tipados y listas de escalares como los textos que muestra el
+    # navegador: plotly puede elegir otro dtype, o textos, para los mismos valores
+    if isinstance(obj, dict):
+        if set(obj) >= {'dtype', 'bdata'}:
+            return [_shown(v) for v in np.frombuffer(base64.b64decode(obj['bdata']), dtype=obj['dtype']).tolist()]
+        return {key: _plain(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        if obj and all(isinstance(v, (int, float, str)) for v in obj):
+            return [_shown(v) for v in obj]
+        return [_plain(value) for value in obj]
+    return obj
+
+
+@pytest.mark.parametrize('module', sorted(TRACES))
+def test_frames_match_plotly_validation(module):
+    data, layout, frames = _figure(module)
+    assert [frame['name'] for frame in frames] == [str(k) for k in range(len(frames))]
+    # Los dicts quedan como los dejarían go.Frame y go.Bar
+    for frame in _plain(_json(frames)):
+        assert frame == _plain(_json(go.Frame(frame)))
+    for trace in _plain(_json(data)):
+        assert trace == _plain(_json(go.Bar(trace)))
+
+
+@pytest.mark.parametrize('module', ['heapsort', 'radixsort'])
+def test_build_frames_with_workers(module):
+    serial = _figure(module)
+    parallel = _figure(module, workers=2)
+    assert _json(parallel[2]) == _json(serial[2])
+    assert parallel[1] == serial[1]
+
+
+def _spec(frame):
+    return {'data': [{'type': 'bar', 'y': frame['arr']}]}
+
+
+def test_build_frames_chunks_and_observe():
+    frames = [{'arr': np.arange(k, k + 5)} for k in range(10)]
+    peak = Peak('arr')
+    specs = build_frames(iter(frames), _spec, chunk_size=3, observe=peak)
+    assert [spec['name'] for spec in specs] == [str(k) for k in range(10)]
+    # Los arreglos de NumPy quedan como arreglos tipados de plotly.js
+    assert specs[9]['data'][0]['y']['dtype'] == 'i1'
+    assert peak.value == 13
+
+
+def _calls(path):
+    # Argumentos JSON de Plotly.newPlot y Plotly.addFrames en el HTML
+    text = path.read_text(encoding='utf-8')
+    decoder = json.JSONDecoder()
+
+    def arguments(call, count):
+        position = text.index(call) + len(call)
+        values = []
+        for _ in range(count):
+            while text[position] in ' \n,':
+                position += 1
+            value, position = decoder.raw_decode(text, position)
+            values.append(value)
+        return values
+
+    _, data, layout = arguments('Plotly.newPlot(', 3)
+    frames = arguments("Plotly.addFrames('fig',", 1)[0] if 'Plotly.addFrames' in text else None
+    return data, layout, frames, 'Plotly.animate' in text
+
+
+def _shell_figure():
+    frames = shell_sort_with_animation(np.random.default_rng(1).integers(1, 50, 20))
+    data, layout, fig_frames = import_module('servicio.shellsort')._figure(*prepare(frames, 10), None)
+    return data, dict(title=dict(text='Shell'), **layout), fig_frames
+
+
+def test_write_figure_matches_write_html(tmp_path):
+    data, layout, frames = _shell_figure()
+    write_figure(data, layout, frames, tmp_path / 'ours.html', auto_open=False, div_id='fig')
+    pio.write_html(go.Figure(data=data, layout=layout, frames=frames), tmp_path / 'plotly.html',
+                   auto_open=False, div_id='fig', include_plotlyjs=True)
+    ours, theirs = _calls(tmp_path / 'ours.html'), _calls(tmp_path / 'plotly.html')
+    assert _plain(ours[:3]) == _plain(theirs[:3])
+    assert ours[3] and theirs[3]
+
+
+def test_write_figure_without_frames_or_auto_play(tmp_path):
+    data, layout, frames = _shell_figure()
+    write_figure(data, layout, frames, tmp_path / 'paused.html', auto_open=False, auto_play=False,
+                 div_id='fig')
+    assert _calls(tmp_path / 'paused.html')[3] is False
+    write_figure(data, layout, [], tmp_path / 'still.html', auto_open=False, div_id='fig')
+    assert _calls(tmp_path / 'still.html')[2] is None
@@ -0,0 +1,84 @@
+import base64
+import json
+
+import numpy as np
+import pytest
+
+from servicio import counting_sort_with_animation, heap_sort_with_animation
+from servicio.countingsort import create_animation
+from servicio.replay import replay_trace, write_replay
+
+# Tipos de JavaScript del reproductor y su equivalente en NumPy
+JS_TYPES = {'Int8Array': np.int8, 'Int16Array': np.int16, 'Int32Array': np.int32,
+            'Uint16Array': np.uint16, 'Float64Array': np.float64}
+
+
+def _decode(data, js_type):
+    return np.frombuffer(base64.b64decode(data), dtype=JS_TYPES[js_type])
+
+
+def _play(trace):
+    # Lo mismo que hace el reproductor al avanzar paso a paso
+    values = _decode(trace['initial'], trace['type']).copy()
+    idx = _decode(trace['idx'], trace['idx_type'])
+    new = _decode(trace['new'], trace['type'])
+    ends = _decode(trace['ends'], 'Int32Array')
+    labels = _decode(trace['labels'], 'Int32Array')
+    start = 0
+    for end, label in zip(ends, labels):
+        values[idx[start:end]] = new[start:end]
+        start = end
+        yield values.copy(), trace['names'][label]
+
+
+def _trace_in(path):
+    # El reproductor lleva los datos en la línea ``var trace = {...};``
+    line, = (line for line in path.read_text(encoding='utf-8').splitlines()
+             if line.startswith('var trace = '))
+    return json.loads(line[len('var trace = '):].rstrip(';'))
+
+
+def test_replay_trace_rebuilds_every_frame():
+    recorder = heap_sort_with_animation(np.random.default_rng(0).integers(1, 100, 40))
+    trace = replay_trace(recorder)
+    played = list(_play(trace))
+    assert len(played) == len(recorder)
+    for k, (values, label) in enumerate(played):
+        assert np.array_equal(values, recorder[k]['arr'])
+        assert label == f"stage: {recorder.metadata(k)['stage']}"
+
+
+@pytest.mark.parametrize('values, js_type', [
+    (np.array([5, -3, 100]), 'Int8Array'),
+    (np.array([5, 1000, 3]), 'Int16Array'),
+    (np.array([5, 10 ** 6, 3]), 'Int32Array'),
+    (np.array([0.5, 2.0, 1.0]), 'Float64Array'),
+])
+def test_replay_uses_smallest_value_type(values, js_type):
+    trace = replay_trace(heap_sort_with_animation(values))
+    assert trace['type'] == js_type
+    final, _ = list(_play(trace))[-1]
+    assert np.array_equal(final, np.sort(values))
+
+
+def test_write_replay_html(tmp_path):
+    recorder = heap_sort_with_animation(np.random.default_rng(1).integers(1, 100, 30))
+    path = tmp_path / 'heap.html'
+    write_replay(recorder, path, title='Heap', auto_open=False)
+    assert _trace_in(path)['initial'] == replay_trace(recorder)['initial']
+    assert 'Plotly.restyle' in path.read_text(encoding='utf-8')
+
+
+def test_write_replay_needs_recorder(tmp_path):
+    frames = heap_sort_with_animation(np.array([3, 1, 2]), stream=True)
+    with pytest.raises(TypeError):
+        write_replay(frames, tmp_path / 'heap.html', auto_open=False)
+
+
+def test_create_animation_replay_channel(tmp_path):
+    # Counting sort reproduce su arreglo de salida, no la entrada
+    recorder = counting_sort_with_animation(np.random.default_rng(2).integers(1, 20, 30))
+    path = tmp_path / 'counting.html'
+    create_animation(recorder, path, auto_open=False, replay=True)
+    final, _ = list(_play(_trace_in(path)))[-1]
+    assert np.array_equal(final, recorder[-1]['output'])
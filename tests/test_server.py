@@ -0,0 +1,119 @@
+import asyncio
+import json
+import os
+import struct
+
+from servicio.server import AnimationServer
+
+HANDSHAKE = ('GET /ws?algorithm=heap&size=300&seed=1 HTTP/1.1\r\nHost: localhost\r\n'
+             'Upgrade: websocket\r\nConnection: Upgrade\r\n{key}\r\n')
+
+
+def _client_frame(opcode, data):
+    # Los mensajes del cliente van enmascarados
+    mask = os.urandom(4)
+    return (struct.pack('!BB', 0x80 | opcode, 0x80 | len(data)) + mask
+            + bytes(b ^ mask[i % 4] for i, b in enumerate(data)))
+
+
+async def _read_message(reader):
+    first, second = await reader.readexactly(2)
+    n = second & 0x7F
+    if n == 126:
+        n, = struct.unpack('!H', await reader.readexactly(2))
+    elif n == 127:
+        n, = struct.unpack('!Q', await reader.readexactly(8))
+    return first & 0x0F, await reader.readexactly(n)
+
+
+async def _with_server(client, **options):
+    server = AnimationServer(**options)
+    listener = await asyncio.start_server(server.handle, '127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    try:
+        async with listener:
+            return await client(server, *(await asyncio.open_connection('127.0.0.1', port)))
+    finally:
+        listener.close()
+
+
+def test_missing_websocket_key_is_rejected():
+    async def client(server, reader, writer):
+        writer.write(HANDSHAKE.format(key='').encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return response
+
+    response = asyncio.run(_with_server(client))
+    assert response.startswith(b'HTTP/1.1 400')
+
+
+def test_stream_trims_batches_and_releases_trace():
+    async def client(server, reader, writer):
+        writer.write(HANDSHAKE.format(key='Sec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\n').encode())
+        await writer.drain()
+        await reader.readuntil(b'\r\n\r\n')
+        frames, held = 0, 0
+        while True:
+            _, data = await _read_message(reader)
+            batch = json.loads(data)
+            frames += len(batch['frames'])
+            trace, = server.traces.values()
+            held = max(held, len(trace.batches))
+            if batch['done']:
+                break
+            writer.write(_client_frame(0x1, b'ack'))
+            await writer.drain()
+        writer.write(_client_frame(0x8, struct.pack('!H', 1000)))
+        await writer.drain()
+        opcode, _ = await _read_message(reader)
+        await asyncio.sleep(0.05)
+        writer.close()
+        return frames, held, opcode, dict(server.traces)
+
+    frames, held, opcode, traces = asyncio.run(_with_server(client, batch_size=8, window=2))
+    assert frames > 100
+    # Los lotes que el espectador ya recibió no se guardan
+    assert held <= 3
+    assert opcode == 0x8
+    assert traces == {}
+
+
+def test_stalled_viewer_does_not_hold_batches():
+    async def stream(reader, writer, ack):
+        writer.write(HANDSHAKE.format(key='Sec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\n').encode())
+        await writer.drain()
+        await reader.readuntil(b'\r\n\r\n')
+        await _read_message(reader)
+        while ack:
+            writer.write(_client_frame(0x1, b'ack'))
+            await writer.drain()
+            _, data = await _read_message(reader)
+            if json.loads(data)['done']:
+                break
+
+    async def client(server, reader, writer):
+        # El primero recibe su primer lote y no pide más
+        await stream(reader, writer, ack=False)
+        port = writer.get_extra_info('peername')[1]
+        other = await asyncio.open_connection('127.0.0.1', port)
+        held = 0
+
+        async def watch():
+            nonlocal held
+            while True:
+                for trace in server.traces.values():
+                    held = max(held, len(trace.batches))
+                await asyncio.sleep(0)
+
+        watcher = asyncio.get_running_loop().create_task(watch())
+        await stream(*other, ack=True)
+        watcher.cancel()
+        other[1].close()
+        writer.close()
+        return held
+
+    held = asyncio.run(_with_server(client, batch_size=8, window=2))
+    # El espectador detenido no impide descartar lotes
+    assert held <= 3
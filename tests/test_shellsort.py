@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from servicio import shell_sort, shell_sort_with_animation
+from servicio.bench import bench_gaps
+from servicio.shellsort import GAP_SEQUENCES, VECTOR_MIN_GAP, gap_sequence
+
+DTYPES = [np.int8, np.int16, np.int64, np.uint32, np.float32, np.float64]
+
+
+@pytest.mark.parametrize('gaps', sorted(GAP_SEQUENCES))
+@pytest.mark.parametrize('dtype', DTYPES)
+def test_shell_sort_dtypes(dtype, gaps):
+    # Bastante largo para que los gaps grandes vayan por la pasada vectorizada
+    arr = (np.random.default_rng(0).standard_normal(3000) * 100).astype(dtype)
+    assert gap_sequence(arr.size, gaps)[0] >= VECTOR_MIN_GAP
+    result = shell_sort(arr.copy(), gaps)
+    assert result.dtype == arr.dtype
+    assert np.array_equal(result, np.sort(arr))
+
+
+@pytest.mark.parametrize('gaps', sorted(GAP_SEQUENCES) + [[7, 3, 1]])
+def test_shell_sort_lists(gaps):
+    values = np.random.default_rng(1).integers(0, 100, 300).tolist()
+    assert shell_sort(list(values), gaps) == sorted(values)
+
+
+@pytest.mark.parametrize('gaps', sorted(GAP_SEQUENCES))
+def test_gap_sequence_ends_in_one(gaps):
+    for n in (2, 10, 1000, 10 ** 6):
+        sequence = gap_sequence(n, gaps)
+        assert sequence == sorted(set(sequence), reverse=True)
+        assert sequence[-1] == 1 and sequence[0] < n
+
+
+def test_unknown_gap_sequence():
+    with pytest.raises(ValueError):
+        gap_sequence(10, 'fibonacci')
+
+
+def test_shell_sort_with_animation_vectorized_pass():
+    arr = np.random.default_rng(2).integers(0, 1000, 400)
+    frames = shell_sort_with_animation(arr.copy())
+    gaps = {frames.metadata(k)['gap'] for k in range(len(frames))}
+    assert gaps == set(gap_sequence(arr.size, 'ciura'))
+    assert np.array_equal(frames[-1]['arr'], np.sort(arr))
+
+
+def test_bench_gaps_rows():
+    rows = bench_gaps(sizes=(500,), kinds=('random', 'reversed'), sequences=['ciura', 'pratt'])
+    assert [(row['input'], row['sequence']) for row in rows] == [
+        ('random', 'ciura'), ('random', 'pratt'), ('reversed', 'ciura'), ('reversed', 'pratt')]
+    for row in rows:
+        assert row['n'] == 500 and row['seconds'] >= 0
+        assert row['passes'] == len(gap_sequence(500, row['sequence']))
+
+
+def test_bench_gaps_defaults():
+    rows = bench_gaps(sizes=(200,))
+    kinds = ('random', 'reversed', 'nearly_sorted')
+    assert [(row['input'], row['sequence']) for row in rows] == [
+        (kind, name) for kind in kinds for name in GAP_SEQUENCES]
+    assert all(row['n'] == 200 and row['passes'] >= 1 for row in rows)
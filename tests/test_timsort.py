@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from servicio import counting, tim_sort
+
+
+def test_parallel_tim_sort_array():
+    arr = np.random.default_rng(0).integers(-1000, 1000, 5000)
+    expected = np.sort(arr)
+    assert tim_sort(arr, workers=2) is arr
+    assert np.array_equal(arr, expected)
+
+
+def test_parallel_tim_sort_list():
+    items = np.random.default_rng(1).integers(0, 100, 500).tolist()
+    result = tim_sort(items, workers=2)
+    assert result is items
+    assert items == sorted(items)
+    assert all(type(item) is int for item in items)
+
+
+def test_parallel_tim_sort_non_numeric_list():
+    words = ['pera', 'kiwi', 'uva', 'higo', 'lima', 'coco']
+    assert tim_sort(list(words), workers=2) == sorted(words)
+
+
+class Item:
+    # Se compara solo por ``key``: ``tag`` deja ver si los iguales conservan su orden
+    def __init__(self, key, tag):
+        self.key, self.tag = key, tag
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+    def __le__(self, other):
+        return self.key <= other.key
+
+    def __gt__(self, other):
+        return self.key > other.key
+
+    def __ge__(self, other):
+        return self.key >= other.key
+
+
+def test_tim_sort_is_stable():
+    keys = np.random.default_rng(2).integers(0, 10, 2000).tolist()
+    items = [Item(key, tag) for tag, key in enumerate(keys)]
+    tim_sort(items)
+    assert [(item.key, item.tag) for item in items] == sorted((key, tag) for tag, key in enumerate(keys))
+
+
+def test_tim_sort_stable_across_gallops():
+    # Dos corridas con bloques largos de claves iguales: las mezclas galopan
+    left = [Item(k, ('a', i)) for i, k in enumerate(np.repeat(np.arange(0, 40, 2), 50).tolist())]
+    right = [Item(k, ('b', i)) for i, k in enumerate(np.repeat(np.arange(0, 40, 4), 50).tolist())]
+    items = left + right
+    expected = sorted(items, key=lambda item: item.key)
+    tim_sort(items)
+    assert [item.tag for item in items] == [item.tag for item in expected]
+
+
+def test_tim_sort_gallops_over_blocks():
+    blocks = np.arange(4000).reshape(20, 200)
+    blocked = np.concatenate([blocks[0::2].ravel(), blocks[1::2].ravel()]).tolist()
+    interleaved = np.concatenate([np.arange(0, 4000, 2), np.arange(1, 4000, 2)]).tolist()
+    merges = []
+    for values in (blocked, interleaved):
+        with counting() as ops:
+            tim_sort(values)
+        assert values == list(range(4000))
+        merges.append(ops.phases['merge']['comparisons'])
+    # Sin bloques la mezcla compara elemento a elemento; con bloques, galopa
+    assert merges[1] == len(interleaved) - 1
+    assert merges[0] < len(blocked) // 8
+
+
+@pytest.mark.parametrize('dtype', [np.int8, np.int64, np.float32, np.float64])
+def test_tim_sort_dtypes(dtype):
+    arr = (np.random.default_rng(3).standard_normal(3000) * 100).astype(dtype)
+    assert np.array_equal(tim_sort(arr.copy()), np.sort(arr))
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from servicio import tracefile
+from servicio import (counting_sort_with_animation, heap_sort_with_animation, load_trace,
+                      radix_sort_with_animation, save_trace, shell_sort_with_animation,
+                      tim_sort_with_animation)
+
+TRACES = {
+    'counting': lambda arr: counting_sort_with_animation(arr),
+    'heap': lambda arr: heap_sort_with_animation(arr, d=3),
+    'radix': lambda arr: radix_sort_with_animation(arr),
+    'shell': lambda arr: shell_sort_with_animation(arr),
+    'tim': lambda arr: tim_sort_with_animation(arr),
+}
+
+
+def _same_frame(a, b):
+    assert set(a) == set(b)
+    for key in a:
+        if isinstance(a[key], (np.ndarray, list)):
+            assert np.array_equal(a[key], b[key]), key
+        else:
+            assert a[key] == b[key], key
+
+
+@pytest.mark.parametrize('algorithm', sorted(TRACES))
+def test_trace_round_trip(tmp_path, algorithm):
+    recorder = TRACES[algorithm](np.random.default_rng(0).integers(1, 50, 60))
+    path = tmp_path / f'{algorithm}.trace'
+    save_trace(recorder, path)
+    loaded = load_trace(path)
+    assert len(loaded) == len(recorder)
+    assert loaded.channels == recorder.channels
+    for original, restored in zip(recorder, loaded):
+        _same_frame(original, restored)
+    # Acceso directo, saltando al keyframe más cercano
+    for k in (0, len(recorder) // 2, len(recorder) - 1):
+        _same_frame(recorder[k], loaded[k])
+
+
+def test_trace_round_trip_open_file(tmp_path):
+    recorder = tim_sort_with_animation(np.random.default_rng(1).integers(1, 50, 40))
+    with open(tmp_path / 'tim.trace', 'wb') as f:
+        save_trace(recorder, f)
+    _same_frame(load_trace(tmp_path / 'tim.trace')[-1], recorder[-1])
+
+
+def test_trace_rejects_unknown_view(tmp_path, monkeypatch):
+    recorder = counting_sort_with_animation(np.random.default_rng(2).integers(1, 20, 30))
+    # Un archivo que nombra una función cualquiera como vista
+    monkeypatch.setattr(tracefile, '_view_name', lambda view: 'os:getcwd')
+    save_trace(recorder, tmp_path / 'evil.trace')
+    with pytest.raises(ValueError, match='os:getcwd'):
+        load_trace(tmp_path / 'evil.trace')
+
+
+def test_trace_rejects_unregistered_view_on_save(tmp_path):
+    recorder = counting_sort_with_animation(np.random.default_rng(3).integers(1, 20, 30))
+    recorder._view = lambda frame: frame
+    with pytest.raises(ValueError):
+        save_trace(recorder, tmp_path / 'lambda.trace')